@@ -0,0 +1,87 @@
+"""
+Async facade over the recipe storage layer.
+
+Storage functions do blocking file and SQLite I/O. These wrappers run them on
+a dedicated, bounded worker-thread pool (``storage_threads``) so a slow
+``/recipes`` volume cannot stall the event loop or starve FastAPI's shared
+thread pool used by other endpoints.
+"""
+from __future__ import annotations
+
+import functools
+from typing import Callable, TypeVar
+
+import anyio
+import anyio.to_thread
+
+from . import storage
+from .config import get_settings
+from .models import RecipeFacets, RecipeHtmlResponse, RecipePage, RecipeResponse, RecipeSearchHit
+from .recipe_index import RecipeFilters
+
+T = TypeVar("T")
+
+_limiter: anyio.CapacityLimiter | None = None
+
+
+def _get_limiter() -> anyio.CapacityLimiter:
+    # Created lazily: a CapacityLimiter must be built inside the event loop.
+    global _limiter
+    if _limiter is None:
+        _limiter = anyio.CapacityLimiter(get_settings().storage_threads)
+    return _limiter
+
+
+async def run_in_storage_thread(func: Callable[..., T], *args, **kwargs) -> T:
+    return await anyio.to_thread.run_sync(
+        functools.partial(func, *args, **kwargs), limiter=_get_limiter()
+    )
+
+
+async def list_recipes(
+    filters: RecipeFilters | None = None,
+    sort: str = "title",
+    cursor: str | None = None,
+    limit: int = 50,
+) -> RecipePage:
+    return await run_in_storage_thread(
+        storage.list_recipes, filters, sort=sort, cursor=cursor, limit=limit
+    )
+
+
+async def recipe_facets(
+    ranges: dict[str, tuple[int | None, int | None]] | None = None,
+) -> RecipeFacets:
+    return await run_in_storage_thread(storage.recipe_facets, ranges)
+
+
+async def search_recipes(query: str, limit: int = 20) -> list[RecipeSearchHit]:
+    return await run_in_storage_thread(storage.search_recipes, query, limit=limit)
+
+
+async def load_recipe(slug: str) -> RecipeResponse:
+    return await run_in_storage_thread(storage.load_recipe, slug)
+
+
+async def load_recipe_html(slug: str) -> RecipeHtmlResponse:
+    return await run_in_storage_thread(storage.load_recipe_html, slug)
+
+
+async def find_recipe_by_url(url: str) -> RecipeResponse | None:
+    return await run_in_storage_thread(storage.find_recipe_by_url, url)
+
+
+async def recipe_etag(slug: str) -> str:
+    return await run_in_storage_thread(storage.recipe_etag, slug)
+
+
+async def recipes_etag() -> str:
+    return await run_in_storage_thread(storage.recipes_etag)
+
+
+async def save_recipe_markdown(markdown: str) -> RecipeResponse:
+    return await run_in_storage_thread(storage.save_recipe_markdown, markdown)
+
+
+async def update_recipe(slug: str, markdown: str) -> RecipeResponse:
+    return await run_in_storage_thread(storage.update_recipe, slug, markdown)
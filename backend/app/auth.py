@@ -1,18 +1,110 @@
 from __future__ import annotations
 
-from fastapi import Cookie, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from collections import OrderedDict
+import os
+from pathlib import Path
+import threading
+import time
+import uuid
 
-from .db import User, get_db
+from fastapi import Cookie, HTTPException, status
+
+from . import metrics
+from .config import get_settings
+from .db import DEFAULT_AUTH_DB_PATH, AsyncSessionLocal, User
 from .security import decode_access_token
 
+# Rewritten whenever a user changes, so every worker drops its cached users.
+USER_STAMP_PATH = DEFAULT_AUTH_DB_PATH.with_name("users.stamp")
+
 
-def get_current_user(
-  access_token: str | None = Cookie(default=None),
-  db: Session = Depends(get_db),
-) -> User:
+class _UserCache:
+  """
+  Short-lived, size-bounded cache of active users by id, detached from any
+  session. Entries expire after ``ttl`` seconds and the whole cache is
+  dropped when the shared stamp file changes.
+  """
+
+  def __init__(self, stamp_path: Path) -> None:
+    self._stamp_path = stamp_path
+    self._entries: OrderedDict[int, tuple[float, User]] = OrderedDict()
+    self._stamp: tuple[int, int] | None = None
+    self._lock = threading.Lock()
+
+  def _read_stamp(self) -> tuple[int, int] | None:
+    try:
+      stat = self._stamp_path.stat()
+    except FileNotFoundError:
+      return None
+    return stat.st_ino, stat.st_mtime_ns
+
+  def get(self, user_id: int) -> tuple[User | None, tuple[int, int] | None]:
+    """
+    Return the cached user (or None) and the stamp seen, to pass to
+    ``put`` after loading the user.
+    """
+    stamp = self._read_stamp()
+    with self._lock:
+      if stamp != self._stamp:
+        self._entries.clear()
+        self._stamp = stamp
+        return None, stamp
+      entry = self._entries.get(user_id)
+      if entry is None:
+        return None, stamp
+      expires_at, user = entry
+      if expires_at < time.monotonic():
+        del self._entries[user_id]
+        return None, stamp
+      self._entries.move_to_end(user_id)
+      return user, stamp
+
+  def put(self, user: User, stamp: tuple[int, int] | None, ttl: float, max_size: int) -> None:
+    # Skip users loaded before an invalidation that happened since.
+    if self._read_stamp() != stamp:
+      return
+    with self._lock:
+      self._entries[user.id] = (time.monotonic() + ttl, user)
+      self._entries.move_to_end(user.id)
+      while len(self._entries) > max_size:
+        self._entries.popitem(last=False)
+
+  def invalidate(self, user_id: int) -> None:
+    with self._lock:
+      self._entries.pop(user_id, None)
+    # A fresh file (new inode) each time, so even coarse mtimes register.
+    tmp = self._stamp_path.with_name(f"{self._stamp_path.name}.{uuid.uuid4().hex}")
+    tmp.write_text(uuid.uuid4().hex)
+    os.replace(tmp, self._stamp_path)
+
+
+_user_cache = _UserCache(USER_STAMP_PATH)
+
+
+def invalidate_user(user_id: int) -> None:
+  """
+  Drop a user from the cache of every worker; call after changing or
+  deleting them.
+  """
+  _user_cache.invalidate(user_id)
+
+
+async def _load_active_user(user_id: int) -> User | None:
+  async with AsyncSessionLocal() as db:
+    user = await db.get(User, user_id)
+    if user is None or not user.is_active:
+      return None
+    db.expunge(user)
+    return user
+
+
+async def get_current_user(access_token: str | None = Cookie(default=None)) -> User:
   """
   Resolve the current user from an HttpOnly cookie-based JWT.
+
+  Active users are cached for ``user_cache_ttl_seconds``, so most requests
+  do not touch the auth database. The returned user is detached: handlers
+  that modify users load their own copy.
   """
   if access_token is None:
     raise HTTPException(
@@ -20,11 +112,22 @@ def get_current_user(
       detail="Not authenticated",
     )
 
-  user_id = decode_access_token(access_token)
-  user = db.query(User).filter(User.id == int(user_id)).first()
-  if user is None or not user.is_active:
+  settings = get_settings()
+  caching = settings.user_cache_ttl_seconds > 0
+  user_id = int(decode_access_token(access_token))
+  if caching:
+    user, stamp = _user_cache.get(user_id)
+    if user is not None:
+      metrics.AUTH_USER_CACHE_LOOKUPS.inc(result="hit")
+      return user
+    metrics.AUTH_USER_CACHE_LOOKUPS.inc(result="miss")
+
+  user = await _load_active_user(user_id)
+  if user is None:
     raise HTTPException(
       status_code=status.HTTP_401_UNAUTHORIZED,
       detail="User not found or inactive",
     )
+  if caching:
+    _user_cache.put(user, stamp, settings.user_cache_ttl_seconds, settings.user_cache_max_size)
   return user
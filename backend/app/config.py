@@ -1,5 +1,6 @@
 from functools import lru_cache
 from pathlib import Path
+from typing import Literal
 
 from pydantic import AnyHttpUrl
 from pydantic_settings import BaseSettings
@@ -17,9 +18,106 @@ class Settings(BaseSettings):
 
     # Storage (Docker: hard-coded to /recipes)
     output_dir: Path = Path("/recipes")
+    # Max parsed recipes kept in memory by load_recipe (0 disables the cache)
+    recipe_cache_size: int = 256
+    # Max rendered recipe HTML pages kept in memory, by content hash (0 disables)
+    render_cache_size: int = 256
+    # Worker threads for blocking recipe file/index I/O used by async endpoints
+    storage_threads: int = 8
+    # Watch output_dir for external edits (inotify, or polling when forced/unavailable)
+    watch_recipes: bool = True
+    watch_force_polling: bool = False
+    watch_debounce_ms: int = 1600
+    watch_poll_interval_ms: int = 5000
     # OpenAI / LLM
     openai_api_key: str
     openai_model: str
+    # Responses API base URL; point it at a proxy or the local mock server
+    # (backend/bench/mock_llm.py) for benchmarks
+    openai_base_url: str = "https://api.openai.com/v1"
+    # Shared HTTP client for LLM calls (connection pool, keep-alive, HTTP/2)
+    llm_timeout_seconds: float = 60
+    llm_max_connections: int = 20
+    llm_max_keepalive_connections: int = 10
+    llm_keepalive_expiry_seconds: float = 30
+    llm_http2: bool = False
+    # Stream Responses API output so partial Markdown reaches clients early
+    llm_stream: bool = True
+    # Rate-limit budgets (0 = unlimited) and retries for LLM calls. A scrape
+    # reserves llm_estimated_tokens_per_scrape until its real usage is known.
+    llm_requests_per_minute: int = 60
+    llm_tokens_per_minute: int = 200_000
+    llm_estimated_tokens_per_scrape: int = 8000
+    llm_max_retries: int = 4
+    llm_backoff_base_seconds: float = 1
+    llm_backoff_max_seconds: float = 60
+    # Prices per million tokens, for the estimated cost in /metrics (0 = not tracked)
+    llm_input_cost_per_million_tokens: float = 0
+    llm_output_cost_per_million_tokens: float = 0
+    # Render recipes from schema.org JSON-LD/microdata when the page has it,
+    # using the LLM only for classification fields (or not at all)
+    structured_data_enabled: bool = True
+    structured_data_llm_classification: bool = True
+    page_fetch_timeout_seconds: float = 10
+    page_fetch_max_bytes: int = 5_000_000
+    page_fetch_max_connections: int = 10
+    # Max scrapes running at once for bulk imports (across all batches)
+    bulk_import_concurrency: int = 4
+    # Background scrape jobs: workers per process, how long a claimed job is
+    # reserved before another worker may take it over, and history retention
+    job_workers: int = 2
+    job_lease_seconds: int = 300
+    job_max_attempts: int = 3
+    job_poll_interval_ms: int = 2000
+    job_retention_hours: int = 168
+    # Collection-wide rescrapes: recipes rescraped at once (leases and
+    # polling follow the job settings above)
+    rescrape_concurrency: int = 2
+
+    # Password hashing: bcrypt cost (existing hashes are upgraded on login),
+    # threads doing bcrypt work, and how many more sign-ins may wait for them
+    # before further ones get 503
+    bcrypt_rounds: int = 12
+    password_hash_threads: int = 4
+    password_hash_queue_limit: int = 32
+    # Authenticated users are cached per worker for this long (0 disables);
+    # changes to a user are broadcast to all workers through a stamp file
+    user_cache_ttl_seconds: float = 30
+    user_cache_max_size: int = 1024
+    # Login throttling over a sliding window (0 = no limit). Past the username
+    # limit every attempt for that username waits, starting at the delay and
+    # doubling per further failure up to the max; past the IP limit attempts
+    # get 429. Keys tracked in memory, or persist the counts in the auth database
+    login_throttle_per_username: int = 10
+    login_throttle_delay_seconds: float = 1
+    login_throttle_max_delay_seconds: float = 30
+    login_throttle_per_ip: int = 50
+    login_throttle_window_seconds: float = 900
+    login_throttle_max_keys: int = 10_000
+    login_throttle_persist: bool = False
+    # Reverse proxies (IPs or CIDRs) whose X-Forwarded-For is believed; client
+    # IPs, and so the per-IP login limit, are only used when this is set
+    trusted_proxies: list[str] = []
+
+    # SQLite (auth/jobs and recipe index databases, both in WAL mode): durability
+    # of commits, page cache per connection, wait for locks, and the connection
+    # pool of each engine
+    sqlite_synchronous: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+    sqlite_cache_size_kib: int = 16384
+    sqlite_busy_timeout_ms: int = 30000
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 30
+
+    # Response compression (brotli when installed, else gzip)
+    compression_minimum_size: int = 1024
+    gzip_compresslevel: int = 6
+    brotli_quality: int = 5
+
+    # Prometheus metrics on /metrics; scrapers must send the token as a bearer
+    # token, and without one the endpoint answers 404
+    metrics_enabled: bool = True
+    metrics_token: str | None = None
 
     # CORS / Frontend
     frontend_origin: AnyHttpUrl | None = None
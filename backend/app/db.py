@@ -2,10 +2,23 @@ from __future__ import annotations
 
 from datetime import datetime
 from pathlib import Path
+from typing import AsyncIterator
 
-from sqlalchemy import Boolean, Column, DateTime, Integer, String, create_engine
+from sqlalchemy import (
+  Boolean,
+  Column,
+  DateTime,
+  Index,
+  Integer,
+  String,
+  Text,
+  create_engine,
+  event,
+)
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.orm import sessionmaker
 
 from .config import get_settings
 
@@ -13,7 +26,7 @@ Base = declarative_base()
 DEFAULT_AUTH_DB_PATH = Path("/data/auth.db")
 
 
-def get_database_url() -> str:
+def get_database_url(driver: str = "sqlite") -> str:
   """
   Returns the database URL.
   By default we store the SQLite DB in /data so user accounts persist with the
@@ -22,12 +35,53 @@ def get_database_url() -> str:
   _ = get_settings()
   db_path = DEFAULT_AUTH_DB_PATH
   db_path.parent.mkdir(parents=True, exist_ok=True)
-  return f"sqlite:///{db_path}"
+  return f"{driver}:///{db_path}"
 
 
-engine = create_engine(get_database_url(), connect_args={"check_same_thread": False})
+def configure_sqlite(engine: Engine) -> None:
+  """
+  Set the connection pragmas on every new connection of a SQLite engine:
+  WAL journaling so readers never wait for the writer, ``synchronous``
+  (NORMAL is durable across application crashes in WAL mode), the page
+  cache size and how long to wait for a locked database.
+  """
+  settings = get_settings()
+
+  @event.listens_for(engine, "connect")
+  def _set_pragmas(dbapi_connection, _connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+    # Negative values are KiB rather than pages.
+    cursor.execute(f"PRAGMA cache_size=-{settings.sqlite_cache_size_kib}")
+    cursor.execute(f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}")
+    cursor.close()
+
+
+def _pool_options() -> dict:
+  settings = get_settings()
+  return {
+    "pool_size": settings.db_pool_size,
+    "max_overflow": settings.db_max_overflow,
+    "pool_timeout": settings.db_pool_timeout_seconds,
+  }
+
+
+# Synchronous engine for code running in worker threads (jobs, rescrapes).
+engine = create_engine(
+  get_database_url(),
+  connect_args={"check_same_thread": False},
+  **_pool_options(),
+)
+configure_sqlite(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for request handlers; aiosqlite runs each connection in its
+# own thread, so queries do not block the event loop.
+async_engine = create_async_engine(get_database_url("sqlite+aiosqlite"), **_pool_options())
+configure_sqlite(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 
 class User(Base):
   __tablename__ = "users"
@@ -40,13 +94,86 @@ class User(Base):
   created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
 
+class Job(Base):
+  """
+  A background scrape. Rows double as the work queue: workers claim queued
+  jobs, or running jobs whose lease ran out because their worker died.
+  """
+
+  __tablename__ = "jobs"
+
+  id = Column(String, primary_key=True)
+  kind = Column(String, nullable=False)
+  status = Column(String, nullable=False, default="queued")
+  url = Column(String, nullable=True)
+  slug = Column(String, nullable=True)
+  refresh = Column(Boolean, default=False, nullable=False)
+  error = Column(Text, nullable=True)
+  attempts = Column(Integer, default=0, nullable=False)
+  created_by = Column(Integer, nullable=True)
+  created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+  started_at = Column(DateTime, nullable=True)
+  finished_at = Column(DateTime, nullable=True)
+  lease_expires_at = Column(DateTime, nullable=True)
+
+  __table_args__ = (Index("ix_jobs_status_created_at", "status", "created_at"),)
+
+
+class RescrapeRun(Base):
+  """
+  A collection-wide rescrape. The process holding the lease works through
+  the run's items; another process takes over once the lease runs out.
+  """
+
+  __tablename__ = "rescrape_runs"
+
+  id = Column(String, primary_key=True)
+  status = Column(String, nullable=False, default="running")
+  filters = Column(Text, nullable=False, default="{}")
+  total = Column(Integer, default=0, nullable=False)
+  created_by = Column(Integer, nullable=True)
+  created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+  finished_at = Column(DateTime, nullable=True)
+  owner = Column(String, nullable=True)
+  lease_expires_at = Column(DateTime, nullable=True)
+
+
+class RescrapeItem(Base):
+  """
+  One recipe of a rescrape run. The status is written as soon as the
+  recipe is done, so a resumed run only redoes the queued ones.
+  """
+
+  __tablename__ = "rescrape_items"
+
+  run_id = Column(String, primary_key=True)
+  slug = Column(String, primary_key=True)
+  status = Column(String, nullable=False, default="queued")
+  error = Column(Text, nullable=True)
+  finished_at = Column(DateTime, nullable=True)
+
+  __table_args__ = (Index("ix_rescrape_items_run_id_status", "run_id", "status"),)
+
+
+class LoginFailure(Base):
+  """
+  A failed sign-in by username or client IP (``key``), kept while it counts
+  towards login throttling with ``LOGIN_THROTTLE_PERSIST``.
+  """
+
+  __tablename__ = "login_failures"
+
+  id = Column(Integer, primary_key=True)
+  key = Column(String, nullable=False)
+  failed_at = Column(DateTime, nullable=False, index=True)
+
+  __table_args__ = (Index("ix_login_failures_key_failed_at", "key", "failed_at"),)
+
+
 def init_db() -> None:
   Base.metadata.create_all(bind=engine)
 
 
-def get_db() -> Session:
-  db = SessionLocal()
-  try:
+async def get_db() -> AsyncIterator[AsyncSession]:
+  async with AsyncSessionLocal() as db:
     yield db
-  finally:
-    db.close()
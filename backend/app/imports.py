@@ -0,0 +1,120 @@
+"""
+Bulk URL imports.
+
+A bulk import is a batch of URLs scraped in the background. Every URL goes
+through the same coalesced ``scrapes.create_recipe`` path as a single
+create, and URLs that are already saved are skipped without a scrape. A
+process-wide semaphore caps how many scrapes run at once across all
+batches, so total import time scales with ``bulk_import_concurrency``
+rather than with the number of URLs.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+import logging
+import uuid
+
+from . import async_storage, scrapes
+from .config import get_settings
+from .llm_scheduler import Priority
+from .models import BulkImportItem, BulkImportStatus
+from .urls import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+# Finished batches kept around for status polling.
+MAX_RETAINED_IMPORTS = 100
+
+
+class BulkImport:
+    def __init__(self, urls: list[str]) -> None:
+        self.id = uuid.uuid4().hex
+        self.items = [BulkImportItem(url=url, status="queued") for url in urls]
+        self.task: asyncio.Task | None = None
+
+    @property
+    def done(self) -> bool:
+        return all(item.status in ("succeeded", "failed") for item in self.items)
+
+    def status(self) -> BulkImportStatus:
+        succeeded = sum(1 for item in self.items if item.status == "succeeded")
+        failed = sum(1 for item in self.items if item.status == "failed")
+        return BulkImportStatus(
+            id=self.id,
+            total=len(self.items),
+            completed=succeeded + failed,
+            succeeded=succeeded,
+            failed=failed,
+            items=[item.model_copy() for item in self.items],
+        )
+
+
+_imports: OrderedDict[str, BulkImport] = OrderedDict()
+_semaphore: asyncio.Semaphore | None = None
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(get_settings().bulk_import_concurrency)
+    return _semaphore
+
+
+async def _import_one(item: BulkImportItem) -> None:
+    existing = await async_storage.find_recipe_by_url(item.url)
+    if existing is not None:
+        item.status = "succeeded"
+        item.slug = existing.metadata.slug
+        return
+
+    async with _get_semaphore():
+        item.status = "running"
+        try:
+            recipe = await scrapes.create_recipe(item.url, priority=Priority.BACKGROUND)
+        except Exception as exc:
+            logger.warning("Bulk import of %s failed: %s", item.url, exc)
+            item.status = "failed"
+            item.error = str(exc) or exc.__class__.__name__
+            return
+        item.status = "succeeded"
+        item.slug = recipe.metadata.slug
+
+
+async def _run(batch: BulkImport) -> None:
+    await asyncio.gather(*(_import_one(item) for item in batch.items))
+
+
+def _evict_finished() -> None:
+    for import_id in list(_imports):
+        if len(_imports) <= MAX_RETAINED_IMPORTS:
+            break
+        if _imports[import_id].done:
+            del _imports[import_id]
+
+
+def start_import(urls: list[str]) -> BulkImportStatus:
+    """
+    Queue the given URLs (duplicates by canonical URL dropped) and start
+    scraping them.
+    """
+    unique: dict[str, str] = {}
+    for url in urls:
+        unique.setdefault(canonicalize_url(url), url)
+    batch = BulkImport(list(unique.values()))
+    _imports[batch.id] = batch
+    _evict_finished()
+    batch.task = asyncio.create_task(_run(batch), name=f"bulk-import-{batch.id}")
+    return batch.status()
+
+
+def get_import(import_id: str) -> BulkImportStatus | None:
+    batch = _imports.get(import_id)
+    return batch.status() if batch is not None else None
+
+
+async def shutdown() -> None:
+    tasks = [batch.task for batch in _imports.values() if batch.task and not batch.task.done()]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,398 @@
+"""
+Background scrape jobs.
+
+Creating or re-scraping a recipe takes as long as the LLM round-trip, so the
+endpoints only record a job and return its id; clients poll the job or
+subscribe to its event stream. Jobs live in the ``jobs`` table of the auth
+database, which doubles as the queue: every process runs ``job_workers``
+workers that claim queued jobs under a lease. A job whose worker died has
+its lease run out and is claimed again, up to ``job_max_attempts`` times, so
+queued and interrupted work survives restarts.
+
+While a job runs, the streamed LLM output is kept in memory and relayed to
+event-stream subscribers connected to the same process; other processes
+only see status changes.
+"""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import functools
+import logging
+import time
+from typing import AsyncIterator
+import uuid
+
+from fastapi import HTTPException
+from sqlalchemy import and_, delete, or_, select, update
+
+from . import async_storage, scrapes
+from .config import get_settings
+from .db import Job, SessionLocal
+from .models import JobOut
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("succeeded", "failed")
+# How often one worker per process deletes expired job history.
+PRUNE_INTERVAL_SECONDS = 3600
+# How long streamed output stays available after a job finishes.
+PARTIAL_RETENTION_SECONDS = 60
+
+
+@dataclass(frozen=True)
+class _ClaimedJob:
+    id: str
+    kind: str
+    url: str | None
+    slug: str | None
+    refresh: bool
+    attempts: int
+
+
+class _Listener:
+    def __init__(self) -> None:
+        self.event = asyncio.Event()
+        # Whether the job row changed, as opposed to only new streamed output.
+        self.reload = True
+
+
+_wakeups: asyncio.Queue[None] | None = None
+_workers: list[asyncio.Task] = []
+_listeners: dict[str, set[_Listener]] = {}
+# Streamed Markdown of running jobs, as received from the LLM.
+_partials: dict[str, list[str]] = {}
+
+
+def _job_out(job: Job) -> JobOut:
+    return JobOut(
+        id=job.id,
+        kind=job.kind,
+        status=job.status,
+        url=job.url,
+        slug=job.slug,
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+
+
+def _claimable(now: datetime):
+    return or_(
+        Job.status == "queued",
+        and_(Job.status == "running", Job.lease_expires_at < now),
+    )
+
+
+def _insert_job(job: Job) -> JobOut:
+    with SessionLocal() as db:
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        return _job_out(job)
+
+
+def _load_job(job_id: str) -> JobOut | None:
+    with SessionLocal() as db:
+        job = db.get(Job, job_id)
+        return _job_out(job) if job is not None else None
+
+
+def _claim_job() -> _ClaimedJob | None:
+    """
+    Take the oldest claimable job. The update is conditional on the attempt
+    count read just before, so two processes can never claim the same job.
+    """
+    settings = get_settings()
+    with SessionLocal() as db:
+        while True:
+            now = datetime.utcnow()
+            job = db.execute(
+                select(Job).where(_claimable(now)).order_by(Job.created_at).limit(1)
+            ).scalar_one_or_none()
+            if job is None:
+                return None
+
+            claimed = _ClaimedJob(
+                id=job.id,
+                kind=job.kind,
+                url=job.url,
+                slug=job.slug,
+                refresh=job.refresh,
+                attempts=job.attempts + 1,
+            )
+            guard = and_(Job.id == job.id, Job.attempts == job.attempts, _claimable(now))
+            if job.attempts >= settings.job_max_attempts:
+                values = {
+                    "status": "failed",
+                    "error": "Job was interrupted too many times",
+                    "finished_at": now,
+                    "lease_expires_at": None,
+                }
+            else:
+                values = {
+                    "status": "running",
+                    "attempts": claimed.attempts,
+                    "started_at": now,
+                    "lease_expires_at": now + timedelta(seconds=settings.job_lease_seconds),
+                }
+            rowcount = db.execute(update(Job).where(guard).values(**values)).rowcount
+            db.commit()
+            if rowcount and values["status"] == "running":
+                return claimed
+            db.expire_all()
+
+
+def _owned(job: _ClaimedJob):
+    return and_(Job.id == job.id, Job.attempts == job.attempts, Job.status == "running")
+
+
+def _extend_lease(job: _ClaimedJob) -> None:
+    lease = timedelta(seconds=get_settings().job_lease_seconds)
+    with SessionLocal() as db:
+        db.execute(
+            update(Job).where(_owned(job)).values(lease_expires_at=datetime.utcnow() + lease)
+        )
+        db.commit()
+
+
+def _finish_job(job: _ClaimedJob, status: str, slug: str | None, error: str | None) -> None:
+    with SessionLocal() as db:
+        db.execute(
+            update(Job)
+            .where(_owned(job))
+            .values(
+                status=status,
+                slug=slug,
+                error=error,
+                finished_at=datetime.utcnow(),
+                lease_expires_at=None,
+            )
+        )
+        db.commit()
+
+
+def _release_job(job: _ClaimedJob) -> None:
+    # Shutdown is not the job's fault, so the attempt is not counted.
+    with SessionLocal() as db:
+        db.execute(
+            update(Job)
+            .where(_owned(job))
+            .values(
+                status="queued",
+                attempts=job.attempts - 1,
+                started_at=None,
+                lease_expires_at=None,
+            )
+        )
+        db.commit()
+
+
+def _prune_jobs() -> None:
+    cutoff = datetime.utcnow() - timedelta(hours=get_settings().job_retention_hours)
+    with SessionLocal() as db:
+        db.execute(
+            delete(Job).where(Job.status.in_(TERMINAL_STATUSES), Job.finished_at < cutoff)
+        )
+        db.commit()
+
+
+def _notify(job_id: str, reload: bool = True) -> None:
+    for listener in _listeners.get(job_id, ()):
+        listener.reload = listener.reload or reload
+        listener.event.set()
+
+
+def _publish_delta(job_id: str, delta: str) -> None:
+    _partials.setdefault(job_id, []).append(delta)
+    _notify(job_id, reload=False)
+
+
+def _drop_partial(job_id: str, buffer: list[str]) -> None:
+    # A later attempt of the same job has its own buffer; leave that alone.
+    if _partials.get(job_id) is buffer:
+        del _partials[job_id]
+
+
+def _wake_workers() -> None:
+    if _wakeups is not None:
+        _wakeups.put_nowait(None)
+
+
+async def _keep_lease(job: _ClaimedJob) -> None:
+    interval = get_settings().job_lease_seconds / 3
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(_extend_lease, job)
+        except Exception:
+            logger.exception("Extending the lease of job %s failed", job.id)
+
+
+async def _run_job(job: _ClaimedJob) -> None:
+    heartbeat = asyncio.create_task(_keep_lease(job))
+    buffer = _partials[job.id] = []
+    on_delta = functools.partial(_publish_delta, job.id)
+    try:
+        if job.kind == "rescrape":
+            recipe = await scrapes.rescrape_recipe(job.slug, on_delta=on_delta)
+        else:
+            recipe = await scrapes.create_recipe(job.url, refresh=job.refresh, on_delta=on_delta)
+    except asyncio.CancelledError:
+        # Hand the job back so the next worker to start picks it up.
+        await asyncio.to_thread(_release_job, job)
+        raise
+    except Exception as exc:
+        error = exc.detail if isinstance(exc, HTTPException) else str(exc)
+        logger.warning("Job %s (%s) failed: %s", job.id, job.kind, error or exc.__class__.__name__)
+        outcome = ("failed", job.slug, str(error or exc.__class__.__name__))
+    else:
+        outcome = ("succeeded", recipe.metadata.slug, None)
+    finally:
+        heartbeat.cancel()
+        asyncio.get_running_loop().call_later(
+            PARTIAL_RETENTION_SECONDS, _drop_partial, job.id, buffer
+        )
+    try:
+        await asyncio.to_thread(_finish_job, job, *outcome)
+    except Exception:
+        # The lease runs out and the job is claimed again.
+        logger.exception("Recording the result of job %s failed", job.id)
+    _notify(job.id)
+
+
+async def _worker(prunes: bool) -> None:
+    settings = get_settings()
+    poll_interval = settings.job_poll_interval_ms / 1000
+    last_prune = 0.0
+    while True:
+        if prunes and time.monotonic() - last_prune > PRUNE_INTERVAL_SECONDS:
+            last_prune = time.monotonic()
+            try:
+                await asyncio.to_thread(_prune_jobs)
+            except Exception:
+                logger.exception("Pruning finished jobs failed")
+
+        try:
+            job = await asyncio.to_thread(_claim_job)
+        except Exception:
+            logger.exception("Claiming a job failed")
+            job = None
+        if job is None:
+            # Woken early by local submissions; the poll picks up jobs
+            # submitted through other processes and expired leases.
+            try:
+                await asyncio.wait_for(_wakeups.get(), poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        _notify(job.id)
+        try:
+            await _run_job(job)
+        except Exception:
+            logger.exception("Job %s failed unexpectedly", job.id)
+
+
+def start() -> None:
+    global _wakeups
+    _wakeups = asyncio.Queue()
+    for index in range(get_settings().job_workers):
+        _workers.append(asyncio.create_task(_worker(prunes=index == 0), name=f"job-worker-{index}"))
+
+
+async def stop() -> None:
+    global _wakeups
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+    _wakeups = None
+
+
+async def submit_create(url: str, refresh: bool = False, user_id: int | None = None) -> JobOut:
+    """
+    Queue a scrape of ``url``. An already-saved URL yields a job that has
+    already succeeded, so clients can skip polling.
+    """
+    job = Job(id=uuid.uuid4().hex, kind="create", url=url, refresh=refresh, created_by=user_id)
+    if not refresh:
+        existing = await async_storage.find_recipe_by_url(url)
+        if existing is not None:
+            job.status = "succeeded"
+            job.slug = existing.metadata.slug
+            job.finished_at = datetime.utcnow()
+            return await asyncio.to_thread(_insert_job, job)
+
+    out = await asyncio.to_thread(_insert_job, job)
+    _wake_workers()
+    return out
+
+
+async def submit_rescrape(slug: str, user_id: int | None = None) -> JobOut:
+    # Reject missing recipes and recipes without a URL before queueing.
+    url = await scrapes.rescrape_source_url(slug)
+    job = Job(id=uuid.uuid4().hex, kind="rescrape", url=url, slug=slug, created_by=user_id)
+    out = await asyncio.to_thread(_insert_job, job)
+    _wake_workers()
+    return out
+
+
+async def get_job(job_id: str) -> JobOut | None:
+    return await asyncio.to_thread(_load_job, job_id)
+
+
+async def job_events(job_id: str) -> AsyncIterator[JobOut | str | None]:
+    """
+    Follow a job until it finishes.
+
+    Yields the job whenever its status changes and, while it runs, the newly
+    streamed Markdown as a ``str``. ``None`` is yielded after each quiet poll
+    interval so the caller can send a keep-alive.
+    """
+    poll_interval = get_settings().job_poll_interval_ms / 1000
+    listener = _Listener()
+    _listeners.setdefault(job_id, set()).add(listener)
+    try:
+        last: JobOut | None = None
+        sent = 0
+        while True:
+            listener.event.clear()
+            if listener.reload:
+                listener.reload = False
+                job = await asyncio.to_thread(_load_job, job_id)
+                if job is None:
+                    return
+            else:
+                job = last
+
+            quiet = True
+            chunks = _partials.get(job_id, [])
+            if len(chunks) < sent:
+                # The job was restarted and streams from the beginning again.
+                sent = 0
+            if len(chunks) > sent:
+                yield "".join(chunks[sent:])
+                sent = len(chunks)
+                quiet = False
+            if job != last:
+                last = job
+                yield job
+                if job.status in TERMINAL_STATUSES:
+                    return
+                quiet = False
+            if quiet:
+                yield None
+
+            try:
+                await asyncio.wait_for(listener.event.wait(), poll_interval)
+            except asyncio.TimeoutError:
+                listener.reload = True
+    finally:
+        listeners = _listeners.get(job_id)
+        if listeners is not None:
+            listeners.discard(listener)
+            if not listeners:
+                del _listeners[job_id]
@@ -1,7 +1,155 @@
+from contextlib import contextmanager
+import functools
+import importlib.util
+import json
+import logging
+import time
+from typing import Awaitable, AsyncIterator, Callable, Iterator, TypeVar
+
 import httpx
 
-from .config import get_settings
-from .prompts import RECIPE_SYSTEM_PROMPT, build_recipe_user_prompt
+from . import metrics
+from .config import Settings, get_settings
+from .llm_scheduler import Priority, run_scheduled
+from .prompts import RECIPE_CLASSIFY_SYSTEM_PROMPT, RECIPE_SYSTEM_PROMPT, build_recipe_user_prompt
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Rough size of a classification call, reserved from the tokens-per-minute budget.
+CLASSIFY_ESTIMATED_TOKENS = 1000
+
+# One pooled client for the whole app so scrapes reuse TCP/TLS connections.
+_http_client: httpx.AsyncClient | None = None
+
+
+def _build_http_client(settings: Settings) -> httpx.AsyncClient:
+    http2 = settings.llm_http2
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.warning("LLM_HTTP2 is enabled but the h2 package is missing; using HTTP/1.1")
+        http2 = False
+
+    return httpx.AsyncClient(
+        timeout=settings.llm_timeout_seconds,
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.llm_max_connections,
+            max_keepalive_connections=settings.llm_max_keepalive_connections,
+            keepalive_expiry=settings.llm_keepalive_expiry_seconds,
+        ),
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the shared HTTP client, creating it on first use.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = _build_http_client(get_settings())
+    return _http_client
+
+
+async def start_http_client() -> None:
+    get_http_client()
+
+
+async def close_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+def _output_text(data: dict) -> str | None:
+    """
+    Text of a complete Responses API response object.
+    """
+    output_text = data.get("output_text")
+    if output_text:
+        return output_text
+
+    chunks: list[str] = []
+    for item in data.get("output", []):
+        if item.get("type") != "message":
+            continue
+        for part in item.get("content", []):
+            if part.get("type") == "output_text" and part.get("text"):
+                chunks.append(part["text"])
+    return "".join(chunks) or None
+
+
+def _record_usage(operation: str, data: dict) -> int | None:
+    """
+    Count the tokens (and estimated cost) reported in a response's
+    ``usage`` block; returns the total, or None when it is missing.
+    """
+    settings = get_settings()
+    usage = data.get("usage") or {}
+    input_tokens = usage.get("input_tokens")
+    output_tokens = usage.get("output_tokens")
+    cost = 0.0
+    if isinstance(input_tokens, int):
+        metrics.LLM_TOKENS.inc(input_tokens, operation=operation, type="input")
+        cost += input_tokens * settings.llm_input_cost_per_million_tokens / 1_000_000
+    if isinstance(output_tokens, int):
+        metrics.LLM_TOKENS.inc(output_tokens, operation=operation, type="output")
+        cost += output_tokens * settings.llm_output_cost_per_million_tokens / 1_000_000
+    if cost:
+        metrics.LLM_COST.inc(cost, operation=operation)
+
+    total = usage.get("total_tokens")
+    return total if isinstance(total, int) else None
+
+
+@contextmanager
+def _observe_call(operation: str) -> Iterator[None]:
+    """
+    Record latency, in-flight count and failures of one LLM API call.
+    """
+    start = time.perf_counter()
+    outcome = "success"
+    try:
+        with metrics.LLM_REQUESTS_IN_FLIGHT.track(operation=operation):
+            yield
+    except BaseException as exc:
+        outcome = "error"
+        if isinstance(exc, httpx.HTTPStatusError):
+            metrics.LLM_ERRORS.inc(operation=operation, status=exc.response.status_code)
+        elif isinstance(exc, httpx.TransportError):
+            metrics.LLM_ERRORS.inc(operation=operation, status="transport")
+        elif isinstance(exc, Exception):
+            metrics.LLM_ERRORS.inc(operation=operation, status="error")
+        else:
+            outcome = "cancelled"
+        raise
+    finally:
+        metrics.LLM_REQUEST_DURATION.observe(
+            time.perf_counter() - start, operation=operation, outcome=outcome
+        )
+
+
+async def _observed(operation: str, call: Callable[[], Awaitable[T]]) -> T:
+    with _observe_call(operation):
+        return await call()
+
+
+async def _iter_sse_events(response: httpx.Response) -> AsyncIterator[dict]:
+    """
+    Decode the JSON payloads of a Server-Sent Events response.
+    """
+    data_lines: list[str] = []
+    async for line in response.aiter_lines():
+        if line.startswith("data:"):
+            data_lines.append(line[5:].lstrip())
+        elif not line and data_lines:
+            payload = "\n".join(data_lines)
+            data_lines = []
+            if payload != "[DONE]":
+                yield json.loads(payload)
+    if data_lines and data_lines != ["[DONE]"]:
+        yield json.loads("\n".join(data_lines))
 
 
 class LLMClient:
@@ -9,52 +157,170 @@ class LLMClient:
     Thin wrapper around the OpenAI Responses API.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self, http_client: httpx.AsyncClient | None = None, base_url: str | None = None
+    ) -> None:
         self.settings = get_settings()
+        self.http_client = http_client or get_http_client()
+        self.responses_url = f"{(base_url or self.settings.openai_base_url).rstrip('/')}/responses"
+
+    def _request_kwargs(self, url: str, stream: bool) -> dict:
+        system_prompt = RECIPE_SYSTEM_PROMPT
+        user_prompt = build_recipe_user_prompt(url)
 
-    async def generate_recipe_markdown(self, url: str) -> str:
+        body = {
+            "model": self.settings.openai_model,
+            "instructions": system_prompt,
+            "input": user_prompt,
+            "tools": [{"type": "web_search"}],
+            "temperature": 0,
+        }
+        if stream:
+            body["stream"] = True
+        return {
+            "url": self.responses_url,
+            "headers": {
+                "Authorization": f"Bearer {self.settings.openai_api_key}",
+                "Content-Type": "application/json",
+            },
+            "json": body,
+        }
+
+    async def generate_recipe_markdown(
+        self,
+        url: str,
+        on_delta: Callable[[str], None] | None = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> str:
+        """
+        Generate the recipe Markdown for ``url``.
+
+        With ``llm_stream`` enabled the response is streamed and every text
+        delta is passed to ``on_delta`` as it arrives; the full text is
+        returned either way. The call waits for the rate-limit budgets in
+        the given priority lane and is retried on transient failures.
+        """
         if not self.settings.openai_api_key:
             raise RuntimeError("OPENAI_API_KEY not configured")
 
-        system_prompt = RECIPE_SYSTEM_PROMPT
-        user_prompt = build_recipe_user_prompt(url)
+        if self.settings.llm_stream:
+            call = functools.partial(self._generate_streaming, url, on_delta)
+        else:
+            call = functools.partial(self._generate, url, on_delta)
+        return await run_scheduled(
+            priority,
+            self.settings.llm_estimated_tokens_per_scrape,
+            functools.partial(_observed, "generate", call),
+        )
+
+    async def _generate(
+        self, url: str, on_delta: Callable[[str], None] | None
+    ) -> tuple[str, int | None]:
+        response = await self.http_client.post(**self._request_kwargs(url, stream=False))
+        response.raise_for_status()
+        data = response.json()
+        total_tokens = _record_usage("generate", data)
+
+        output_text = _output_text(data)
+        if not output_text:
+            raise RuntimeError("OpenAI response did not include output text")
+        if on_delta is not None:
+            on_delta(output_text)
+        return output_text, total_tokens
 
-        async with httpx.AsyncClient(timeout=60) as client:
-            response = await client.post(
-                "https://api.openai.com/v1/responses",
-                headers={
-                    "Authorization": f"Bearer {self.settings.openai_api_key}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "model": self.settings.openai_model,
-                    "instructions": system_prompt,
-                    "input": user_prompt,
-                    "tools": [{"type": "web_search"}],
-                    "temperature": 0,
-                },
-            )
+    async def _generate_streaming(
+        self, url: str, on_delta: Callable[[str], None] | None
+    ) -> tuple[str, int | None]:
+        chunks: list[str] = []
+        completed: dict | None = None
+        async with self.http_client.stream("POST", **self._request_kwargs(url, stream=True)) as response:
+            if response.is_error:
+                await response.aread()
             response.raise_for_status()
-            data = response.json()
 
-            output_text = data.get("output_text")
-            if output_text:
-                return output_text
+            try:
+                async for event in _iter_sse_events(response):
+                    event_type = event.get("type")
+                    if event_type == "response.output_text.delta":
+                        delta = event.get("delta") or ""
+                        if delta:
+                            chunks.append(delta)
+                            if on_delta is not None:
+                                on_delta(delta)
+                    elif event_type == "response.completed":
+                        completed = event.get("response") or {}
+                    elif event_type in ("response.failed", "response.incomplete", "error"):
+                        error = (event.get("response") or {}).get("error") or event.get("error") or event
+                        raise RuntimeError(f"OpenAI response {event_type}: {error}")
+            except httpx.TransportError as exc:
+                if chunks:
+                    # Output was already passed on; a retry would repeat it.
+                    raise RuntimeError(f"OpenAI stream interrupted: {exc}") from exc
+                raise
 
-            chunks: list[str] = []
-            for item in data.get("output", []):
-                if item.get("type") != "message":
-                    continue
-                for part in item.get("content", []):
-                    if part.get("type") == "output_text" and part.get("text"):
-                        chunks.append(part["text"])
+        total_tokens = _record_usage("generate", completed or {})
+        output_text = "".join(chunks)
+        if not output_text and completed is not None:
+            # No deltas (e.g. a proxy that buffers the stream): use the final object.
+            output_text = _output_text(completed) or ""
+            if output_text and on_delta is not None:
+                on_delta(output_text)
+        if not output_text:
+            raise RuntimeError("OpenAI response did not include output text")
+        return output_text, total_tokens
 
-            if not chunks:
-                raise RuntimeError("OpenAI response did not include output text")
+    async def classify_recipe(
+        self, summary: str, priority: Priority = Priority.INTERACTIVE
+    ) -> dict:
+        """
+        Ask for the classification fields (meal, category, ethnicity,
+        diet_friendly, tags) of an already extracted recipe. This is a short
+        completion without web search.
+        """
+        if not self.settings.openai_api_key:
+            raise RuntimeError("OPENAI_API_KEY not configured")
+        call = functools.partial(self._classify, summary)
+        return await run_scheduled(
+            priority, CLASSIFY_ESTIMATED_TOKENS, functools.partial(_observed, "classify", call)
+        )
+
+    async def _classify(self, summary: str) -> tuple[dict, int | None]:
+        response = await self.http_client.post(
+            self.responses_url,
+            headers={
+                "Authorization": f"Bearer {self.settings.openai_api_key}",
+                "Content-Type": "application/json",
+            },
+            json={
+                "model": self.settings.openai_model,
+                "instructions": RECIPE_CLASSIFY_SYSTEM_PROMPT,
+                "input": summary,
+                "text": {"format": {"type": "json_object"}},
+                "temperature": 0,
+            },
+        )
+        response.raise_for_status()
+        body = response.json()
+        total_tokens = _record_usage("classify", body)
 
-            return "".join(chunks)
+        output_text = _output_text(body)
+        if not output_text:
+            raise RuntimeError("OpenAI response did not include output text")
+        data = json.loads(output_text)
+        if not isinstance(data, dict):
+            raise RuntimeError("OpenAI classification was not a JSON object")
+        return data, total_tokens
+
+
+async def classify_recipe(summary: str, priority: Priority = Priority.INTERACTIVE) -> dict:
+    client = LLMClient()
+    return await client.classify_recipe(summary, priority=priority)
 
 
-async def generate_recipe_markdown(url: str) -> str:
+async def generate_recipe_markdown(
+    url: str,
+    on_delta: Callable[[str], None] | None = None,
+    priority: Priority = Priority.INTERACTIVE,
+) -> str:
     client = LLMClient()
-    return await client.generate_recipe_markdown(url)
+    return await client.generate_recipe_markdown(url, on_delta=on_delta, priority=priority)
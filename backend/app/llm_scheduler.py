@@ -0,0 +1,249 @@
+"""
+Rate-limit-aware scheduling for LLM calls.
+
+Every call reserves one request and an estimated number of tokens from
+per-minute budgets (``llm_requests_per_minute``/``llm_tokens_per_minute``,
+0 disables a budget) before it is sent; the estimate is settled against the
+reported usage afterwards. Waiting calls are granted in priority order, so
+interactive creates go ahead of background rescrapes and bulk imports.
+
+Failed calls are retried with jittered exponential backoff. A 429 honours
+the ``Retry-After`` header and also pauses the whole scheduler, since every
+other call would be rejected the same way.
+"""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+import enum
+import heapq
+import itertools
+import logging
+import random
+import time
+from typing import Awaitable, Callable, TypeVar
+
+import httpx
+
+from . import metrics
+from .config import get_settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+class Priority(enum.IntEnum):
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+class _Budget:
+    """
+    Token bucket refilled continuously at ``per_minute`` units per minute.
+    The level may go negative when a call used more than it reserved.
+    """
+
+    def __init__(self, per_minute: int) -> None:
+        self.capacity = float(per_minute)
+        self.level = float(per_minute)
+        self._updated = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.capacity <= 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.capacity / 60)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        if self.unlimited:
+            return 0.0
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) * 60 / self.capacity
+
+    def take(self, amount: float) -> None:
+        if not self.unlimited:
+            self._refill()
+            self.level -= min(amount, self.capacity)
+
+    def give_back(self, amount: float) -> None:
+        if not self.unlimited:
+            self._refill()
+            self.level = min(self.capacity, self.level + amount)
+
+
+@dataclass
+class Reservation:
+    tokens: int
+
+
+class LLMScheduler:
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int) -> None:
+        self._requests = _Budget(requests_per_minute)
+        self._tokens = _Budget(tokens_per_minute)
+        self._waiters: list[tuple[int, int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self._paused_until = 0.0
+        self._timer: asyncio.TimerHandle | None = None
+
+    async def acquire(self, priority: Priority, tokens: int) -> Reservation:
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._sequence), tokens, future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just as the caller went away: return the budget.
+                self._requests.give_back(1)
+                self._tokens.give_back(tokens)
+            self._dispatch()
+            raise
+        return Reservation(tokens=tokens)
+
+    def settle(self, reservation: Reservation, used_tokens: int | None) -> None:
+        """
+        Correct the token budget once the real usage is known. A call that
+        failed passes 0.
+        """
+        if used_tokens is None:
+            return
+        difference = reservation.tokens - used_tokens
+        if difference > 0:
+            self._tokens.give_back(difference)
+            self._dispatch()
+        elif difference < 0:
+            self._tokens.take(-difference)
+
+    def pause(self, seconds: float) -> None:
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        while self._waiters:
+            _, _, tokens, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            wait = max(
+                self._paused_until - time.monotonic(),
+                self._requests.wait_time(1),
+                self._tokens.wait_time(tokens),
+            )
+            if wait > 0:
+                self._timer = asyncio.get_running_loop().call_later(wait, self._dispatch)
+                return
+            heapq.heappop(self._waiters)
+            self._requests.take(1)
+            self._tokens.take(tokens)
+            future.set_result(None)
+
+
+_scheduler: LLMScheduler | None = None
+
+
+def get_scheduler() -> LLMScheduler:
+    global _scheduler
+    if _scheduler is None:
+        settings = get_settings()
+        _scheduler = LLMScheduler(settings.llm_requests_per_minute, settings.llm_tokens_per_minute)
+    return _scheduler
+
+
+def retry_after_seconds(response: httpx.Response) -> float | None:
+    """
+    Delay requested by the server, from ``retry-after-ms`` or ``Retry-After``
+    (seconds or an HTTP date).
+    """
+    value = response.headers.get("retry-after-ms")
+    if value:
+        try:
+            return max(0.0, float(value) / 1000)
+        except ValueError:
+            pass
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_seconds(attempt: int) -> float:
+    """
+    Full-jitter exponential backoff for the given (0-based) retry.
+    """
+    settings = get_settings()
+    ceiling = min(settings.llm_backoff_max_seconds, settings.llm_backoff_base_seconds * 2**attempt)
+    return random.uniform(0, ceiling)
+
+
+async def run_scheduled(
+    priority: Priority,
+    estimated_tokens: int,
+    call: Callable[[], Awaitable[tuple[T, int | None]]],
+) -> T:
+    """
+    Run ``call`` under the rate-limit budgets, retrying transient failures.
+
+    ``call`` returns its result and the tokens it used (None if unknown).
+    HTTP status errors with a retryable status and transport errors are
+    retried, so a streaming call must not let a transport error escape once
+    it has passed output on.
+    """
+    settings = get_settings()
+    scheduler = get_scheduler()
+    for attempt in range(settings.llm_max_retries + 1):
+        queued_at = time.monotonic()
+        reservation = await scheduler.acquire(priority, estimated_tokens)
+        metrics.LLM_QUEUE_WAIT.observe(time.monotonic() - queued_at, priority=priority.name.lower())
+        # Calls that fail, however they fail, give the whole estimate back.
+        used_tokens: int | None = 0
+        try:
+            result, used_tokens = await call()
+            return result
+        except Exception as exc:
+            delay = None
+            if isinstance(exc, httpx.HTTPStatusError):
+                retryable = exc.response.status_code in RETRYABLE_STATUS_CODES
+                delay = retry_after_seconds(exc.response)
+                if exc.response.status_code == 429:
+                    scheduler.pause(delay if delay is not None else backoff_seconds(attempt))
+            else:
+                retryable = isinstance(exc, httpx.TransportError)
+            if not retryable or attempt == settings.llm_max_retries:
+                raise
+            if delay is None:
+                delay = backoff_seconds(attempt)
+            else:
+                delay += random.uniform(0, settings.llm_backoff_base_seconds)
+            logger.warning(
+                "LLM call failed (%s), retry %d/%d in %.1fs",
+                exc,
+                attempt + 1,
+                settings.llm_max_retries,
+                delay,
+            )
+            metrics.LLM_RETRIES.inc()
+        finally:
+            scheduler.settle(reservation, used_tokens)
+        await asyncio.sleep(delay)
+    raise AssertionError("unreachable")
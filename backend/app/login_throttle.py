@@ -0,0 +1,224 @@
+"""
+Login throttling.
+
+Failed sign-ins are counted per username and per client IP over a sliding
+window of ``login_throttle_window_seconds``.
+
+Once a username has ``login_throttle_per_username`` failures, every attempt
+for it waits before the password is checked: ``login_throttle_delay_seconds``,
+doubling with each further failure up to ``login_throttle_max_delay_seconds``.
+Guessing slows to a crawl, but the owner still gets in with the right
+password, so nobody can lock an account out by knowing its name.
+
+Once a client IP has ``login_throttle_per_ip`` failures, further attempts
+get 429 before the user is looked up or any bcrypt work is done. The app
+normally sits behind a reverse proxy, so the client IP is only known when
+the proxy is listed in ``trusted_proxies``; otherwise the per-IP limit is
+off (every client would share the proxy's address).
+
+A successful sign-in clears the username's count (not the IP's). Counts are
+kept in memory per process, for at most ``login_throttle_max_keys``
+usernames and IPs (least recently used dropped first). With
+``login_throttle_persist`` they are kept in the ``login_failures`` table of
+the auth database instead, so they survive restarts and are shared by all
+workers.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta
+from functools import lru_cache
+import ipaddress
+import math
+import time
+
+from fastapi import HTTPException, Request, status
+from sqlalchemy import delete, insert, select
+
+from . import metrics
+from .config import get_settings
+from .db import AsyncSessionLocal, LoginFailure
+
+
+class _SlidingWindows:
+    """
+    Recent failure times per key, for a bounded number of keys. Only the
+    newest few times of a key can matter, so no more are kept.
+    """
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[str, deque[float]] = OrderedDict()
+
+    def ages(self, key: str, window: float, now: float) -> list[float]:
+        """
+        Seconds since each failure of ``key`` within the window, newest first.
+        """
+        times = self._entries.get(key)
+        if times is None:
+            return []
+        while times and times[0] <= now - window:
+            times.popleft()
+        if not times:
+            del self._entries[key]
+            return []
+        return [now - failed_at for failed_at in reversed(times)]
+
+    def record(self, key: str, keep: int, now: float, max_keys: int) -> None:
+        times = self._entries.get(key)
+        if times is None or times.maxlen != keep:
+            times = self._entries[key] = deque(times or (), maxlen=keep)
+        times.append(now)
+        self._entries.move_to_end(key)
+        while len(self._entries) > max_keys:
+            self._entries.popitem(last=False)
+
+    def reset(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+
+_windows = _SlidingWindows()
+
+
+@lru_cache(maxsize=8)
+def _trusted_networks(
+    proxies: tuple[str, ...],
+) -> tuple[ipaddress.IPv4Network | ipaddress.IPv6Network, ...]:
+    return tuple(ipaddress.ip_network(proxy, strict=False) for proxy in proxies)
+
+
+def client_ip(request: Request) -> str | None:
+    """
+    The client's address for per-IP throttling, or None unless
+    ``trusted_proxies`` is set. ``X-Forwarded-For`` is read from the nearest
+    hop outwards, and the first address that is not a trusted proxy wins, so
+    a client cannot forge its address by sending the header itself.
+    """
+    networks = _trusted_networks(tuple(get_settings().trusted_proxies))
+    if not networks or request.client is None:
+        return None
+    forwarded = request.headers.get("x-forwarded-for", "")
+    hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+    hops.append(request.client.host)
+    for hop in reversed(hops):
+        try:
+            address = ipaddress.ip_address(hop)
+        except ValueError:
+            return hop
+        if not any(address in network for network in networks):
+            return hop
+    return hops[0]
+
+
+def _username_keep(limit: int) -> int:
+    # Enough failures to tell how far the delay has doubled.
+    settings = get_settings()
+    doublings = math.log2(
+        max(settings.login_throttle_max_delay_seconds / settings.login_throttle_delay_seconds, 1)
+    )
+    return limit + math.ceil(doublings) + 1
+
+
+def _limits(username: str, ip: str | None) -> list[tuple[str, str, int, int]]:
+    """
+    The (limit name, key, limit, failures to keep) that apply to an attempt.
+    """
+    settings = get_settings()
+    limits = []
+    limit = settings.login_throttle_per_username
+    if limit > 0 and settings.login_throttle_delay_seconds > 0:
+        limits.append(("username", f"user:{username}", limit, _username_keep(limit)))
+    limit = settings.login_throttle_per_ip
+    if limit > 0 and ip:
+        limits.append(("ip", f"ip:{ip}", limit, limit))
+    return limits
+
+
+async def _persisted_ages(key: str, keep: int, window: float) -> list[float]:
+    now = datetime.utcnow()
+    since = now - timedelta(seconds=window)
+    async with AsyncSessionLocal() as db:
+        times = (
+            await db.scalars(
+                select(LoginFailure.failed_at)
+                .where(LoginFailure.key == key, LoginFailure.failed_at > since)
+                .order_by(LoginFailure.failed_at.desc())
+                .limit(keep)
+            )
+        ).all()
+    return [(now - failed_at).total_seconds() for failed_at in times]
+
+
+def _username_delay(failures: int, limit: int) -> float:
+    if failures < limit:
+        return 0
+    settings = get_settings()
+    # Cap the exponent as well, so a long run of failures cannot overflow.
+    doublings = min(failures - limit, 64)
+    return min(
+        settings.login_throttle_delay_seconds * 2**doublings,
+        settings.login_throttle_max_delay_seconds,
+    )
+
+
+async def check_login(username: str, ip: str | None) -> None:
+    """
+    Raise 429 (with ``Retry-After``) when the client IP has too many recent
+    failed sign-ins, then wait out the username's delay, if any.
+    """
+    settings = get_settings()
+    window = settings.login_throttle_window_seconds
+    retry_after = 0.0
+    delay = 0.0
+    for name, key, limit, keep in _limits(username, ip):
+        if settings.login_throttle_persist:
+            ages = await _persisted_ages(key, keep, window)
+        else:
+            ages = _windows.ages(key, window, time.monotonic())
+        if len(ages) < limit:
+            continue
+        metrics.AUTH_LOGINS_THROTTLED.inc(limit=name)
+        if name == "username":
+            delay = _username_delay(len(ages), limit)
+        else:
+            # Until the limit-th newest failure leaves the window.
+            retry_after = max(retry_after, window - ages[limit - 1])
+    if retry_after > 0:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many failed sign-in attempts, try again later",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+    if delay > 0:
+        await asyncio.sleep(delay)
+
+
+async def record_failure(username: str, ip: str | None) -> None:
+    settings = get_settings()
+    limits = _limits(username, ip)
+    if not settings.login_throttle_persist:
+        now = time.monotonic()
+        for _, key, _, keep in limits:
+            _windows.record(key, keep, now, settings.login_throttle_max_keys)
+        return
+    if not limits:
+        return
+    now = datetime.utcnow()
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            insert(LoginFailure), [{"key": key, "failed_at": now} for _, key, _, _ in limits]
+        )
+        # Failures older than the window no longer count; drop them as we go.
+        cutoff = now - timedelta(seconds=settings.login_throttle_window_seconds)
+        await db.execute(delete(LoginFailure).where(LoginFailure.failed_at <= cutoff))
+        await db.commit()
+
+
+async def record_success(username: str) -> None:
+    key = f"user:{username}"
+    if not get_settings().login_throttle_persist:
+        _windows.reset(key)
+        return
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(LoginFailure).where(LoginFailure.key == key))
+        await db.commit()
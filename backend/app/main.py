@@ -1,34 +1,121 @@
+from contextlib import asynccontextmanager
+import json
+import os
 from pathlib import Path
+import secrets
+from typing import Literal
 from urllib.parse import urlencode
 
-from fastapi import Depends, FastAPI, HTTPException, Request, Response, status
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, RedirectResponse
+from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-
-from sqlalchemy.orm import Session
-
-from . import auth, storage
+from starlette.datastructures import Headers
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import (
+    async_storage,
+    auth,
+    imports,
+    jobs,
+    login_throttle,
+    metrics,
+    render,
+    rescrapes,
+    scrapes,
+    storage,
+    structured,
+)
+from .compression import CompressionMiddleware, accepted_encodings
 from .config import get_settings
-from .db import User, get_db, init_db
-from .llm import generate_recipe_markdown
+from .db import User, async_engine, get_db, init_db
+from .llm import close_http_client, start_http_client
 from .models import (
+    BulkImportRequest,
+    BulkImportStatus,
     HealthStatus,
+    JobOut,
     LoginRequest,
     PasswordChangeRequest,
+    RecipeCacheStats,
     RecipeCreateRequest,
+    RecipeFacets,
+    RecipeHtmlResponse,
+    RecipePage,
     RecipeResponse,
-    RecipeMetadata,
+    RecipeSearchHit,
     RegistrationStatus,
+    RescrapeRunOut,
+    RescrapeRunRequest,
+    ScrapeStats,
     Token,
     UserCreate,
     UserOut,
     UserUpdate,
 )
-from .security import create_access_token, hash_password, verify_password
+from .recipe_index import RecipeFilters, init_recipe_index
+from .security import (
+    create_access_token,
+    hash_password_async,
+    password_needs_rehash,
+    verify_password_async,
+)
+from .watcher import RecipeWatcher
+
+
+# Precompressed siblings, in order of preference, written at image build time
+# by backend/tools/precompress.py.
+PRECOMPRESSED_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
 
 
 class SPAStaticFiles(StaticFiles):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # Static assets only change with a new image, so remember which
+        # precompressed siblings exist instead of checking on every request.
+        self._precompressed: dict[str, tuple[tuple[str, str], ...]] = {}
+
+    def _precompressed_variants(self, path: str) -> tuple[tuple[str, str], ...]:
+        variants = self._precompressed.get(path)
+        if variants is None:
+            variants = tuple(
+                (encoding, path + suffix)
+                for encoding, suffix in PRECOMPRESSED_ENCODINGS
+                if os.path.isfile(path + suffix)
+            )
+            self._precompressed[path] = variants
+        return variants
+
+    def _maybe_precompressed(self, response: Response, scope) -> Response:
+        if not isinstance(response, FileResponse) or response.status_code != status.HTTP_200_OK:
+            return response
+
+        variants = self._precompressed_variants(str(response.path))
+        if not variants:
+            return response
+
+        accepted = accepted_encodings(Headers(scope=scope).get("Accept-Encoding", ""))
+        for encoding, compressed_path in variants:
+            if encoding in accepted:
+                # Send the original file's validators, which is what
+                # StaticFiles checks If-None-Match against, so repeat requests
+                # get 304s. The ETag is weak since these bytes differ.
+                etag = response.headers["etag"]
+                return FileResponse(
+                    compressed_path,
+                    media_type=response.media_type,
+                    headers={
+                        "Content-Encoding": encoding,
+                        "Vary": "Accept-Encoding",
+                        "ETag": etag if etag.startswith("W/") else f"W/{etag}",
+                        "Last-Modified": response.headers["last-modified"],
+                    },
+                )
+        response.headers["Vary"] = "Accept-Encoding"
+        return response
+
     async def get_response(self, path: str, scope):
         normalized_path = path.lstrip("/")
         try:
@@ -39,7 +126,7 @@ class SPAStaticFiles(StaticFiles):
             response = None
 
         if response is not None and response.status_code != status.HTTP_404_NOT_FOUND:
-            return response
+            return self._maybe_precompressed(response, scope)
 
         # Avoid swallowing API 404s or missing asset files with extensions.
         if (
@@ -51,7 +138,50 @@ class SPAStaticFiles(StaticFiles):
                 return response
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
 
-        return await super().get_response("index.html", scope)
+        response = await super().get_response("index.html", scope)
+        return self._maybe_precompressed(response, scope)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Whether the request's If-None-Match header matches ``etag``.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates
+
+
+def set_validators(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    # Let clients keep a copy but revalidate it on every use.
+    response.headers["Cache-Control"] = "private, no-cache"
+
+
+def not_modified(etag: str) -> Response:
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_validators(response, etag)
+    return response
+
+
+def parse_minutes_ranges(values: list[str]) -> dict[str, tuple[int | None, int | None]]:
+    """
+    Parse ``total_minutes`` ranges such as ``30-59`` or ``120-`` (open-ended),
+    keyed by the range as given.
+    """
+    ranges: dict[str, tuple[int | None, int | None]] = {}
+    for value in values:
+        low, sep, high = value.partition("-")
+        if not sep or not (low.isdigit() or not low) or not (high.isdigit() or not high):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid total_minutes range: {value}",
+            )
+        ranges[value] = (int(low) if low else None, int(high) if high else None)
+    return ranges
 
 
 def resolve_frontend_dir() -> Path:
@@ -76,11 +206,38 @@ def resolve_frontend_dir() -> Path:
 
 def create_app() -> FastAPI:
     settings = get_settings()
-    app = FastAPI(title=settings.app_name)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        await start_http_client()
+        jobs.start()
+        rescrapes.start()
+        watcher: RecipeWatcher | None = None
+        if settings.watch_recipes:
+            watcher = RecipeWatcher(settings.output_dir)
+            watcher.start()
+        try:
+            yield
+        finally:
+            await jobs.stop()
+            await rescrapes.stop()
+            await imports.shutdown()
+            await scrapes.shutdown()
+            if watcher is not None:
+                await watcher.stop()
+            await close_http_client()
+            await structured.close_page_client()
+            await async_engine.dispose()
+
+    app = FastAPI(title=settings.app_name, lifespan=lifespan)
 
     # Ensure database tables exist on startup
     init_db()
 
+    # Bring the recipe metadata index up to date with the recipes directory
+    init_recipe_index()
+    storage.reconcile_recipe_index()
+
     if settings.frontend_origin:
         app.add_middleware(
             CORSMiddleware,
@@ -90,6 +247,13 @@ def create_app() -> FastAPI:
             allow_headers=["*"],
         )
 
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_minimum_size,
+        compresslevel=settings.gzip_compresslevel,
+        brotli_quality=settings.brotli_quality,
+    )
+
     api = settings.api_prefix
 
     @app.get("/health", response_model=HealthStatus)
@@ -102,6 +266,22 @@ def create_app() -> FastAPI:
             llm_configured=llm_ok,
         )
 
+    if settings.metrics_enabled:
+
+        @app.get("/metrics", include_in_schema=False)
+        async def metrics_endpoint(request: Request) -> Response:
+            # Without a token the endpoint stays hidden rather than public.
+            if settings.metrics_token is None:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+            expected = f"Bearer {settings.metrics_token}"
+            provided = request.headers.get("authorization", "")
+            if not secrets.compare_digest(provided.encode(), expected.encode()):
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Invalid metrics token",
+                )
+            return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
     @app.post("/share-target")
     async def share_target(request: Request) -> RedirectResponse:
         form = await request.form()
@@ -128,88 +308,238 @@ def create_app() -> FastAPI:
     async def share_target_get() -> RedirectResponse:
         return RedirectResponse(url="/add", status_code=status.HTTP_303_SEE_OTHER)
 
-    @app.post(f"{api}/recipes", response_model=RecipeResponse)
+    @app.post(
+        f"{api}/recipes",
+        response_model=JobOut,
+        status_code=status.HTTP_202_ACCEPTED,
+    )
     async def create_recipe(
         payload: RecipeCreateRequest,
+        response: Response,
+        current_user: User = Depends(auth.get_current_user),
+    ) -> JobOut:
+        job = await jobs.submit_create(
+            str(payload.url), refresh=payload.refresh, user_id=current_user.id
+        )
+        if job.status == "succeeded":
+            # Already saved: nothing was queued.
+            response.status_code = status.HTTP_200_OK
+        response.headers["Location"] = f"{api}/jobs/{job.id}"
+        return job
+
+    @app.post(
+        f"{api}/recipes/bulk",
+        response_model=BulkImportStatus,
+        status_code=status.HTTP_202_ACCEPTED,
+    )
+    async def bulk_import_recipes(
+        payload: BulkImportRequest,
         _: User = Depends(auth.get_current_user),
-    ) -> RecipeResponse:
-        markdown = await generate_recipe_markdown(url=str(payload.url))
-        return storage.save_recipe_markdown(markdown)
+    ) -> BulkImportStatus:
+        return imports.start_import([str(url) for url in payload.urls])
 
-    @app.get(f"{api}/recipes", response_model=list[RecipeMetadata])
-    async def list_recipes_endpoint(_: User = Depends(auth.get_current_user)) -> list[RecipeMetadata]:
-        return storage.list_recipes()
+    @app.get(f"{api}/recipes/bulk/{{import_id}}", response_model=BulkImportStatus)
+    async def bulk_import_status(
+        import_id: str,
+        _: User = Depends(auth.get_current_user),
+    ) -> BulkImportStatus:
+        batch = imports.get_import(import_id)
+        if batch is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Import not found",
+            )
+        return batch
 
-    @app.get(f"{api}/recipes/{{slug}}", response_model=RecipeResponse)
-    async def get_recipe(slug: str, _: User = Depends(auth.get_current_user)) -> RecipeResponse:
-        return storage.load_recipe(slug)
+    @app.get(f"{api}/recipes", response_model=RecipePage)
+    async def list_recipes_endpoint(
+        request: Request,
+        response: Response,
+        meal: list[str] = Query(default=[]),
+        category: list[str] = Query(default=[]),
+        ethnicity: list[str] = Query(default=[]),
+        diet_friendly: list[str] = Query(default=[]),
+        tags: list[str] = Query(default=[]),
+        min_total_minutes: int | None = Query(default=None, ge=0),
+        max_total_minutes: int | None = Query(default=None, ge=0),
+        total_minutes: list[str] = Query(default=[]),
+        sort: Literal["title", "modified"] = "title",
+        cursor: str | None = None,
+        limit: int = Query(default=50, ge=1, le=500),
+        _: User = Depends(auth.get_current_user),
+    ) -> RecipePage:
+        filters = RecipeFilters(
+            terms={
+                "meal": meal,
+                "category": category,
+                "ethnicity": ethnicity,
+                "diet_friendly": diet_friendly,
+                "tags": tags,
+            },
+            min_total_minutes=min_total_minutes,
+            max_total_minutes=max_total_minutes,
+            total_minutes_ranges=list(parse_minutes_ranges(total_minutes).values()),
+        )
+        etag = await async_storage.recipes_etag()
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        page = await async_storage.list_recipes(filters, sort=sort, cursor=cursor, limit=limit)
+        set_validators(response, etag)
+        return page
+
+    @app.get(f"{api}/recipes/facets", response_model=RecipeFacets)
+    async def recipe_facets_endpoint(
+        request: Request,
+        response: Response,
+        total_minutes: list[str] = Query(default=[]),
+        _: User = Depends(auth.get_current_user),
+    ) -> RecipeFacets:
+        ranges = parse_minutes_ranges(total_minutes)
+        etag = await async_storage.recipes_etag()
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        facets = await async_storage.recipe_facets(ranges)
+        set_validators(response, etag)
+        return facets
+
+    @app.get(f"{api}/recipes/search", response_model=list[RecipeSearchHit])
+    async def search_recipes_endpoint(
+        q: str = Query(min_length=1),
+        limit: int = Query(default=20, ge=1, le=100),
+        _: User = Depends(auth.get_current_user),
+    ) -> list[RecipeSearchHit]:
+        return await async_storage.search_recipes(q, limit=limit)
+
+    @app.get(f"{api}/recipes/{{slug}}", response_model=RecipeResponse | RecipeHtmlResponse)
+    async def get_recipe(
+        slug: str,
+        request: Request,
+        response: Response,
+        format: Literal["markdown", "html"] = "markdown",
+        _: User = Depends(auth.get_current_user),
+    ) -> RecipeResponse | RecipeHtmlResponse:
+        etag = await async_storage.recipe_etag(slug)
+        if format == "html":
+            # The rendered page also changes with the renderer.
+            etag = f'{etag[:-1]}-html{render.RENDER_VERSION}"'
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        if format == "html":
+            recipe = await async_storage.load_recipe_html(slug)
+        else:
+            recipe = await async_storage.load_recipe(slug)
+        set_validators(response, etag)
+        return recipe
 
     @app.put(f"{api}/recipes/{{slug}}", response_model=RecipeResponse)
     async def update_recipe_endpoint(
         slug: str, markdown: str, _: User = Depends(auth.get_current_user)
     ) -> RecipeResponse:
-        return storage.update_recipe(slug, markdown)
+        return await async_storage.update_recipe(slug, markdown)
 
-    @app.post(f"{api}/recipes/{{slug}}/rescrape", response_model=RecipeResponse)
+    @app.post(
+        f"{api}/recipes/{{slug}}/rescrape",
+        response_model=JobOut,
+        status_code=status.HTTP_202_ACCEPTED,
+    )
     async def rescrape_recipe(
         slug: str,
+        response: Response,
+        current_user: User = Depends(auth.get_current_user),
+    ) -> JobOut:
+        job = await jobs.submit_rescrape(slug, user_id=current_user.id)
+        response.headers["Location"] = f"{api}/jobs/{job.id}"
+        return job
+
+    @app.get(f"{api}/jobs/{{job_id}}", response_model=JobOut)
+    async def get_job(
+        job_id: str,
         _: User = Depends(auth.get_current_user),
-    ) -> RecipeResponse:
-        existing = storage.load_recipe(slug)
-        url = storage.extract_url_from_markdown(existing.markdown)
-        if not url:
+    ) -> JobOut:
+        job = await jobs.get_job(job_id)
+        if job is None:
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Recipe does not have a source URL in frontmatter.",
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Job not found",
+            )
+        return job
+
+    @app.get(f"{api}/jobs/{{job_id}}/events")
+    async def job_events(
+        job_id: str,
+        _: User = Depends(auth.get_current_user),
+    ) -> StreamingResponse:
+        if await jobs.get_job(job_id) is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Job not found",
             )
 
-        markdown = await generate_recipe_markdown(url=url)
-        return storage.update_recipe(slug, markdown)
+        async def stream():
+            async for event in jobs.job_events(job_id):
+                if event is None:
+                    yield ": keep-alive\n\n"
+                elif isinstance(event, str):
+                    yield f"event: delta\ndata: {json.dumps({'text': event})}\n\n"
+                else:
+                    yield f"event: job\ndata: {event.model_dump_json()}\n\n"
+
+        return StreamingResponse(
+            stream(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
 
     @app.post(f"{api}/auth/change-password")
     async def change_password(
         payload: PasswordChangeRequest,
         current_user: User = Depends(auth.get_current_user),
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_db),
     ) -> dict[str, str]:
-        user = db.query(User).filter(User.id == current_user.id).first()
+        user = await db.get(User, current_user.id)
         if user is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found",
             )
 
-        if not verify_password(payload.current_password, user.password_hash):
+        # Hand the connection back to the pool while bcrypt runs.
+        await db.close()
+        if not await verify_password_async(payload.current_password, user.password_hash):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Current password is incorrect",
             )
 
-        user.password_hash = hash_password(payload.new_password)
-        db.add(user)
-        db.commit()
+        password_hash = await hash_password_async(payload.new_password)
+        await db.execute(update(User).where(User.id == user.id).values(password_hash=password_hash))
+        await db.commit()
+        auth.invalidate_user(user.id)
 
         return {"detail": "Password updated"}
 
     @app.get(f"{api}/auth/registration-status", response_model=RegistrationStatus)
-    async def registration_status(db: Session = Depends(get_db)) -> RegistrationStatus:
-        total_users = db.query(User).count()
+    async def registration_status(db: AsyncSession = Depends(get_db)) -> RegistrationStatus:
+        total_users = await db.scalar(select(func.count(User.id)))
         return RegistrationStatus(has_users=total_users > 0)
 
     @app.post(f"{api}/auth/register", response_model=UserOut)
     async def register_user(
         payload: UserCreate,
         request: Request,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_db),
     ) -> UserOut:
-        existing = db.query(User).filter(User.username == payload.username).first()
+        existing = await db.scalar(select(User).where(User.username == payload.username))
         if existing is not None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="User with this username already exists",
             )
 
-        total_users = db.query(User).count()
+        total_users = await db.scalar(select(func.count(User.id)))
 
         # First user can be created without authentication and becomes admin.
         acting_user: User | None = None
@@ -221,7 +551,7 @@ def create_app() -> FastAPI:
                     detail="Authentication required to create users",
                 )
             user_id = auth.decode_access_token(token)
-            acting_user = db.query(User).filter(User.id == int(user_id)).first()
+            acting_user = await db.get(User, int(user_id))
             if acting_user is None or not acting_user.is_active:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
@@ -233,15 +563,16 @@ def create_app() -> FastAPI:
                     detail="Only admin users can create new accounts",
                 )
 
+        # Hand the connection back to the pool while bcrypt runs.
+        await db.close()
         user = User(
             username=payload.username,
-            password_hash=hash_password(payload.password),
+            password_hash=await hash_password_async(payload.password),
             is_active=True,
             is_admin=total_users == 0,
         )
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        await db.commit()
 
         return UserOut(
             id=user.id,
@@ -253,15 +584,23 @@ def create_app() -> FastAPI:
     @app.post(f"{api}/auth/login", response_model=Token)
     async def login(
         payload: LoginRequest,
+        request: Request,
         response: Response,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_db),
     ) -> Token:
-        user = db.query(User).filter(User.username == payload.username).first()
-        if user is None or not verify_password(payload.password, user.password_hash):
+        client_ip = login_throttle.client_ip(request)
+        await login_throttle.check_login(payload.username, client_ip)
+
+        user = await db.scalar(select(User).where(User.username == payload.username))
+        # Hand the connection back to the pool while bcrypt runs.
+        await db.close()
+        if user is None or not await verify_password_async(payload.password, user.password_hash):
+            await login_throttle.record_failure(payload.username, client_ip)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username or password",
             )
+        await login_throttle.record_success(payload.username)
 
         if not user.is_active:
             raise HTTPException(
@@ -269,6 +608,19 @@ def create_app() -> FastAPI:
                 detail="User account is inactive",
             )
 
+        if password_needs_rehash(user.password_hash):
+            # BCRYPT_ROUNDS changed since this hash was made; upgrade it now
+            # that we know the password, unless the password threads are busy.
+            try:
+                password_hash = await hash_password_async(payload.password)
+            except HTTPException:
+                pass
+            else:
+                await db.execute(
+                    update(User).where(User.id == user.id).values(password_hash=password_hash)
+                )
+                await db.commit()
+
         access_token = create_access_token(str(user.id))
         cookie_max_age = settings.access_token_expire_minutes * 60
 
@@ -302,14 +654,14 @@ def create_app() -> FastAPI:
     @app.get(f"{api}/admin/users", response_model=list[UserOut])
     async def admin_list_users(
         current_user: User = Depends(auth.get_current_user),
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_db),
     ) -> list[UserOut]:
         if not current_user.is_admin:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Admin privileges required",
             )
-        users = db.query(User).order_by(User.id.asc()).all()
+        users = (await db.scalars(select(User).order_by(User.id.asc()))).all()
         return [
             UserOut(
                 id=u.id,
@@ -320,12 +672,115 @@ def create_app() -> FastAPI:
             for u in users
         ]
 
+    @app.get(f"{api}/admin/cache", response_model=RecipeCacheStats)
+    async def admin_cache_stats(
+        current_user: User = Depends(auth.get_current_user),
+    ) -> RecipeCacheStats:
+        if not current_user.is_admin:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Admin privileges required",
+            )
+        return storage.recipe_cache_stats()
+
+    @app.get(f"{api}/admin/scrapes", response_model=ScrapeStats)
+    async def admin_scrape_stats(
+        current_user: User = Depends(auth.get_current_user),
+    ) -> ScrapeStats:
+        if not current_user.is_admin:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Admin privileges required",
+            )
+        return scrapes.scrape_stats()
+
+    @app.post(
+        f"{api}/admin/rescrapes",
+        response_model=RescrapeRunOut,
+        status_code=status.HTTP_202_ACCEPTED,
+    )
+    async def admin_start_rescrape(
+        payload: RescrapeRunRequest,
+        current_user: User = Depends(auth.get_current_user),
+    ) -> RescrapeRunOut:
+        if not current_user.is_admin:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Admin privileges required",
+            )
+        return await rescrapes.start_run(payload, user_id=current_user.id)
+
+    @app.get(f"{api}/admin/rescrapes", response_model=list[RescrapeRunOut])
+    async def admin_list_rescrapes(
+        current_user: User = Depends(auth.get_current_user),
+    ) -> list[RescrapeRunOut]:
+        if not current_user.is_admin:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Admin privileges required",
+            )
+        return await rescrapes.list_runs()
+
+    @app.get(f"{api}/admin/rescrapes/{{run_id}}", response_model=RescrapeRunOut)
+    async def admin_get_rescrape(
+        run_id: str,
+        current_user: User = Depends(auth.get_current_user),
+    ) -> RescrapeRunOut:
+        if not current_user.is_admin:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Admin privileges required",
+            )
+        run = await rescrapes.get_run(run_id)
+        if run is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Rescrape run not found",
+            )
+        return run
+
+    @app.post(f"{api}/admin/rescrapes/{{run_id}}/cancel", response_model=RescrapeRunOut)
+    async def admin_cancel_rescrape(
+        run_id: str,
+        current_user: User = Depends(auth.get_current_user),
+    ) -> RescrapeRunOut:
+        if not current_user.is_admin:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Admin privileges required",
+            )
+        run = await rescrapes.cancel_run(run_id)
+        if run is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Rescrape run not found",
+            )
+        return run
+
+    @app.post(f"{api}/admin/rescrapes/{{run_id}}/resume", response_model=RescrapeRunOut)
+    async def admin_resume_rescrape(
+        run_id: str,
+        current_user: User = Depends(auth.get_current_user),
+    ) -> RescrapeRunOut:
+        if not current_user.is_admin:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Admin privileges required",
+            )
+        run = await rescrapes.resume_run(run_id)
+        if run is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Rescrape run not found",
+            )
+        return run
+
     @app.put(f"{api}/admin/users/{{user_id}}", response_model=UserOut)
     async def admin_update_user(
         user_id: int,
         payload: UserUpdate,
         current_user: User = Depends(auth.get_current_user),
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_db),
     ) -> UserOut:
         if not current_user.is_admin:
             raise HTTPException(
@@ -333,7 +788,7 @@ def create_app() -> FastAPI:
                 detail="Admin privileges required",
             )
 
-        user = db.query(User).filter(User.id == user_id).first()
+        user = await db.get(User, user_id)
         if user is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -341,7 +796,7 @@ def create_app() -> FastAPI:
             )
 
         if payload.username is not None and payload.username != user.username:
-            existing = db.query(User).filter(User.username == payload.username).first()
+            existing = await db.scalar(select(User).where(User.username == payload.username))
             if existing is not None:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
@@ -352,7 +807,9 @@ def create_app() -> FastAPI:
         if payload.is_active is not None:
             # Prevent deactivating the last active admin
             if user.is_admin and payload.is_active is False:
-                admin_count = db.query(User).filter(User.is_admin == True, User.is_active == True).count()
+                admin_count = await db.scalar(
+                    select(func.count(User.id)).where(User.is_admin == True, User.is_active == True)
+                )
                 if admin_count <= 1:
                     raise HTTPException(
                         status_code=status.HTTP_400_BAD_REQUEST,
@@ -367,7 +824,9 @@ def create_app() -> FastAPI:
                     detail="You cannot remove your own admin status",
                 )
             if user.is_admin and payload.is_admin is False:
-                admin_count = db.query(User).filter(User.is_admin == True, User.is_active == True).count()
+                admin_count = await db.scalar(
+                    select(func.count(User.id)).where(User.is_admin == True, User.is_active == True)
+                )
                 if admin_count <= 1:
                     raise HTTPException(
                         status_code=status.HTTP_400_BAD_REQUEST,
@@ -375,9 +834,8 @@ def create_app() -> FastAPI:
                     )
             user.is_admin = payload.is_admin
 
-        db.add(user)
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        auth.invalidate_user(user.id)
 
         return UserOut(
             id=user.id,
@@ -390,7 +848,7 @@ def create_app() -> FastAPI:
     async def admin_delete_user(
         user_id: int,
         current_user: User = Depends(auth.get_current_user),
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_db),
     ) -> dict[str, str]:
         if not current_user.is_admin:
             raise HTTPException(
@@ -398,7 +856,7 @@ def create_app() -> FastAPI:
                 detail="Admin privileges required",
             )
 
-        user = db.query(User).filter(User.id == user_id).first()
+        user = await db.get(User, user_id)
         if user is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -412,15 +870,18 @@ def create_app() -> FastAPI:
             )
 
         if user.is_admin:
-            admin_count = db.query(User).filter(User.is_admin == True, User.is_active == True).count()
+            admin_count = await db.scalar(
+                select(func.count(User.id)).where(User.is_admin == True, User.is_active == True)
+            )
             if admin_count <= 1:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Cannot delete the last admin user",
                 )
 
-        db.delete(user)
-        db.commit()
+        await db.delete(user)
+        await db.commit()
+        auth.invalidate_user(user_id)
         return {"detail": "User deleted"}
 
     frontend_dir = resolve_frontend_dir()
@@ -0,0 +1,276 @@
+"""
+Prometheus metrics.
+
+A small in-process implementation of counters, gauges and histograms,
+rendered in the Prometheus text exposition format on ``/metrics``. Values
+are per process; with several workers each one is scraped separately.
+
+All metrics the app records are defined at the bottom of this module.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+import functools
+import math
+import threading
+import time
+from typing import Callable, Iterator, Sequence, TypeVar
+
+T = TypeVar("T")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; LLM scrapes with web search take tens of seconds.
+LLM_LATENCY_BUCKETS = (0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 45, 60, 90, 120, 180)
+STORAGE_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+_lock = threading.Lock()
+_metrics: list[_Metric] = []
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        with _lock:
+            _metrics.append(self)
+
+    def _key(self, labels: dict[str, object]) -> tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+            *self._samples(),
+        ]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        # Without labels the single series exists from the start, at 0.
+        self._values: dict[tuple[str, ...], float] = {} if self.labelnames else {(): 0}
+
+    def inc(self, amount: float = 1, **labels: object) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with _lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(self._values.items())
+        ]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        # Without labels the single series exists from the start, at 0.
+        self._values: dict[tuple[str, ...], float] = {} if self.labelnames else {(): 0}
+
+    def inc(self, amount: float = 1, **labels: object) -> None:
+        key = self._key(labels)
+        with _lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: object) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: object) -> None:
+        key = self._key(labels)
+        with _lock:
+            self._values[key] = value
+
+    @contextmanager
+    def track(self, **labels: object) -> Iterator[None]:
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+    def _samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(self._values.items())
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = STORAGE_LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: non-cumulative bucket counts (last one is +Inf), sum.
+        self._values: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: object) -> None:
+        key = self._key(labels)
+        index = len(self.buckets)
+        for position, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = position
+                break
+        with _lock:
+            counts, total = self._values.setdefault(
+                key, ([0] * (len(self.buckets) + 1), [0.0])
+            )
+            counts[index] += 1
+            total[0] += value
+
+    @contextmanager
+    def time(self, **labels: object) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _samples(self) -> list[str]:
+        lines: list[str] = []
+        names = (*self.labelnames, "le")
+        for key, (counts, total) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                labels = _format_labels(names, (*key, _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total[0])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+def timed(histogram: Histogram, **labels: object) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """
+    Decorator observing how long each call of a (synchronous) function takes.
+    """
+
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs) -> T:
+            with histogram.time(**labels):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def render() -> str:
+    with _lock:
+        lines = [line for metric in _metrics for line in metric.render()]
+    return "\n".join(lines) + "\n"
+
+
+# LLM calls. One observation per HTTP attempt, so retries are counted too.
+LLM_REQUEST_DURATION = Histogram(
+    "recipe_llm_request_duration_seconds",
+    "Duration of LLM API calls.",
+    ("operation", "outcome"),
+    buckets=LLM_LATENCY_BUCKETS,
+)
+LLM_REQUESTS_IN_FLIGHT = Gauge(
+    "recipe_llm_requests_in_flight",
+    "LLM API calls currently running.",
+    ("operation",),
+)
+LLM_ERRORS = Counter(
+    "recipe_llm_errors_total",
+    "Failed LLM API calls by HTTP status (or transport/error).",
+    ("operation", "status"),
+)
+LLM_TOKENS = Counter(
+    "recipe_llm_tokens_total",
+    "Tokens reported by the LLM API.",
+    ("operation", "type"),
+)
+LLM_COST = Counter(
+    "recipe_llm_cost_dollars_total",
+    "Estimated LLM spend from token usage and the configured prices.",
+    ("operation",),
+)
+LLM_RETRIES = Counter(
+    "recipe_llm_retries_total",
+    "LLM calls retried after a transient failure.",
+)
+LLM_QUEUE_WAIT = Histogram(
+    "recipe_llm_queue_wait_seconds",
+    "Time LLM calls waited for the rate-limit budgets.",
+    ("priority",),
+    buckets=LLM_LATENCY_BUCKETS,
+)
+
+# Recipe storage.
+STORAGE_OPERATION_DURATION = Histogram(
+    "recipe_storage_operation_duration_seconds",
+    "Duration of recipe storage operations.",
+    ("operation",),
+)
+STORAGE_FILES_SCANNED = Counter(
+    "recipe_storage_files_scanned_total",
+    "Recipe files checked against the index while reconciling it.",
+)
+STORAGE_FILES_READ = Counter(
+    "recipe_storage_files_read_total",
+    "Recipe files re-read while reconciling the index because they changed.",
+)
+STORAGE_RENDER_CACHE_LOOKUPS = Counter(
+    "recipe_storage_render_cache_lookups_total",
+    "Rendered recipe HTML lookups by whether the render cache answered them.",
+    ("result",),
+)
+
+# Authentication.
+AUTH_USER_CACHE_LOOKUPS = Counter(
+    "recipe_auth_user_cache_lookups_total",
+    "Authenticated user lookups by whether the user cache answered them.",
+    ("result",),
+)
+AUTH_LOGINS_THROTTLED = Counter(
+    "recipe_auth_logins_throttled_total",
+    "Sign-in attempts delayed or rejected by login throttling, by the limit they hit.",
+    ("limit",),
+)
@@ -1,6 +1,7 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import Dict, List, Literal, Optional
 
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, Field, HttpUrl
 
 
 class RecipeMetadata(BaseModel):
@@ -15,15 +16,126 @@ class RecipeMetadata(BaseModel):
   total_time: Optional[str] = None
 
 
+class RecipePage(BaseModel):
+  items: List[RecipeMetadata]
+  next_cursor: Optional[str] = None
+
+
+class RecipeFacets(BaseModel):
+  total: int
+  # Distinct (lowercased) filter values per field
+  values: Dict[str, List[str]]
+  # Recipes per requested total-time range, keyed by the range as requested
+  total_minutes: Dict[str, int]
+
+
+class RecipeSearchHit(BaseModel):
+  metadata: RecipeMetadata
+  snippet: str
+  score: float
+
+
 class RecipeCreateRequest(BaseModel):
   url: HttpUrl
+  # Scrape again even if a recipe from the same URL is already saved.
+  refresh: bool = False
+
+
+class BulkImportRequest(BaseModel):
+  urls: List[HttpUrl] = Field(min_length=1, max_length=1000)
+
+
+class BulkImportItem(BaseModel):
+  url: str
+  status: Literal["queued", "running", "succeeded", "failed"]
+  slug: Optional[str] = None
+  error: Optional[str] = None
+
+
+class BulkImportStatus(BaseModel):
+  id: str
+  total: int
+  completed: int
+  succeeded: int
+  failed: int
+  items: List[BulkImportItem]
+
+
+class JobOut(BaseModel):
+  id: str
+  kind: Literal["create", "rescrape"]
+  status: Literal["queued", "running", "succeeded", "failed"]
+  url: Optional[str] = None
+  slug: Optional[str] = None
+  error: Optional[str] = None
+  created_at: datetime
+  started_at: Optional[datetime] = None
+  finished_at: Optional[datetime] = None
+
 
 
+class RescrapeRunRequest(BaseModel):
+  """
+  Which recipes to rescrape; leaving everything empty selects every recipe
+  with a source URL.
+  """
+
+  meal: List[str] = Field(default_factory=list)
+  category: List[str] = Field(default_factory=list)
+  ethnicity: List[str] = Field(default_factory=list)
+  diet_friendly: List[str] = Field(default_factory=list)
+  tags: List[str] = Field(default_factory=list)
+  min_total_minutes: Optional[int] = Field(default=None, ge=0)
+  max_total_minutes: Optional[int] = Field(default=None, ge=0)
+  slugs: Optional[List[str]] = None
+
+
+class RescrapeFailure(BaseModel):
+  slug: str
+  error: Optional[str] = None
+
+
+class RescrapeRunOut(BaseModel):
+  id: str
+  status: Literal["running", "cancelled", "finished"]
+  total: int
+  completed: int
+  updated: int
+  unchanged: int
+  failed: int
+  created_at: datetime
+  finished_at: Optional[datetime] = None
+  failures: List[RescrapeFailure] = Field(default_factory=list)
+
 class RecipeResponse(BaseModel):
   metadata: RecipeMetadata
   markdown: str
 
 
+class RecipeHtmlResponse(BaseModel):
+  metadata: RecipeMetadata
+  # Sanitized HTML, rendered like the SPA renders the Markdown.
+  html: str
+
+
+class CoalescingStats(BaseModel):
+  executions: int
+  coalesced: int
+  in_flight: int
+
+
+class ScrapeStats(BaseModel):
+  create: CoalescingStats
+  rescrape: CoalescingStats
+
+
+class RecipeCacheStats(BaseModel):
+  hits: int
+  misses: int
+  size: int
+  max_size: int
+
+
 class HealthStatus(BaseModel):
   status: str
   filesystem_writable: bool
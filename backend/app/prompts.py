@@ -6,6 +6,38 @@ into structured Markdown with YAML front matter.
 from textwrap import dedent
 
 
+# Fixed options for the classification fields of the front matter.
+MEAL_OPTIONS = ("breakfast", "brunch", "lunch", "dinner", "snack", "dessert", "drink")
+CATEGORY_OPTIONS = (
+    "main",
+    "side",
+    "soup",
+    "salad",
+    "sauce",
+    "dessert",
+    "condiment",
+    "snack",
+    "grill",
+)
+DIET_FRIENDLY_OPTIONS = (
+    "keto",
+    "carnivore",
+    "animal-based",
+    "paleo",
+    "whole30",
+    "low-carb",
+    "gluten-free",
+    "dairy-free",
+    "vegetarian",
+    "vegan",
+    "pescatarian",
+)
+
+
+def _option_lines(options: tuple[str, ...]) -> str:
+    return "\n".join(f"  - {option}" for option in options)
+
+
 RECIPE_SYSTEM_PROMPT = dedent(
     """
     You are a specialized assistant that extracts structured recipe data
@@ -37,37 +69,13 @@ RECIPE_SYSTEM_PROMPT = dedent(
     Leave empty when truly unknown.
 
     Allowed meal options:
-      - breakfast
-      - brunch
-      - lunch
-      - dinner
-      - snack
-      - dessert
-      - drink
+    {meal_options}
 
     Allowed category options (choose ONE):
-      - main
-      - side
-      - soup
-      - salad
-      - sauce
-      - dessert
-      - condiment
-      - snack
-      - grill
+    {category_options}
 
     Allowed diet_friendly options:
-      - keto
-      - carnivore
-      - animal-based
-      - paleo
-      - whole30
-      - low-carb
-      - gluten-free
-      - dairy-free
-      - vegetarian
-      - vegan
-      - pescatarian
+    {diet_friendly_options}
 
     Markdown body sections (in this order):
       - # Title
@@ -83,7 +91,41 @@ RECIPE_SYSTEM_PROMPT = dedent(
     parentheses (e.g., "$2.49"), omit the price entirely.
     Do not hallucinate core ingredients that do not appear in the source.
     """
-).strip()
+).strip().format(
+    meal_options=_option_lines(MEAL_OPTIONS),
+    category_options=_option_lines(CATEGORY_OPTIONS),
+    diet_friendly_options=_option_lines(DIET_FRIENDLY_OPTIONS),
+)
+
+
+RECIPE_CLASSIFY_SYSTEM_PROMPT = dedent(
+    """
+    You classify recipes for a personal recipe collection.
+
+    Reply with a single JSON object with these keys:
+      - meal: list, choose from the allowed meal options
+      - category: one value from the allowed category options, or null
+      - ethnicity: list of cuisines, lowercase (e.g. "italian", "thai")
+      - diet_friendly: list, choose from the allowed diet_friendly options
+      - tags: list of up to 10 short lowercase tags
+
+    Select all that apply for list fields and leave a list empty when
+    unsure. Only list a diet when every ingredient fits it.
+
+    Allowed meal options:
+    {meal_options}
+
+    Allowed category options:
+    {category_options}
+
+    Allowed diet_friendly options:
+    {diet_friendly_options}
+    """
+).strip().format(
+    meal_options=_option_lines(MEAL_OPTIONS),
+    category_options=_option_lines(CATEGORY_OPTIONS),
+    diet_friendly_options=_option_lines(DIET_FRIENDLY_OPTIONS),
+)
 
 
 def build_recipe_user_prompt(url: str) -> str:
@@ -0,0 +1,584 @@
+"""
+Persistent metadata index for the recipe Markdown files.
+
+The index lives in a sidecar SQLite database next to the auth database and is
+keyed by slug. Each row stores the file signature (mtime/size/content hash)
+alongside the parsed front matter so list views never have to open the
+Markdown files. The index is derived data: it can be deleted at any time and
+is rebuilt by reconciling against the recipes directory.
+"""
+from __future__ import annotations
+
+import base64
+from dataclasses import dataclass, field
+import html
+import json
+import re
+import time
+from typing import Iterable, List, Optional
+
+from sqlalchemy import (
+    JSON,
+    Column,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    and_,
+    create_engine,
+    delete,
+    func,
+    or_,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import Session, sessionmaker
+
+from .db import DEFAULT_AUTH_DB_PATH, configure_sqlite
+from .models import RecipeMetadata
+from .urls import canonicalize_url
+
+IndexBase = declarative_base()
+RECIPE_INDEX_DB_PATH = DEFAULT_AUTH_DB_PATH.with_name("recipe_index.db")
+
+# Bump whenever the index tables change; a mismatch drops and rebuilds them.
+INDEX_SCHEMA_VERSION = 5
+
+# Metadata fields that can be filtered on; list values are stored one per row.
+FILTER_FIELDS = ("meal", "category", "ethnicity", "diet_friendly", "tags")
+SORT_ORDERS = ("title", "modified")
+
+
+def get_index_database_url() -> str:
+    RECIPE_INDEX_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    return f"sqlite:///{RECIPE_INDEX_DB_PATH}"
+
+
+engine = create_engine(
+    get_index_database_url(),
+    connect_args={"check_same_thread": False},
+)
+configure_sqlite(engine)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+class RecipeIndexEntry(IndexBase):
+    __tablename__ = "recipe_index"
+
+    slug = Column(String, primary_key=True)
+    mtime_ns = Column(Integer, nullable=False)
+    size = Column(Integer, nullable=False)
+    content_hash = Column(String, nullable=False)
+
+    title = Column(String, nullable=False)
+    url = Column(String, nullable=True)
+    # Source URL as keyed by canonicalize_url(), for duplicate detection
+    canonical_url = Column(String, nullable=True, index=True)
+    meal = Column(JSON, nullable=True)
+    category = Column(String, nullable=True)
+    ethnicity = Column(JSON, nullable=True)
+    diet_friendly = Column(JSON, nullable=True)
+    tags = Column(JSON, nullable=True)
+    total_time = Column(String, nullable=True)
+
+    # Precomputed sort and filter keys
+    title_sort = Column(String, nullable=False)
+    total_minutes = Column(Integer, nullable=True)
+    # rowid of this recipe's document in the recipe_fts full-text table
+    fts_rowid = Column(Integer, nullable=True, unique=True)
+
+    __table_args__ = (
+        Index("ix_recipe_index_title_sort", "title_sort", "slug"),
+        Index("ix_recipe_index_modified", "mtime_ns", "slug"),
+        Index("ix_recipe_index_total_minutes", "total_minutes"),
+    )
+
+
+class RecipeIndexTerm(IndexBase):
+    """
+    One row per (field, lowercased value) of a recipe's filterable metadata.
+    """
+
+    __tablename__ = "recipe_index_terms"
+
+    field = Column(String, primary_key=True)
+    value = Column(String, primary_key=True)
+    slug = Column(
+        String,
+        ForeignKey("recipe_index.slug", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    )
+
+
+class RecipeIndexState(IndexBase):
+    """
+    Single-row table holding the collection version.
+
+    The version changes with every write to the index, across all workers,
+    and is used to validate cached copies of the recipe list.
+    """
+
+    __tablename__ = "recipe_index_state"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False)
+
+
+@dataclass(frozen=True)
+class FileSignature:
+    mtime_ns: int
+    size: int
+    content_hash: str
+
+
+@dataclass
+class RecipeFilters:
+    """
+    Listing filters. Values within a field match any; fields combine with AND.
+    """
+
+    terms: dict[str, list[str]] = field(default_factory=dict)
+    min_total_minutes: Optional[int] = None
+    max_total_minutes: Optional[int] = None
+    # Total-time ranges (min, max; either may be None), matching any of them
+    total_minutes_ranges: list[tuple[Optional[int], Optional[int]]] = field(default_factory=list)
+
+
+@dataclass
+class IndexRecord:
+    """
+    Everything the index stores for one recipe file.
+    """
+
+    metadata: RecipeMetadata
+    signature: FileSignature
+    total_minutes: Optional[int] = None
+    ingredients: str = ""
+    instructions: str = ""
+
+
+@dataclass
+class SearchHit:
+    metadata: RecipeMetadata
+    snippet: str
+    score: float
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+# Full-text index over the searchable parts of each recipe. It is an FTS5
+# virtual table, so it is managed with raw DDL rather than the ORM metadata.
+_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS recipe_fts USING fts5("
+    "title, tags, ingredients, instructions, "
+    "tokenize = 'unicode61 remove_diacritics 2')"
+)
+# Column weights for bm25(): title, tags, ingredients, instructions.
+_FTS_WEIGHTS = (10.0, 5.0, 2.0, 1.0)
+# Snippet highlight markers; control characters never occur in recipe text,
+# so the snippet can be HTML-escaped before they are turned into <mark> tags.
+_MARK_START = "\x02"
+_MARK_END = "\x03"
+
+
+def init_recipe_index() -> None:
+    """
+    Create the index tables, rebuilding them when the schema version changed.
+    """
+    with engine.begin() as conn:
+        version = conn.execute(text("PRAGMA user_version")).scalar() or 0
+        if version != INDEX_SCHEMA_VERSION:
+            conn.execute(text("DROP TABLE IF EXISTS recipe_fts"))
+            IndexBase.metadata.drop_all(bind=conn)
+            conn.execute(text(f"PRAGMA user_version = {INDEX_SCHEMA_VERSION}"))
+        IndexBase.metadata.create_all(bind=conn)
+        conn.execute(text(_FTS_DDL))
+        # Seed from the clock so a rebuilt index never reuses an old version.
+        conn.execute(
+            text("INSERT OR IGNORE INTO recipe_index_state (id, version) VALUES (1, :version)"),
+            {"version": time.time_ns()},
+        )
+
+
+def _bump_version(db: Session) -> None:
+    db.execute(
+        update(RecipeIndexState)
+        .where(RecipeIndexState.id == 1)
+        .values(version=RecipeIndexState.version + 1)
+    )
+
+
+def get_version() -> int:
+    with SessionLocal() as db:
+        return db.execute(
+            select(RecipeIndexState.version).where(RecipeIndexState.id == 1)
+        ).scalar_one()
+
+
+def get_signatures(slugs: Iterable[str] | None = None) -> dict[str, FileSignature]:
+    """
+    Return stored file signatures, optionally restricted to the given slugs.
+    """
+    query = select(
+        RecipeIndexEntry.slug,
+        RecipeIndexEntry.mtime_ns,
+        RecipeIndexEntry.size,
+        RecipeIndexEntry.content_hash,
+    )
+    if slugs is not None:
+        query = query.where(RecipeIndexEntry.slug.in_(list(slugs)))
+    with SessionLocal() as db:
+        rows = db.execute(query).all()
+    return {
+        slug: FileSignature(mtime_ns=mtime_ns, size=size, content_hash=content_hash)
+        for slug, mtime_ns, size, content_hash in rows
+    }
+
+
+def find_slug_by_url(canonical_url: str) -> str | None:
+    """
+    Slug of the recipe saved from the given canonical URL, preferring the
+    most recently modified one when several share it.
+    """
+    with SessionLocal() as db:
+        return db.execute(
+            select(RecipeIndexEntry.slug)
+            .where(RecipeIndexEntry.canonical_url == canonical_url)
+            .order_by(RecipeIndexEntry.mtime_ns.desc(), RecipeIndexEntry.slug)
+            .limit(1)
+        ).scalar_one_or_none()
+
+
+def _metadata_terms(metadata: RecipeMetadata) -> set[tuple[str, str]]:
+    terms: set[tuple[str, str]] = set()
+    for name in FILTER_FIELDS:
+        value = getattr(metadata, name)
+        values = value if isinstance(value, list) else [value]
+        for item in values:
+            normalized = str(item).strip().lower() if item is not None else ""
+            if normalized:
+                terms.add((name, normalized))
+    return terms
+
+
+def upsert_entries(records: Iterable[IndexRecord]) -> None:
+    """
+    Insert or replace index rows, filter terms and full-text documents in a
+    single transaction.
+    """
+    records = list(records)
+    if not records:
+        return
+    with SessionLocal() as db:
+        for record in records:
+            metadata = record.metadata
+            signature = record.signature
+            url = str(metadata.url) if metadata.url else None
+            values = {
+                "mtime_ns": signature.mtime_ns,
+                "size": signature.size,
+                "content_hash": signature.content_hash,
+                "title": metadata.title,
+                "url": url,
+                "canonical_url": canonicalize_url(url) if url else None,
+                "meal": metadata.meal,
+                "category": metadata.category,
+                "ethnicity": metadata.ethnicity,
+                "diet_friendly": metadata.diet_friendly,
+                "tags": metadata.tags,
+                "total_time": metadata.total_time,
+                "title_sort": metadata.title.casefold(),
+                "total_minutes": record.total_minutes,
+            }
+            # Upsert first: the write takes the database lock, so concurrent
+            # upserts of the same new slug queue up instead of both inserting,
+            # and the document id read next cannot change under us.
+            db.execute(
+                sqlite_insert(RecipeIndexEntry)
+                .values(slug=metadata.slug, **values)
+                .on_conflict_do_update(index_elements=[RecipeIndexEntry.slug], set_=values)
+            )
+            old_rowid = db.execute(
+                select(RecipeIndexEntry.fts_rowid).where(RecipeIndexEntry.slug == metadata.slug)
+            ).scalar()
+            if old_rowid is not None:
+                db.execute(
+                    text("DELETE FROM recipe_fts WHERE rowid = :rowid"),
+                    {"rowid": old_rowid},
+                )
+
+            fts_rowid = db.execute(
+                text(
+                    "INSERT INTO recipe_fts (title, tags, ingredients, instructions) "
+                    "VALUES (:title, :tags, :ingredients, :instructions)"
+                ),
+                {
+                    "title": metadata.title,
+                    "tags": " ".join(metadata.tags or []),
+                    "ingredients": record.ingredients,
+                    "instructions": record.instructions,
+                },
+            ).lastrowid
+            db.execute(
+                update(RecipeIndexEntry)
+                .where(RecipeIndexEntry.slug == metadata.slug)
+                .values(fts_rowid=fts_rowid)
+            )
+
+            db.execute(delete(RecipeIndexTerm).where(RecipeIndexTerm.slug == metadata.slug))
+            db.add_all(
+                RecipeIndexTerm(field=name, value=value, slug=metadata.slug)
+                for name, value in _metadata_terms(metadata)
+            )
+        _bump_version(db)
+        db.commit()
+
+
+def touch_entries(entries: Iterable[tuple[str, FileSignature]]) -> None:
+    """
+    Refresh the stored signature for files whose content did not change.
+    """
+    entries = list(entries)
+    if not entries:
+        return
+    with SessionLocal() as db:
+        for slug, signature in entries:
+            entry = db.get(RecipeIndexEntry, slug)
+            if entry is None:
+                continue
+            entry.mtime_ns = signature.mtime_ns
+            entry.size = signature.size
+        # mtime feeds the "modified" sort order, so this is a visible change.
+        _bump_version(db)
+        db.commit()
+
+
+def delete_entries(slugs: Iterable[str]) -> None:
+    slugs = list(slugs)
+    if not slugs:
+        return
+    with SessionLocal() as db:
+        fts_rowids = db.execute(
+            select(RecipeIndexEntry.fts_rowid).where(
+                RecipeIndexEntry.slug.in_(slugs), RecipeIndexEntry.fts_rowid.is_not(None)
+            )
+        ).scalars().all()
+        for rowid in fts_rowids:
+            db.execute(text("DELETE FROM recipe_fts WHERE rowid = :rowid"), {"rowid": rowid})
+        db.execute(delete(RecipeIndexTerm).where(RecipeIndexTerm.slug.in_(slugs)))
+        db.execute(delete(RecipeIndexEntry).where(RecipeIndexEntry.slug.in_(slugs)))
+        _bump_version(db)
+        db.commit()
+
+
+def _entry_to_metadata(entry: RecipeIndexEntry) -> RecipeMetadata:
+    return RecipeMetadata(
+        title=entry.title,
+        slug=entry.slug,
+        url=entry.url,
+        meal=entry.meal,
+        category=entry.category,
+        ethnicity=entry.ethnicity,
+        diet_friendly=entry.diet_friendly,
+        tags=entry.tags,
+        total_time=entry.total_time,
+    )
+
+
+def _encode_cursor(sort: str, entry: RecipeIndexEntry) -> str:
+    key = entry.title_sort if sort == "title" else entry.mtime_ns
+    raw = json.dumps([sort, key, entry.slug], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(sort: str, cursor: str) -> tuple[object, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, key, slug = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursor("Malformed cursor") from exc
+    if cursor_sort != sort:
+        raise InvalidCursor("Cursor was issued for a different sort order")
+    if not isinstance(slug, str) or not isinstance(key, (str, int)):
+        raise InvalidCursor("Malformed cursor")
+    return key, slug
+
+
+def _apply_filters(query, filters: RecipeFilters):
+    for name, values in filters.terms.items():
+        values = [value.strip().lower() for value in values if value.strip()]
+        if not values:
+            continue
+        query = query.where(
+            RecipeIndexEntry.slug.in_(
+                select(RecipeIndexTerm.slug).where(
+                    RecipeIndexTerm.field == name, RecipeIndexTerm.value.in_(values)
+                )
+            )
+        )
+    if filters.min_total_minutes is not None:
+        query = query.where(RecipeIndexEntry.total_minutes >= filters.min_total_minutes)
+    if filters.max_total_minutes is not None:
+        query = query.where(RecipeIndexEntry.total_minutes <= filters.max_total_minutes)
+    if filters.total_minutes_ranges:
+        query = query.where(
+            or_(*(_total_minutes_between(low, high) for low, high in filters.total_minutes_ranges))
+        )
+    return query
+
+
+def _total_minutes_between(low: Optional[int], high: Optional[int]):
+    conditions = [RecipeIndexEntry.total_minutes.is_not(None)]
+    if low is not None:
+        conditions.append(RecipeIndexEntry.total_minutes >= low)
+    if high is not None:
+        conditions.append(RecipeIndexEntry.total_minutes <= high)
+    return and_(*conditions)
+
+
+def query_entries(
+    filters: RecipeFilters,
+    sort: str = "title",
+    cursor: Optional[str] = None,
+    limit: int = 50,
+) -> tuple[List[RecipeMetadata], Optional[str]]:
+    """
+    Return one page of recipes plus the cursor for the next page.
+
+    Pages are keyset-paginated over the precomputed sort indexes, so the cost
+    of a page does not depend on how deep it is or how large the collection is.
+    """
+    if sort not in SORT_ORDERS:
+        raise ValueError(f"Unknown sort order: {sort}")
+
+    query = _apply_filters(select(RecipeIndexEntry), filters)
+    if sort == "title":
+        key_column = RecipeIndexEntry.title_sort
+        query = query.order_by(key_column.asc(), RecipeIndexEntry.slug.asc())
+    else:
+        key_column = RecipeIndexEntry.mtime_ns
+        query = query.order_by(key_column.desc(), RecipeIndexEntry.slug.asc())
+
+    if cursor:
+        key, slug = _decode_cursor(sort, cursor)
+        after_key = key_column > key if sort == "title" else key_column < key
+        query = query.where(
+            or_(after_key, and_(key_column == key, RecipeIndexEntry.slug > slug))
+        )
+
+    with SessionLocal() as db:
+        entries = db.execute(query.limit(limit + 1)).scalars().all()
+        next_cursor = None
+        if len(entries) > limit:
+            entries = entries[:limit]
+            next_cursor = _encode_cursor(sort, entries[-1])
+        return [_entry_to_metadata(entry) for entry in entries], next_cursor
+
+
+def facet_values(
+    ranges: Iterable[tuple[Optional[int], Optional[int]]] = (),
+) -> tuple[int, dict[str, List[str]], List[int]]:
+    """
+    The recipe count, the distinct filter values of each field (sorted) and
+    the number of recipes in each of the given total-time ranges, for
+    building filter controls without listing the whole collection.
+    """
+    with SessionLocal() as db:
+        total = db.execute(select(func.count()).select_from(RecipeIndexEntry)).scalar()
+        values: dict[str, List[str]] = {name: [] for name in FILTER_FIELDS}
+        for name, value in db.execute(
+            select(RecipeIndexTerm.field, RecipeIndexTerm.value)
+            .distinct()
+            .order_by(RecipeIndexTerm.field, RecipeIndexTerm.value)
+        ):
+            values.setdefault(name, []).append(value)
+        counts = [
+            db.execute(
+                select(func.count())
+                .select_from(RecipeIndexEntry)
+                .where(_total_minutes_between(low, high))
+            ).scalar()
+            for low, high in ranges
+        ]
+    return total, values, counts
+
+
+def slugs_with_source_url(filters: RecipeFilters, slugs: Iterable[str] | None = None) -> List[str]:
+    """
+    Slugs of the recipes matching ``filters`` (and, if given, ``slugs``)
+    that have a source URL, in slug order.
+    """
+    query = _apply_filters(
+        select(RecipeIndexEntry.slug).where(RecipeIndexEntry.canonical_url.is_not(None)),
+        filters,
+    )
+    if slugs is not None:
+        query = query.where(RecipeIndexEntry.slug.in_(list(slugs)))
+    with SessionLocal() as db:
+        return list(db.execute(query.order_by(RecipeIndexEntry.slug)).scalars())
+
+
+def _fts_query(query: str) -> str:
+    """
+    Turn free text into an FTS5 query: every word must match, as a prefix.
+
+    Words are quoted so FTS5 operators in user input are treated literally.
+    """
+    words = re.findall(r"\w+", query)
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def search_entries(query: str, limit: int = 20) -> List[SearchHit]:
+    """
+    Rank recipes matching ``query`` with bm25 and return highlighted snippets.
+
+    Snippets are HTML-escaped with matches wrapped in <mark> tags.
+    """
+    match = _fts_query(query)
+    if not match:
+        return []
+
+    weights = ", ".join(str(weight) for weight in _FTS_WEIGHTS)
+    statement = text(
+        "SELECT recipe_index.slug AS slug, "
+        f"bm25(recipe_fts, {weights}) AS rank, "
+        "snippet(recipe_fts, -1, :mark_start, :mark_end, '…', 12) AS snippet "
+        "FROM recipe_fts JOIN recipe_index ON recipe_index.fts_rowid = recipe_fts.rowid "
+        "WHERE recipe_fts MATCH :match ORDER BY rank LIMIT :limit"
+    )
+    with SessionLocal() as db:
+        rows = db.execute(
+            statement,
+            {
+                "match": match,
+                "limit": limit,
+                "mark_start": _MARK_START,
+                "mark_end": _MARK_END,
+            },
+        ).all()
+        entries = {
+            entry.slug: entry
+            for entry in db.execute(
+                select(RecipeIndexEntry).where(
+                    RecipeIndexEntry.slug.in_([row.slug for row in rows])
+                )
+            ).scalars()
+        }
+        # Recipes deleted between the two queries are left out.
+        return [
+            SearchHit(
+                metadata=_entry_to_metadata(entries[row.slug]),
+                snippet=html.escape(row.snippet)
+                .replace(_MARK_START, "<mark>")
+                .replace(_MARK_END, "</mark>"),
+                score=-row.rank,
+            )
+            for row in rows
+            if row.slug in entries
+        ]
@@ -0,0 +1,184 @@
+"""
+Server-side HTML rendering of recipe Markdown.
+
+Produces the same markup as ``renderMarkdown`` in the SPA
+(frontend/src/main.js): a summary section built from the front matter,
+then the body, with the "Instructions" section rendered as an ordered list
+and a leading ``# Title`` heading dropped when it repeats the front-matter
+title. All recipe text is HTML-escaped and links are only emitted for
+http(s) URLs, so the result is safe to insert as-is.
+"""
+from __future__ import annotations
+
+import html
+import re
+
+# Bump whenever the markup changes, so clients holding pages rendered by an
+# older version (validated by ETag) fetch them again.
+RENDER_VERSION = 2
+
+_HEADING_RE = re.compile(r"^(#{1,6}) (.*)$")
+_NUMBERED_ITEM_RE = re.compile(r"^\d+\.\s+")
+_BULLET_ITEM_RE = re.compile(r"^[-*] ")
+_BOLD_RE = re.compile(r"\*\*(.+?)\*\*|__(.+?)__")
+_ISO_DURATION_RE = re.compile(r"^P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$", re.I)
+_NUMBER_RE = re.compile(r"(\d+)")
+
+_PRIMARY_STYLE = "font-size: 10px; letter-spacing: 0.12em; text-transform: uppercase; margin-bottom: 4px; opacity: 0.85;"
+_TAGS_STYLE = "font-size: 10px; text-transform: uppercase; letter-spacing: 0.08em; margin-bottom: 4px; opacity: 0.7;"
+_SECONDARY_STYLE = "font-size: 10px; text-transform: uppercase; margin-bottom: 6px; opacity: 0.7;"
+_URL_STYLE = "font-size: 10px; margin-bottom: 8px; opacity: 0.7;"
+_SECTION_STYLE = "border-bottom: 1px solid #333; padding-bottom: 8px; margin-bottom: 10px;"
+
+
+def _escape(value: object) -> str:
+    return html.escape(str(value), quote=True)
+
+
+def _render_inline(text: str) -> str:
+    return _BOLD_RE.sub(
+        lambda m: f"<strong>{m.group(1) or m.group(2)}</strong>", _escape(text)
+    )
+
+
+def _plural(count: int, unit: str) -> str:
+    return f"{count} {unit}{'' if count == 1 else 's'}"
+
+
+def format_duration(value: object) -> str:
+    """
+    Human-readable ISO 8601 duration ("PT1H30M" -> "1 hour 30 minutes");
+    other values are returned as they are.
+    """
+    text = str(value).strip()
+    match = _ISO_DURATION_RE.match(text)
+    if not text or not match:
+        return text
+    days, hours, minutes, seconds = (int(part) if part else 0 for part in match.groups())
+    total_minutes = days * 24 * 60 + hours * 60 + minutes
+    if total_minutes >= 60:
+        return f"{_plural(total_minutes // 60, 'hour')} {_plural(total_minutes % 60, 'minute')}"
+    if total_minutes > 0:
+        return _plural(total_minutes, "minute")
+    if seconds:
+        return _plural(seconds, "second")
+    return text
+
+
+def format_servings(value: object) -> str:
+    text = str(value).strip()
+    match = _NUMBER_RE.search(text)
+    return f"{int(match.group(1))} servings" if match else text
+
+
+def _as_list(value: object) -> list[str]:
+    if not value:
+        return []
+    if isinstance(value, list):
+        return [str(item) for item in value if item]
+    return [str(value)]
+
+
+def render_frontmatter(frontmatter: dict[str, object]) -> str:
+    """
+    The summary section shown above a recipe: classification, tags, times,
+    yield and a link to the source.
+    """
+    primary = [
+        _escape(str(item).upper().replace("_", " "))
+        for key in ("meal", "category", "ethnicity")
+        for item in _as_list(frontmatter.get(key))
+    ]
+    diet_friendly = frontmatter.get("diet_friendly")
+    if isinstance(diet_friendly, list):
+        primary += [_escape(str(item).upper().replace("_", " ")) for item in diet_friendly]
+
+    tags = frontmatter.get("tags")
+    tags_line = _escape(", ".join(tags)) if isinstance(tags, list) and tags else ""
+
+    times = []
+    for key, label in (("prep_time", "Prep"), ("cook_time", "Cook"), ("total_time", "Total")):
+        readable = format_duration(frontmatter[key]) if frontmatter.get(key) else ""
+        if readable:
+            times.append(f"{label} {_escape(readable)}")
+    secondary = []
+    if times:
+        secondary.append(" • ".join(times))
+    if frontmatter.get("yield"):
+        secondary.append(_escape(format_servings(frontmatter["yield"])))
+
+    url = frontmatter.get("url")
+    url = url.strip() if isinstance(url, str) else ""
+
+    parts = []
+    if primary:
+        parts.append(f'<div style="{_PRIMARY_STYLE}">{" • ".join(primary)}</div>')
+    if tags_line:
+        parts.append(f'<div style="{_TAGS_STYLE}">{tags_line}</div>')
+    if secondary:
+        parts.append(f'<div style="{_SECONDARY_STYLE}">{" · ".join(secondary)}</div>')
+    if url.lower().startswith(("http://", "https://")):
+        parts.append(
+            f'<div style="{_URL_STYLE}"><a href="{_escape(url)}" target="_blank" '
+            'rel="noopener noreferrer" style="color: inherit; text-decoration: underline;">'
+            "Source</a></div>"
+        )
+    if not parts:
+        return ""
+    return f'<section style="{_SECTION_STYLE}">{"".join(parts)}</section>'
+
+
+def render_recipe_html(frontmatter: dict[str, object], body_lines: list[str]) -> str:
+    """
+    Render a parsed recipe (front matter and the Markdown lines after it).
+    """
+    out: list[str] = []
+    section: str | None = None
+    open_list: str | None = None
+    title = frontmatter.get("title")
+    normalized_title = str(title).strip().lower() if title else None
+    skipped_title = False
+
+    def close_list() -> None:
+        nonlocal open_list
+        if open_list:
+            out.append(f"</{open_list}>")
+            open_list = None
+
+    def open_list_if_needed(kind: str) -> None:
+        nonlocal open_list
+        if open_list != kind:
+            close_list()
+            out.append(f"<{kind}>")
+            open_list = kind
+
+    for line in body_lines:
+        stripped = line.strip()
+        if not stripped:
+            continue
+
+        heading = _HEADING_RE.match(stripped)
+        if heading:
+            level = len(heading.group(1))
+            text = heading.group(2).strip()
+            if level == 1 and not skipped_title and normalized_title and text.lower() == normalized_title:
+                skipped_title = True
+                continue
+            close_list()
+            out.append(f"<h{level}>{_render_inline(text)}</h{level}>")
+            section = text.lower()
+        elif section == "instructions" and _NUMBERED_ITEM_RE.match(stripped):
+            open_list_if_needed("ol")
+            out.append(f"<li>{_render_inline(_NUMBERED_ITEM_RE.sub('', stripped, count=1))}</li>")
+        elif _BULLET_ITEM_RE.match(stripped):
+            open_list_if_needed("ol" if section == "instructions" else "ul")
+            out.append(f"<li>{_render_inline(stripped[2:])}</li>")
+        elif section == "instructions":
+            open_list_if_needed("ol")
+            out.append(f"<li>{_render_inline(stripped)}</li>")
+        else:
+            close_list()
+            out.append(f"<p>{_render_inline(stripped)}</p>")
+
+    close_list()
+    return render_frontmatter(frontmatter) + "".join(out)
@@ -0,0 +1,390 @@
+"""
+Collection-wide rescrapes.
+
+After a prompt or model change the whole library needs rescraping. A
+rescrape run records every matching recipe with a source URL as an item in
+the auth database and works through them ``rescrape_concurrency`` at a time,
+in the background lane of the LLM scheduler. Each item's outcome is written
+as soon as it is known, so the run is checkpointed recipe by recipe: runs
+are held under a lease like jobs, and after a crash or restart any process
+picks up a running run whose lease ran out and continues with the items
+still queued.
+
+Rescraped Markdown identical to the saved file is not written, so unchanged
+recipes keep their modification time and ETag.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from datetime import datetime, timedelta
+import json
+import logging
+import uuid
+
+from fastapi import HTTPException
+from sqlalchemy import and_, func, insert, or_, select, update
+
+from . import async_storage, recipe_index, scrapes
+from .config import get_settings
+from .db import RescrapeItem, RescrapeRun, SessionLocal
+from .models import RescrapeFailure, RescrapeRunOut, RescrapeRunRequest
+from .recipe_index import RecipeFilters
+
+logger = logging.getLogger(__name__)
+
+# Failed items listed in a run's status; the counts always cover all of them.
+MAX_REPORTED_FAILURES = 100
+
+_supervisor: asyncio.Task | None = None
+_wakeup: asyncio.Event | None = None
+# Stop signals of the runs this process is working on, by run id.
+_stops: dict[str, asyncio.Event] = {}
+
+
+def _run_out(db, run: RescrapeRun) -> RescrapeRunOut:
+    counts = dict(
+        db.execute(
+            select(RescrapeItem.status, func.count())
+            .where(RescrapeItem.run_id == run.id)
+            .group_by(RescrapeItem.status)
+        ).all()
+    )
+    failures = db.execute(
+        select(RescrapeItem.slug, RescrapeItem.error)
+        .where(RescrapeItem.run_id == run.id, RescrapeItem.status == "failed")
+        .order_by(RescrapeItem.slug)
+        .limit(MAX_REPORTED_FAILURES)
+    ).all()
+    updated = counts.get("updated", 0)
+    unchanged = counts.get("unchanged", 0)
+    failed = counts.get("failed", 0)
+    return RescrapeRunOut(
+        id=run.id,
+        status=run.status,
+        total=run.total,
+        completed=updated + unchanged + failed,
+        updated=updated,
+        unchanged=unchanged,
+        failed=failed,
+        created_at=run.created_at,
+        finished_at=run.finished_at,
+        failures=[RescrapeFailure(slug=slug, error=error) for slug, error in failures],
+    )
+
+
+def _create_run(
+    filters: RecipeFilters, slugs: list[str] | None, description: str, user_id: int | None
+) -> RescrapeRunOut:
+    selected = recipe_index.slugs_with_source_url(filters, slugs)
+    run = RescrapeRun(
+        id=uuid.uuid4().hex,
+        filters=description,
+        total=len(selected),
+        created_by=user_id,
+    )
+    if not selected:
+        run.status = "finished"
+        run.finished_at = datetime.utcnow()
+    with SessionLocal() as db:
+        db.add(run)
+        db.flush()
+        if selected:
+            db.execute(
+                insert(RescrapeItem),
+                [{"run_id": run.id, "slug": slug, "status": "queued"} for slug in selected],
+            )
+        db.commit()
+        db.refresh(run)
+        return _run_out(db, run)
+
+
+def _load_run(run_id: str) -> RescrapeRunOut | None:
+    with SessionLocal() as db:
+        run = db.get(RescrapeRun, run_id)
+        return _run_out(db, run) if run is not None else None
+
+
+def _list_runs(limit: int) -> list[RescrapeRunOut]:
+    with SessionLocal() as db:
+        runs = db.execute(
+            select(RescrapeRun).order_by(RescrapeRun.created_at.desc()).limit(limit)
+        ).scalars()
+        return [_run_out(db, run) for run in runs]
+
+
+def _set_run_status(run_id: str, status: str, **values) -> RescrapeRunOut | None:
+    with SessionLocal() as db:
+        run = db.get(RescrapeRun, run_id)
+        if run is None:
+            return None
+        run.status = status
+        run.owner = None
+        run.lease_expires_at = None
+        for name, value in values.items():
+            setattr(run, name, value)
+        db.commit()
+        return _run_out(db, run)
+
+
+def _claimable(now: datetime):
+    return and_(
+        RescrapeRun.status == "running",
+        or_(RescrapeRun.lease_expires_at.is_(None), RescrapeRun.lease_expires_at < now),
+    )
+
+
+def _claim_run() -> tuple[str, str] | None:
+    """
+    Take over the oldest running run nobody holds a lease on. Returns the
+    run id and the owner token identifying this claim.
+    """
+    lease = timedelta(seconds=get_settings().job_lease_seconds)
+    with SessionLocal() as db:
+        now = datetime.utcnow()
+        run_ids = db.execute(
+            select(RescrapeRun.id).where(_claimable(now)).order_by(RescrapeRun.created_at)
+        ).scalars().all()
+        for run_id in run_ids:
+            owner = uuid.uuid4().hex
+            rowcount = db.execute(
+                update(RescrapeRun)
+                .where(RescrapeRun.id == run_id, _claimable(now))
+                .values(owner=owner, lease_expires_at=now + lease)
+            ).rowcount
+            db.commit()
+            if rowcount:
+                return run_id, owner
+    return None
+
+
+def _owned(run_id: str, owner: str):
+    return and_(
+        RescrapeRun.id == run_id,
+        RescrapeRun.owner == owner,
+        RescrapeRun.status == "running",
+    )
+
+
+def _extend_lease(run_id: str, owner: str) -> bool:
+    """
+    Renew the lease; False once the run was cancelled or taken over.
+    """
+    lease = timedelta(seconds=get_settings().job_lease_seconds)
+    with SessionLocal() as db:
+        rowcount = db.execute(
+            update(RescrapeRun)
+            .where(_owned(run_id, owner))
+            .values(lease_expires_at=datetime.utcnow() + lease)
+        ).rowcount
+        db.commit()
+        return bool(rowcount)
+
+
+def _release_run(run_id: str, owner: str) -> None:
+    with SessionLocal() as db:
+        db.execute(
+            update(RescrapeRun)
+            .where(_owned(run_id, owner))
+            .values(owner=None, lease_expires_at=None)
+        )
+        db.commit()
+
+
+def _finish_run(run_id: str, owner: str) -> None:
+    with SessionLocal() as db:
+        db.execute(
+            update(RescrapeRun)
+            .where(_owned(run_id, owner))
+            .values(
+                status="finished",
+                finished_at=datetime.utcnow(),
+                owner=None,
+                lease_expires_at=None,
+            )
+        )
+        db.commit()
+
+
+def _queued_slugs(run_id: str) -> list[str]:
+    with SessionLocal() as db:
+        return list(
+            db.execute(
+                select(RescrapeItem.slug)
+                .where(RescrapeItem.run_id == run_id, RescrapeItem.status == "queued")
+                .order_by(RescrapeItem.slug)
+            ).scalars()
+        )
+
+
+def _record_item(run_id: str, slug: str, status: str, error: str | None) -> None:
+    with SessionLocal() as db:
+        db.execute(
+            update(RescrapeItem)
+            .where(RescrapeItem.run_id == run_id, RescrapeItem.slug == slug)
+            .values(status=status, error=error, finished_at=datetime.utcnow())
+        )
+        db.commit()
+
+
+async def _rescrape_item(slug: str) -> tuple[str, str | None]:
+    try:
+        before = await async_storage.load_recipe(slug)
+        after = await scrapes.rescrape_recipe(slug)
+    except Exception as exc:
+        error = exc.detail if isinstance(exc, HTTPException) else str(exc)
+        logger.warning("Rescraping %s failed: %s", slug, error or exc.__class__.__name__)
+        return "failed", str(error or exc.__class__.__name__)
+    return ("unchanged" if after.markdown == before.markdown else "updated"), None
+
+
+async def _keep_lease(run_id: str, owner: str, stop: asyncio.Event, run: asyncio.Future) -> None:
+    interval = get_settings().job_lease_seconds / 3
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            kept = await asyncio.to_thread(_extend_lease, run_id, owner)
+        except Exception:
+            # Try again next beat; the lease outlasts a few missed renewals.
+            logger.exception("Renewing the lease of rescrape run %s failed", run_id)
+            continue
+        if not kept:
+            # Cancelled or taken over: stop rescraping, in-flight items too.
+            stop.set()
+            run.cancel()
+            return
+
+
+async def _process_run(run_id: str, owner: str) -> None:
+    stop = _stops.setdefault(run_id, asyncio.Event())
+    pending = deque(await asyncio.to_thread(_queued_slugs, run_id))
+    logger.info("Rescrape run %s: %d recipes to go", run_id, len(pending))
+
+    async def work() -> None:
+        while pending and not stop.is_set():
+            slug = pending.popleft()
+            status, error = await _rescrape_item(slug)
+            await asyncio.to_thread(_record_item, run_id, slug, status, error)
+
+    run = asyncio.gather(*(work() for _ in range(get_settings().rescrape_concurrency)))
+    heartbeat = asyncio.create_task(_keep_lease(run_id, owner, stop, run))
+    try:
+        await run
+    except asyncio.CancelledError:
+        if not asyncio.current_task().cancelling():
+            logger.warning("Rescrape run %s is no longer ours; stopped rescraping it", run_id)
+            return
+        # Let the next process to start pick the run up straight away.
+        await asyncio.to_thread(_release_run, run_id, owner)
+        raise
+    finally:
+        heartbeat.cancel()
+        _stops.pop(run_id, None)
+    if not stop.is_set():
+        await asyncio.to_thread(_finish_run, run_id, owner)
+        logger.info("Rescrape run %s finished", run_id)
+
+
+async def _supervise() -> None:
+    poll_interval = get_settings().job_poll_interval_ms / 1000
+    while True:
+        try:
+            claimed = await asyncio.to_thread(_claim_run)
+            if claimed is not None:
+                await _process_run(*claimed)
+                continue
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Rescrape run failed; it resumes once its lease runs out")
+        try:
+            await asyncio.wait_for(_wakeup.wait(), poll_interval)
+        except asyncio.TimeoutError:
+            pass
+        _wakeup.clear()
+
+
+def start() -> None:
+    global _supervisor, _wakeup
+    _wakeup = asyncio.Event()
+    _supervisor = asyncio.create_task(_supervise(), name="rescrape-supervisor")
+
+
+async def stop() -> None:
+    global _supervisor, _wakeup
+    if _supervisor is not None:
+        _supervisor.cancel()
+        await asyncio.gather(_supervisor, return_exceptions=True)
+    _supervisor = None
+    _wakeup = None
+
+
+def _wake() -> None:
+    if _wakeup is not None:
+        _wakeup.set()
+
+
+async def start_run(request: RescrapeRunRequest, user_id: int | None = None) -> RescrapeRunOut:
+    """
+    Queue a rescrape of every recipe with a source URL matching the request.
+    """
+    filters = RecipeFilters(
+        terms={
+            "meal": request.meal,
+            "category": request.category,
+            "ethnicity": request.ethnicity,
+            "diet_friendly": request.diet_friendly,
+            "tags": request.tags,
+        },
+        min_total_minutes=request.min_total_minutes,
+        max_total_minutes=request.max_total_minutes,
+    )
+    description = json.dumps(request.model_dump(exclude_defaults=True), sort_keys=True)
+    run = await asyncio.to_thread(_create_run, filters, request.slugs, description, user_id)
+    _wake()
+    return run
+
+
+async def get_run(run_id: str) -> RescrapeRunOut | None:
+    return await asyncio.to_thread(_load_run, run_id)
+
+
+async def list_runs(limit: int = 20) -> list[RescrapeRunOut]:
+    return await asyncio.to_thread(_list_runs, limit)
+
+
+async def cancel_run(run_id: str) -> RescrapeRunOut | None:
+    """
+    Stop a running run. Recipes being rescraped finish; the rest stay queued.
+    """
+    run = await get_run(run_id)
+    if run is None or run.status != "running":
+        return run
+    stop = _stops.get(run_id)
+    if stop is not None:
+        stop.set()
+    # Other processes notice when renewing their lease.
+    return await asyncio.to_thread(_set_run_status, run_id, "cancelled")
+
+
+def _requeue_failed(run_id: str) -> None:
+    with SessionLocal() as db:
+        db.execute(
+            update(RescrapeItem)
+            .where(RescrapeItem.run_id == run_id, RescrapeItem.status == "failed")
+            .values(status="queued", error=None, finished_at=None)
+        )
+        db.commit()
+
+
+async def resume_run(run_id: str) -> RescrapeRunOut | None:
+    """
+    Continue a cancelled or finished run, retrying the recipes that failed.
+    """
+    run = await get_run(run_id)
+    if run is None or run.status == "running":
+        return run
+    await asyncio.to_thread(_requeue_failed, run_id)
+    run = await asyncio.to_thread(_set_run_status, run_id, "running", finished_at=None)
+    _wake()
+    return run
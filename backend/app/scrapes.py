@@ -0,0 +1,145 @@
+"""
+Creating and re-scraping recipes from their source URL.
+
+Both paths are coalesced: concurrent creates of the same canonical URL, or
+rescrapes of the same slug, share one LLM call and one write, and every
+caller gets the same recipe back. Callers may pass ``on_delta`` to follow the
+Markdown as the LLM streams it.
+
+Pages with schema.org Recipe data skip the full LLM scrape: the Markdown is
+rendered locally (see ``structured``) and the LLM, if enabled, only fills in
+the classification fields.
+"""
+from __future__ import annotations
+
+import functools
+import logging
+
+from fastapi import HTTPException, status
+
+from . import async_storage, storage, structured
+from .config import get_settings
+from .llm import classify_recipe, generate_recipe_markdown
+from .llm_scheduler import Priority
+from .models import RecipeResponse, ScrapeStats
+from .singleflight import ProgressCallback, SingleFlight
+from .urls import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+_creates: SingleFlight[RecipeResponse] = SingleFlight("create")
+_rescrapes: SingleFlight[RecipeResponse] = SingleFlight("rescrape")
+
+
+async def _structured_markdown(url: str, priority: Priority) -> str | None:
+    """
+    Render the recipe from the page's schema.org data, asking the LLM only
+    for the classification fields. None when the page has no usable data.
+    """
+    settings = get_settings()
+    recipe = await structured.fetch_structured_recipe(url)
+    if recipe is None:
+        return None
+
+    classification = structured.classify(recipe)
+    if settings.structured_data_llm_classification:
+        try:
+            data = await classify_recipe(structured.summarize(recipe), priority=priority)
+        except Exception as exc:
+            logger.warning("Classifying %s failed, using schema.org values: %s", url, exc)
+        else:
+            classification = structured.merge_classification(classification, data)
+    return structured.render_markdown(url, recipe, classification)
+
+
+async def extract_recipe_markdown(
+    url: str, publish: ProgressCallback, priority: Priority = Priority.INTERACTIVE
+) -> str:
+    """
+    Markdown for the recipe at ``url``: from structured data when the page
+    has it, otherwise from the LLM, streaming its output to ``publish``.
+    """
+    if get_settings().structured_data_enabled:
+        try:
+            markdown = await _structured_markdown(url, priority)
+        except Exception:
+            logger.exception("Structured-data extraction of %s failed", url)
+            markdown = None
+        if markdown is not None:
+            publish(markdown)
+            return markdown
+    return await generate_recipe_markdown(url=url, on_delta=publish, priority=priority)
+
+
+async def _scrape_and_save(
+    url: str, priority: Priority, publish: ProgressCallback
+) -> RecipeResponse:
+    markdown = await extract_recipe_markdown(url, publish, priority)
+    # Look again: the recipe may have been saved while the LLM was running.
+    existing = await async_storage.find_recipe_by_url(url)
+    if existing is not None:
+        # Refresh in place so the recipe keeps its slug.
+        return await async_storage.update_recipe(existing.metadata.slug, markdown)
+    return await async_storage.save_recipe_markdown(markdown)
+
+
+async def create_recipe(
+    url: str,
+    refresh: bool = False,
+    on_delta: ProgressCallback | None = None,
+    priority: Priority = Priority.INTERACTIVE,
+) -> RecipeResponse:
+    """
+    Return the saved recipe for ``url``, scraping it when it is not saved
+    yet or when ``refresh`` is set. A coalesced call runs in the lane of
+    the caller that started it.
+    """
+    if not refresh:
+        existing = await async_storage.find_recipe_by_url(url)
+        if existing is not None:
+            return existing
+    return await _creates.do(
+        canonicalize_url(url),
+        functools.partial(_scrape_and_save, url, priority),
+        on_progress=on_delta,
+    )
+
+
+async def rescrape_source_url(slug: str) -> str:
+    """
+    Source URL of a saved recipe; 404 if the recipe is missing, 400 if it
+    has no ``url:`` in its front matter.
+    """
+    existing = await async_storage.load_recipe(slug)
+    url = storage.extract_url_from_markdown(existing.markdown)
+    if not url:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Recipe does not have a source URL in frontmatter.",
+        )
+    return url
+
+
+async def _rescrape(slug: str, priority: Priority, publish: ProgressCallback) -> RecipeResponse:
+    url = await rescrape_source_url(slug)
+    markdown = await extract_recipe_markdown(url, publish, priority)
+    return await async_storage.update_recipe(slug, markdown)
+
+
+async def rescrape_recipe(
+    slug: str,
+    on_delta: ProgressCallback | None = None,
+    priority: Priority = Priority.BACKGROUND,
+) -> RecipeResponse:
+    return await _rescrapes.do(
+        slug, functools.partial(_rescrape, slug, priority), on_progress=on_delta
+    )
+
+
+def scrape_stats() -> ScrapeStats:
+    return ScrapeStats(create=_creates.stats(), rescrape=_rescrapes.stats())
+
+
+async def shutdown() -> None:
+    await _creates.cancel_all()
+    await _rescrapes.cancel_all()
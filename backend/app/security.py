@@ -1,22 +1,32 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+import functools
+from typing import Callable, Optional, TypeVar
 
+import anyio
+import anyio.to_thread
 import bcrypt
 import jwt
 from fastapi import HTTPException, status
 
 from .config import get_settings
 
+T = TypeVar("T")
+
+# bcrypt releases the GIL while hashing, so a few threads hash in parallel
+# without blocking the event loop.
+_password_limiter: anyio.CapacityLimiter | None = None
+_password_jobs = 0
+
 
 def hash_password(password: str) -> str:
   """
-  Hash a password using bcrypt.
+  Hash a password using bcrypt with the configured cost (``bcrypt_rounds``).
   """
   if not isinstance(password, str):
     raise TypeError("password must be a string")
-  salt = bcrypt.gensalt()
+  salt = bcrypt.gensalt(rounds=get_settings().bcrypt_rounds)
   hashed = bcrypt.hashpw(password.encode("utf-8"), salt)
   return hashed.decode("utf-8")
 
@@ -31,6 +41,56 @@ def verify_password(password: str, password_hash: str) -> bool:
     return False
 
 
+def password_needs_rehash(password_hash: str) -> bool:
+  """
+  Whether a stored hash was made with a cost other than ``bcrypt_rounds``.
+  """
+  try:
+    rounds = int(password_hash.split("$")[2])
+  except (IndexError, ValueError):
+    return True
+  return rounds != get_settings().bcrypt_rounds
+
+
+def _get_password_limiter() -> anyio.CapacityLimiter:
+  # Created lazily: a CapacityLimiter must be built inside the event loop.
+  global _password_limiter
+  if _password_limiter is None:
+    _password_limiter = anyio.CapacityLimiter(get_settings().password_hash_threads)
+  return _password_limiter
+
+
+async def _run_password_work(func: Callable[..., T], *args) -> T:
+  """
+  Run bcrypt work on the dedicated password threads. Once
+  ``password_hash_queue_limit`` calls are already waiting, fail fast with a
+  503 instead of queueing sign-ins without bound.
+  """
+  global _password_jobs
+  settings = get_settings()
+  if _password_jobs >= settings.password_hash_threads + settings.password_hash_queue_limit:
+    raise HTTPException(
+      status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+      detail="Too many sign-ins in progress, try again shortly",
+      headers={"Retry-After": "1"},
+    )
+  _password_jobs += 1
+  try:
+    return await anyio.to_thread.run_sync(
+      functools.partial(func, *args), limiter=_get_password_limiter()
+    )
+  finally:
+    _password_jobs -= 1
+
+
+async def hash_password_async(password: str) -> str:
+  return await _run_password_work(hash_password, password)
+
+
+async def verify_password_async(password: str, password_hash: str) -> bool:
+  return await _run_password_work(verify_password, password, password_hash)
+
+
 def create_access_token(subject: str, expires_delta: Optional[timedelta] = None) -> str:
   """
   Create a signed JWT access token for the given subject (user id).
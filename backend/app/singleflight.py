@@ -0,0 +1,92 @@
+"""
+In-process request coalescing ("single flight").
+
+Concurrent calls for the same key share one execution: the first caller
+starts the work and later callers await the same result, including its
+exception. The work runs in its own task, so a caller that disconnects
+does not cancel the execution for everybody else.
+
+The work may also publish text progress (e.g. streamed LLM output). Every
+caller can follow it; one that joins late first gets everything published so
+far as a single chunk.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, Generic, TypeVar
+
+from .models import CoalescingStats
+
+T = TypeVar("T")
+
+ProgressCallback = Callable[[str], None]
+
+
+class _Flight(Generic[T]):
+    def __init__(self) -> None:
+        self.task: asyncio.Task[T] | None = None
+        self.progress: list[str] = []
+        self.listeners: list[ProgressCallback] = []
+
+    def publish(self, chunk: str) -> None:
+        self.progress.append(chunk)
+        for listener in list(self.listeners):
+            listener(chunk)
+
+
+class SingleFlight(Generic[T]):
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.executions = 0
+        self.coalesced = 0
+        self._in_flight: dict[str, _Flight[T]] = {}
+
+    async def do(
+        self,
+        key: str,
+        func: Callable[[ProgressCallback], Awaitable[T]],
+        on_progress: ProgressCallback | None = None,
+    ) -> T:
+        """
+        Run ``func(publish)`` for ``key`` unless it is already running, and
+        return its result.
+        """
+        flight = self._in_flight.get(key)
+        if flight is None:
+            self.executions += 1
+            flight = _Flight()
+            flight.task = asyncio.create_task(func(flight.publish), name=f"{self.name}:{key}")
+            self._in_flight[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+        else:
+            self.coalesced += 1
+
+        if on_progress is not None:
+            if flight.progress:
+                on_progress("".join(flight.progress))
+            flight.listeners.append(on_progress)
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            if on_progress is not None:
+                flight.listeners.remove(on_progress)
+
+    def _forget(self, key: str, flight: _Flight[T]) -> None:
+        if self._in_flight.get(key) is flight:
+            del self._in_flight[key]
+        if not flight.task.cancelled():
+            # Mark the exception retrieved when every caller went away.
+            flight.task.exception()
+
+    async def cancel_all(self) -> None:
+        tasks = [flight.task for flight in self._in_flight.values()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> CoalescingStats:
+        return CoalescingStats(
+            executions=self.executions,
+            coalesced=self.coalesced,
+            in_flight=len(self._in_flight),
+        )
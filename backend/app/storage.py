@@ -1,12 +1,30 @@
+from collections import OrderedDict
 from datetime import datetime
+import hashlib
+import logging
+import math
+import os
 from pathlib import Path
-from typing import List
+import threading
+from typing import Iterable
 
 from fastapi import HTTPException, status
 import re
 
+from . import metrics, recipe_index, render
 from .config import get_settings
-from .models import RecipeMetadata, RecipeResponse
+from .models import (
+    RecipeCacheStats,
+    RecipeFacets,
+    RecipeHtmlResponse,
+    RecipeMetadata,
+    RecipePage,
+    RecipeResponse,
+    RecipeSearchHit,
+)
+from .urls import canonicalize_url
+
+logger = logging.getLogger(__name__)
 
 
 _DURATION_LINE_RE = re.compile(r"^(\s*)(prep_time|cook_time|total_time)\s*:\s*(.*?)\s*$")
@@ -17,6 +35,10 @@ _FRONTMATTER_LINE_RE = re.compile(r"^(\s*)([A-Za-z0-9_-]+)\s*:\s*(.*?)\s*$")
 _FRONTMATTER_LIST_ITEM_RE = re.compile(r"^(\s*)-\s*(.*?)\s*$")
 _ISO_DURATION_RE = re.compile(r"^P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$", re.I)
 _RECIPE_WORD_RE = re.compile(r"\brecipe\b", re.I)
+_LOOSE_DURATION_COLON_RE = re.compile(r"^(\d+)\s*:\s*(\d{1,2})(?::\d{1,2})?$")
+_LOOSE_DURATION_UNIT_RE = re.compile(
+    r"(\d+(?:\.\d+)?)\s*(days?|day|d|hours?|hrs?|hr|h|minutes?|mins?|min|m|seconds?|secs?|sec|s)"
+)
 
 
 def _strip_recipe_word(value: str) -> str:
@@ -49,8 +71,7 @@ def _parse_frontmatter_scalar(raw_value: str) -> tuple[str, str | None]:
     return raw_value, None
 
 
-def _parse_frontmatter(markdown: str) -> dict[str, object]:
-    lines = markdown.splitlines()
+def _parse_frontmatter_lines(lines: list[str]) -> dict[str, object]:
     if not lines or lines[0].strip() != "---":
         return {}
 
@@ -84,7 +105,9 @@ def _parse_frontmatter(markdown: str) -> dict[str, object]:
         if raw_value == "":
             list_key = key
             list_indent = len(indent)
-            frontmatter.setdefault(key, [])
+            # A repeated key starts over as a list rather than appending to a scalar.
+            if not isinstance(frontmatter.get(key), list):
+                frontmatter[key] = []
             continue
 
         list_key = None
@@ -107,6 +130,88 @@ def _parse_frontmatter(markdown: str) -> dict[str, object]:
     return frontmatter
 
 
+class RecipeDocument:
+    """
+    Recipe Markdown split into lines once and shared by every normalizer.
+
+    Normalizers edit ``lines`` in place and the document is joined back into
+    text only by ``to_markdown``. When no normalizer rebuilt anything, the
+    original text is returned untouched, exactly as the per-step string
+    functions used to do.
+    """
+
+    def __init__(self, markdown: str) -> None:
+        self.source = markdown
+        self.lines = markdown.splitlines()
+        self.trailing_newline = markdown.endswith("\n")
+        self.rebuilt = False
+        self._frontmatter_end: int | None = None
+        self._frontmatter_end_known = False
+        self._frontmatter: dict[str, object] | None = None
+        self._markdown: str | None = markdown
+
+    @property
+    def frontmatter_end(self) -> int | None:
+        """
+        Index of the closing ``---`` line, or None without a complete block.
+        """
+        if not self._frontmatter_end_known:
+            self._frontmatter_end = None
+            if self.lines and self.lines[0].strip() == "---":
+                for i in range(1, len(self.lines)):
+                    if self.lines[i].strip() == "---":
+                        self._frontmatter_end = i
+                        break
+            self._frontmatter_end_known = True
+        return self._frontmatter_end
+
+    @property
+    def frontmatter(self) -> dict[str, object]:
+        """
+        Parsed front-matter values.
+        """
+        if self._frontmatter is None:
+            self._frontmatter = _parse_frontmatter_lines(self.lines)
+        return self._frontmatter
+
+    @property
+    def body_lines(self) -> list[str]:
+        end_idx = self.frontmatter_end
+        return self.lines if end_idx is None else self.lines[end_idx + 1 :]
+
+    def replace_frontmatter(self, frontmatter_lines: list[str]) -> None:
+        """
+        Swap in rebuilt front-matter lines (one per original line).
+        """
+        end_idx = self.frontmatter_end
+        self.lines[1:end_idx] = frontmatter_lines
+        self._mark_rebuilt()
+
+    def replace_line(self, index: int, line: str) -> None:
+        self.lines[index] = line
+        self._mark_rebuilt()
+
+    def _mark_rebuilt(self) -> None:
+        # Joining with "\n" and splitting again folds a trailing empty line
+        # into a trailing newline; keep the lines in that same shape so later
+        # steps and the final output match the string-based pipeline.
+        if not self.trailing_newline and len(self.lines) > 1 and self.lines[-1] == "":
+            self.lines.pop()
+            self.trailing_newline = True
+        self.rebuilt = True
+        self._frontmatter = None
+        self._markdown = None
+
+    def to_markdown(self) -> str:
+        if not self.rebuilt:
+            return self.source
+        if self._markdown is None:
+            self._markdown = "\n".join(self.lines)
+            if self.trailing_newline:
+                self._markdown += "\n"
+        return self._markdown
+
+
 def _normalize_frontmatter_text(value: object | None) -> str | None:
     if value is None:
         return None
@@ -138,18 +243,11 @@ def _normalize_frontmatter_list(value: object | None) -> list[str] | None:
     return [raw]
 
 
-def _normalize_markdown_title_and_slug(markdown: str) -> str:
-    lines = markdown.splitlines()
-    if not lines or lines[0].strip() != "---":
-        return markdown
-
-    end_idx = None
-    for i in range(1, len(lines)):
-        if lines[i].strip() == "---":
-            end_idx = i
-            break
+def _normalize_document_title_and_slug(doc: RecipeDocument) -> None:
+    end_idx = doc.frontmatter_end
     if end_idx is None:
-        return markdown
+        return
+    lines = doc.lines
 
     changed = False
     frontmatter = lines[1:end_idx]
@@ -193,25 +291,21 @@ def _normalize_markdown_title_and_slug(markdown: str) -> str:
         normalized_frontmatter.append(line)
 
     if not changed and not cleaned_title:
-        return markdown
+        return
 
-    rebuilt_lines = [lines[0], *normalized_frontmatter, lines[end_idx], *lines[end_idx + 1 :]]
+    doc.replace_frontmatter(normalized_frontmatter)
 
     if cleaned_title:
-        for i in range(end_idx + 1, len(rebuilt_lines)):
-            if rebuilt_lines[i].startswith("# "):
-                heading_text = rebuilt_lines[i][2:].strip()
+        lines = doc.lines
+        for i in range(end_idx + 1, len(lines)):
+            if lines[i].startswith("# "):
+                heading_text = lines[i][2:].strip()
                 if original_title and heading_text.lower() == original_title.lower():
-                    rebuilt_lines[i] = f"# {cleaned_title}"
+                    doc.replace_line(i, f"# {cleaned_title}")
                 elif _RECIPE_WORD_RE.search(heading_text):
-                    rebuilt_lines[i] = f"# {cleaned_title}"
+                    doc.replace_line(i, f"# {cleaned_title}")
                 break
 
-    rebuilt = "\n".join(rebuilt_lines)
-    if markdown.endswith("\n"):
-        rebuilt += "\n"
-    return rebuilt
-
 
 def _normalize_iso_duration_hours_minutes(value: str) -> str:
     raw = value.strip()
@@ -243,6 +337,52 @@ def _normalize_iso_duration_hours_minutes(value: str) -> str:
     return value
 
 
+def _duration_minutes(value: str | None) -> int | None:
+    """
+    Parse a total_time value into whole minutes, matching the SPA's filters.
+    """
+    if value is None:
+        return None
+    raw = value.strip().lower()
+    if not raw:
+        return None
+
+    match = _ISO_DURATION_RE.match(raw)
+    if match:
+        days = int(match.group(1) or 0)
+        hours = int(match.group(2) or 0)
+        minutes = int(match.group(3) or 0)
+        seconds = int(match.group(4) or 0)
+        total_minutes = (days * 24 * 60) + (hours * 60) + minutes
+        if total_minutes:
+            return total_minutes
+        return math.ceil(seconds / 60) if seconds else None
+
+    if raw.isdigit():
+        return int(raw) or None
+
+    colon_match = _LOOSE_DURATION_COLON_RE.match(raw)
+    if colon_match:
+        return (int(colon_match.group(1)) * 60 + int(colon_match.group(2))) or None
+
+    total = 0.0
+    matched = False
+    for amount_raw, unit in _LOOSE_DURATION_UNIT_RE.findall(raw):
+        matched = True
+        amount = float(amount_raw)
+        if unit.startswith("d"):
+            total += amount * 24 * 60
+        elif unit.startswith("h"):
+            total += amount * 60
+        elif unit.startswith("m"):
+            total += amount
+        elif unit.startswith("s"):
+            total += amount / 60
+    if not matched or total <= 0:
+        return None
+    return math.ceil(total)
+
+
 def _normalize_yield_to_number(value: str) -> str:
     raw = value.strip()
     if not raw:
@@ -255,18 +395,11 @@ def _normalize_yield_to_number(value: str) -> str:
     return match.group(1)
 
 
-def _normalize_markdown_durations(markdown: str) -> str:
-    lines = markdown.splitlines()
-    if not lines or lines[0].strip() != "---":
-        return markdown
-
-    end_idx = None
-    for i in range(1, len(lines)):
-        if lines[i].strip() == "---":
-            end_idx = i
-            break
+def _normalize_document_durations(doc: RecipeDocument) -> None:
+    end_idx = doc.frontmatter_end
     if end_idx is None:
-        return markdown
+        return
+    lines = doc.lines
 
     changed = False
     frontmatter = lines[1:end_idx]
@@ -334,18 +467,21 @@ def _normalize_markdown_durations(markdown: str) -> str:
         normalized_frontmatter.append(f"{indent}{key}: {normalized_value}")
 
     if not changed:
-        return markdown
+        return
 
-    rebuilt = "\n".join(
-        [lines[0], *normalized_frontmatter, lines[end_idx], *lines[end_idx + 1 :]]
-    )
-    if markdown.endswith("\n"):
-        rebuilt += "\n"
-    return rebuilt
+    doc.replace_frontmatter(normalized_frontmatter)
 
 
-def _slug_from_markdown(markdown: str) -> str:
-    for line in markdown.splitlines():
+def _normalize_document(doc: RecipeDocument) -> None:
+    """
+    Apply every Markdown normalizer, in order, to a parsed document.
+    """
+    _normalize_document_durations(doc)
+    _normalize_document_title_and_slug(doc)
+
+
+def _slug_from_document(doc: RecipeDocument) -> str:
+    for line in doc.lines:
         if line.startswith("slug:"):
             value = line.split(":", 1)[1].strip().strip('"').strip("'")
             if value:
@@ -361,19 +497,8 @@ def extract_url_from_markdown(markdown: str) -> str | None:
     return None
 
 
-def save_recipe_markdown(markdown: str) -> RecipeResponse:
-    settings = get_settings()
-    output_dir: Path = settings.output_dir
-
-    markdown = _normalize_markdown_durations(markdown)
-    markdown = _normalize_markdown_title_and_slug(markdown)
-    slug = _slug_from_markdown(markdown)
-    filename = f"{slug}.md"
-    path = output_dir / filename
-
-    path.write_text(markdown, encoding="utf-8")
-
-    frontmatter = _parse_frontmatter(markdown)
+def _metadata_from_document(slug: str, doc: RecipeDocument) -> RecipeMetadata:
+    frontmatter = doc.frontmatter
     title = _normalize_frontmatter_text(frontmatter.get("title")) or slug.replace("-", " ").title()
     url = _normalize_frontmatter_text(frontmatter.get("url"))
     meal = _normalize_frontmatter_list(frontmatter.get("meal"))
@@ -383,7 +508,7 @@ def save_recipe_markdown(markdown: str) -> RecipeResponse:
     tags = _normalize_frontmatter_list(frontmatter.get("tags"))
     total_time = _normalize_frontmatter_text(frontmatter.get("total_time"))
 
-    metadata = RecipeMetadata(
+    return RecipeMetadata(
         title=title,
         slug=slug,
         url=url,
@@ -395,80 +520,393 @@ def save_recipe_markdown(markdown: str) -> RecipeResponse:
         total_time=total_time,
     )
 
-    return RecipeResponse(metadata=metadata, markdown=markdown)
+
+class _RecipeCache:
+    """
+    Size-bounded LRU cache of parsed recipes.
+
+    Entries are keyed by slug and validated against the file's inode, mtime
+    and size, so edits made outside the app are picked up on the next read.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[tuple[int, int, int], RecipeResponse]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, slug: str, key: tuple[int, int, int]) -> RecipeResponse | None:
+        with self._lock:
+            entry = self._entries.get(slug)
+            if entry is None or entry[0] != key:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(slug)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, slug: str, key: tuple[int, int, int], recipe: RecipeResponse) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[slug] = (key, recipe)
+            self._entries.move_to_end(slug)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, slug: str) -> None:
+        with self._lock:
+            self._entries.pop(slug, None)
+
+    def stats(self) -> RecipeCacheStats:
+        with self._lock:
+            return RecipeCacheStats(
+                hits=self.hits,
+                misses=self.misses,
+                size=len(self._entries),
+                max_size=self.max_size,
+            )
+
+
+_recipe_cache: _RecipeCache | None = None
+
+
+def _get_recipe_cache() -> _RecipeCache:
+    global _recipe_cache
+    if _recipe_cache is None:
+        _recipe_cache = _RecipeCache(get_settings().recipe_cache_size)
+    return _recipe_cache
+
+
+class _RenderCache:
+    """
+    Size-bounded LRU cache of rendered recipe HTML keyed by content hash, so
+    each version of a recipe is rendered once. Entries for content that was
+    replaced or deleted are dropped when storage sees the change.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, content_hash: str) -> str | None:
+        with self._lock:
+            html = self._entries.get(content_hash)
+            if html is not None:
+                self._entries.move_to_end(content_hash)
+        metrics.STORAGE_RENDER_CACHE_LOOKUPS.inc(result="miss" if html is None else "hit")
+        return html
+
+    def put(self, content_hash: str, html: str) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[content_hash] = html
+            self._entries.move_to_end(content_hash)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, content_hash: str) -> None:
+        with self._lock:
+            self._entries.pop(content_hash, None)
+
+
+_render_cache: _RenderCache | None = None
+
+
+def _get_render_cache() -> _RenderCache:
+    global _render_cache
+    if _render_cache is None:
+        _render_cache = _RenderCache(get_settings().render_cache_size)
+    return _render_cache
+
+
+def _cache_key(stat: os.stat_result) -> tuple[int, int, int]:
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def recipe_etag(slug: str) -> str:
+    """
+    Strong validator for one recipe, derived from a single stat of its file.
+    """
+    path = get_settings().output_dir / f"{slug}.md"
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Recipe not found"
+        )
+    inode, mtime_ns, size = _cache_key(stat)
+    return f'"{inode:x}-{mtime_ns:x}-{size:x}"'
+
+
+def recipes_etag() -> str:
+    """
+    Validator for recipe listings, derived from the index collection version.
+    """
+    return f'"v{recipe_index.get_version():x}"'
+
+
+def recipe_cache_stats() -> RecipeCacheStats:
+    return _get_recipe_cache().stats()
+
+
+def _content_hash(markdown: str) -> str:
+    return hashlib.sha256(markdown.encode("utf-8")).hexdigest()
+
+
+def _file_signature(stat: os.stat_result, markdown: str) -> recipe_index.FileSignature:
+    return recipe_index.FileSignature(
+        mtime_ns=stat.st_mtime_ns,
+        size=stat.st_size,
+        content_hash=_content_hash(markdown),
+    )
+
+
+def _markdown_section(doc: RecipeDocument, heading: str) -> str:
+    """
+    Return the text under a ``## <heading>`` section, up to the next heading.
+    """
+    collected: list[str] = []
+    in_section = False
+    for line in doc.body_lines:
+        if line.startswith("#"):
+            if in_section:
+                break
+            in_section = line.lstrip("#").strip().lower() == heading.lower() and line.startswith("## ")
+            continue
+        if in_section:
+            collected.append(line)
+    return "\n".join(collected).strip()
+
+
+def _index_record(
+    metadata: RecipeMetadata, signature: recipe_index.FileSignature, doc: RecipeDocument
+) -> recipe_index.IndexRecord:
+    return recipe_index.IndexRecord(
+        metadata=metadata,
+        signature=signature,
+        total_minutes=_duration_minutes(metadata.total_time),
+        ingredients=_markdown_section(doc, "Ingredients"),
+        instructions=_markdown_section(doc, "Instructions"),
+    )
+
+
+@metrics.timed(metrics.STORAGE_OPERATION_DURATION, operation="search")
+def search_recipes(query: str, limit: int = 20) -> list[RecipeSearchHit]:
+    """
+    Full-text search over titles, tags, ingredients and instructions.
+    """
+    return [
+        RecipeSearchHit(metadata=hit.metadata, snippet=hit.snippet, score=hit.score)
+        for hit in recipe_index.search_entries(query, limit=limit)
+    ]
+
+
+def _sync_index(known: dict[str, recipe_index.FileSignature], files: dict[str, Path]) -> None:
+    """
+    Apply on-disk state for the given files to the index and recipe cache.
+
+    Files whose mtime and size match the stored signature are skipped without
+    being read; changed files are re-read and only re-parsed when their
+    content hash differs. Slugs in ``known`` without a file on disk are
+    removed.
+    """
+    present: set[str] = set()
+    upserts: list[recipe_index.IndexRecord] = []
+    touched: list[tuple[str, recipe_index.FileSignature]] = []
+
+    for slug, file in files.items():
+        try:
+            stat = file.stat()
+        except FileNotFoundError:
+            continue
+        metrics.STORAGE_FILES_SCANNED.inc()
+        present.add(slug)
+        previous = known.get(slug)
+        if (
+            previous is not None
+            and previous.mtime_ns == stat.st_mtime_ns
+            and previous.size == stat.st_size
+        ):
+            continue
+
+        try:
+            markdown = file.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            present.discard(slug)
+            continue
+        except (OSError, UnicodeDecodeError) as exc:
+            # One unreadable file must not keep the rest from being indexed.
+            logger.warning("Skipping %s in recipe index: %s", file.name, exc)
+            continue
+        metrics.STORAGE_FILES_READ.inc()
+        signature = _file_signature(stat, markdown)
+        if previous is not None and previous.content_hash == signature.content_hash:
+            touched.append((slug, signature))
+            continue
+        if previous is not None:
+            _get_render_cache().invalidate(previous.content_hash)
+
+        doc = RecipeDocument(markdown)
+        try:
+            metadata = _metadata_from_document(slug, doc)
+            record = _index_record(metadata, signature, doc)
+        except Exception as exc:
+            logger.warning("Skipping %s in recipe index: %s", file.name, exc)
+            continue
+        upserts.append(record)
+
+    recipe_index.upsert_entries(upserts)
+    recipe_index.touch_entries(touched)
+
+    removed = set(known) - present
+    recipe_index.delete_entries(removed)
+    cache = _get_recipe_cache()
+    render_cache = _get_render_cache()
+    for slug in removed:
+        cache.invalidate(slug)
+        render_cache.invalidate(known[slug].content_hash)
 
 
-def list_recipes() -> List[RecipeMetadata]:
+@metrics.timed(metrics.STORAGE_OPERATION_DURATION, operation="reconcile")
+def reconcile_recipe_index() -> None:
+    """
+    Bring the metadata index in line with the whole recipes directory.
+    """
     settings = get_settings()
     output_dir: Path = settings.output_dir
 
-    if not output_dir.exists():
-        return []
-
-    recipes: List[RecipeMetadata] = []
-    for file in sorted(output_dir.glob("*.md")):
-        markdown = file.read_text(encoding="utf-8")
-        frontmatter = _parse_frontmatter(markdown)
-        title = _normalize_frontmatter_text(frontmatter.get("title")) or file.stem.replace("-", " ").title()
-        url = _normalize_frontmatter_text(frontmatter.get("url"))
-        meal = _normalize_frontmatter_list(frontmatter.get("meal"))
-        category = _normalize_frontmatter_single(frontmatter.get("category"))
-        ethnicity = _normalize_frontmatter_list(frontmatter.get("ethnicity"))
-        diet_friendly = _normalize_frontmatter_list(frontmatter.get("diet_friendly"))
-        tags = _normalize_frontmatter_list(frontmatter.get("tags"))
-        total_time = _normalize_frontmatter_text(frontmatter.get("total_time"))
-        recipes.append(
-            RecipeMetadata(
-                title=title,
-                slug=file.stem,
-                url=url,
-                meal=meal,
-                category=category,
-                ethnicity=ethnicity,
-                diet_friendly=diet_friendly,
-                tags=tags,
-                total_time=total_time,
-            )
+    files: dict[str, Path] = {}
+    if output_dir.exists():
+        files = {file.stem: file for file in output_dir.glob("*.md")}
+    _sync_index(recipe_index.get_signatures(), files)
+
+
+@metrics.timed(metrics.STORAGE_OPERATION_DURATION, operation="refresh")
+def refresh_recipes(slugs: Iterable[str]) -> None:
+    """
+    Re-index only the given slugs, e.g. after the watcher saw them change.
+    """
+    settings = get_settings()
+    output_dir: Path = settings.output_dir
+
+    slugs = set(slugs)
+    if not slugs:
+        return
+    files = {slug: output_dir / f"{slug}.md" for slug in slugs}
+    _sync_index(recipe_index.get_signatures(slugs), files)
+
+
+def find_recipe_by_url(url: str) -> RecipeResponse | None:
+    """
+    Return the saved recipe whose source URL canonicalizes to the same key
+    as ``url``, or None.
+    """
+    slug = recipe_index.find_slug_by_url(canonicalize_url(url))
+    if slug is None:
+        return None
+    try:
+        return load_recipe(slug)
+    except HTTPException:
+        # The file went away before the watcher caught up; drop the stale row.
+        refresh_recipes([slug])
+        return None
+
+
+def _store_written_recipe(slug: str, path: Path, doc: RecipeDocument) -> RecipeResponse:
+    """
+    Refresh the index and the recipe cache after writing a recipe file.
+    """
+    stat = path.stat()
+    markdown = doc.to_markdown()
+    metadata = _metadata_from_document(slug, doc)
+    recipe = RecipeResponse(metadata=metadata, markdown=markdown)
+
+    recipe_index.upsert_entries(
+        [_index_record(metadata, _file_signature(stat, markdown), doc)]
+    )
+    # Replacing the entry drops whatever was cached for the previous content.
+    _get_recipe_cache().put(slug, _cache_key(stat), recipe)
+    return recipe
+
+
+@metrics.timed(metrics.STORAGE_OPERATION_DURATION, operation="save")
+def save_recipe_markdown(markdown: str) -> RecipeResponse:
+    settings = get_settings()
+    output_dir: Path = settings.output_dir
+
+    doc = RecipeDocument(markdown)
+    _normalize_document(doc)
+    slug = _slug_from_document(doc)
+    filename = f"{slug}.md"
+    path = output_dir / filename
+
+    path.write_text(doc.to_markdown(), encoding="utf-8")
+    return _store_written_recipe(slug, path, doc)
+
+
+@metrics.timed(metrics.STORAGE_OPERATION_DURATION, operation="list")
+def list_recipes(
+    filters: recipe_index.RecipeFilters | None = None,
+    sort: str = "title",
+    cursor: str | None = None,
+    limit: int = 50,
+) -> RecipePage:
+    """
+    List one page of recipe metadata from the persistent index without
+    reading the files.
+    """
+    try:
+        items, next_cursor = recipe_index.query_entries(
+            filters or recipe_index.RecipeFilters(), sort=sort, cursor=cursor, limit=limit
         )
-    return recipes
+    except recipe_index.InvalidCursor as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    return RecipePage(items=items, next_cursor=next_cursor)
+
 
+@metrics.timed(metrics.STORAGE_OPERATION_DURATION, operation="facets")
+def recipe_facets(ranges: dict[str, tuple[int | None, int | None]] | None = None) -> RecipeFacets:
+    """
+    Filter values and per-range recipe counts from the index, keyed as given.
+    """
+    ranges = ranges or {}
+    total, values, counts = recipe_index.facet_values(ranges.values())
+    return RecipeFacets(total=total, values=values, total_minutes=dict(zip(ranges, counts)))
 
+
+@metrics.timed(metrics.STORAGE_OPERATION_DURATION, operation="load")
 def load_recipe(slug: str) -> RecipeResponse:
     settings = get_settings()
     output_dir: Path = settings.output_dir
     path = output_dir / f"{slug}.md"
 
-    if not path.exists():
+    cache = _get_recipe_cache()
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        cache.invalidate(slug)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Recipe not found"
         )
 
-    markdown = path.read_text(encoding="utf-8")
-    frontmatter = _parse_frontmatter(markdown)
-    title = _normalize_frontmatter_text(frontmatter.get("title")) or slug.replace("-", " ").title()
-    url = _normalize_frontmatter_text(frontmatter.get("url"))
-    meal = _normalize_frontmatter_list(frontmatter.get("meal"))
-    category = _normalize_frontmatter_single(frontmatter.get("category"))
-    ethnicity = _normalize_frontmatter_list(frontmatter.get("ethnicity"))
-    diet_friendly = _normalize_frontmatter_list(frontmatter.get("diet_friendly"))
-    tags = _normalize_frontmatter_list(frontmatter.get("tags"))
-    total_time = _normalize_frontmatter_text(frontmatter.get("total_time"))
+    key = _cache_key(stat)
+    cached = cache.get(slug, key)
+    if cached is not None:
+        return cached
 
-    metadata = RecipeMetadata(
-        title=title,
-        slug=slug,
-        url=url,
-        meal=meal,
-        category=category,
-        ethnicity=ethnicity,
-        diet_friendly=diet_friendly,
-        tags=tags,
-        total_time=total_time,
-    )
+    markdown = path.read_text(encoding="utf-8")
+    metadata = _metadata_from_document(slug, RecipeDocument(markdown))
+    recipe = RecipeResponse(metadata=metadata, markdown=markdown)
+    cache.put(slug, key, recipe)
 
-    return RecipeResponse(metadata=metadata, markdown=markdown)
+    return recipe
 
 
+@metrics.timed(metrics.STORAGE_OPERATION_DURATION, operation="update")
 def update_recipe(slug: str, markdown: str) -> RecipeResponse:
     settings = get_settings()
     output_dir: Path = settings.output_dir
@@ -479,29 +917,30 @@ def update_recipe(slug: str, markdown: str) -> RecipeResponse:
             status_code=status.HTTP_404_NOT_FOUND, detail="Recipe not found"
         )
 
-    markdown = _normalize_markdown_durations(markdown)
-    markdown = _normalize_markdown_title_and_slug(markdown)
-    path.write_text(markdown, encoding="utf-8")
-    frontmatter = _parse_frontmatter(markdown)
-    title = _normalize_frontmatter_text(frontmatter.get("title")) or slug.replace("-", " ").title()
-    url = _normalize_frontmatter_text(frontmatter.get("url"))
-    meal = _normalize_frontmatter_list(frontmatter.get("meal"))
-    category = _normalize_frontmatter_single(frontmatter.get("category"))
-    ethnicity = _normalize_frontmatter_list(frontmatter.get("ethnicity"))
-    diet_friendly = _normalize_frontmatter_list(frontmatter.get("diet_friendly"))
-    tags = _normalize_frontmatter_list(frontmatter.get("tags"))
-    total_time = _normalize_frontmatter_text(frontmatter.get("total_time"))
-
-    metadata = RecipeMetadata(
-        title=title,
-        slug=slug,
-        url=url,
-        meal=meal,
-        category=category,
-        ethnicity=ethnicity,
-        diet_friendly=diet_friendly,
-        tags=tags,
-        total_time=total_time,
-    )
-
-    return RecipeResponse(metadata=metadata, markdown=markdown)
+    doc = RecipeDocument(markdown)
+    _normalize_document(doc)
+    updated = doc.to_markdown()
+    current = path.read_text(encoding="utf-8")
+    if current == updated:
+        # Leave identical content alone so the file keeps its mtime and ETag.
+        return load_recipe(slug)
+    path.write_text(updated, encoding="utf-8")
+    _get_render_cache().invalidate(_content_hash(current))
+    return _store_written_recipe(slug, path, doc)
+
+
+@metrics.timed(metrics.STORAGE_OPERATION_DURATION, operation="render")
+def load_recipe_html(slug: str) -> RecipeHtmlResponse:
+    """
+    Load a recipe with its Markdown rendered to HTML, rendering each version
+    of the file only once.
+    """
+    recipe = load_recipe(slug)
+    content_hash = _content_hash(recipe.markdown)
+    cache = _get_render_cache()
+    html = cache.get(content_hash)
+    if html is None:
+        doc = RecipeDocument(recipe.markdown)
+        html = render.render_recipe_html(doc.frontmatter, doc.body_lines)
+        cache.put(content_hash, html)
+    return RecipeHtmlResponse(metadata=recipe.metadata, html=html)
@@ -0,0 +1,659 @@
+"""
+Structured-data fast path for recipe extraction.
+
+Most recipe sites embed a schema.org ``Recipe`` as JSON-LD or microdata.
+When they do, the page is fetched locally and the Markdown is rendered
+deterministically in the same layout ``RECIPE_SYSTEM_PROMPT`` asks the LLM
+for; durations and yields are written raw and normalized on save like any
+other recipe. Parsing and rendering are pure functions of the HTML, so they
+can be run against saved pages (see ``backend/tools/extract_structured.py``).
+"""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from html import unescape
+from html.parser import HTMLParser
+import ipaddress
+import json
+import logging
+import re
+import socket
+import unicodedata
+from typing import Iterable, Iterator
+from urllib.parse import urljoin, urlsplit
+
+import anyio.to_thread
+import httpcore
+import httpx
+
+from .config import Settings, get_settings
+from .prompts import CATEGORY_OPTIONS, DIET_FRIENDLY_OPTIONS, MEAL_OPTIONS
+
+logger = logging.getLogger(__name__)
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+_ISO_MINUTES_RE = re.compile(r"^P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:\d+S)?)?$", re.I)
+
+MAX_REDIRECTS = 5
+# Sites answer bots with captchas or stripped pages; look like a browser.
+FETCH_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.5",
+}
+
+# Free-text schema.org values mapped onto the fixed front matter options.
+_CATEGORY_KEYWORDS = {
+    "main": ("main", "entree", "entrée", "dinner"),
+    "side": ("side",),
+    "soup": ("soup", "stew", "chowder", "chili"),
+    "salad": ("salad",),
+    "sauce": ("sauce", "dressing", "gravy", "marinade"),
+    "dessert": ("dessert", "cake", "cookie", "pie", "baking", "sweet"),
+    "condiment": ("condiment", "dip", "spread", "relish", "pickle", "jam"),
+    "snack": ("snack", "appetizer", "starter"),
+    "grill": ("grill", "bbq", "barbecue"),
+}
+_MEAL_KEYWORDS = {
+    "breakfast": ("breakfast",),
+    "brunch": ("brunch",),
+    "lunch": ("lunch",),
+    "dinner": ("dinner", "main course", "main dish", "entree", "entrée"),
+    "snack": ("snack", "appetizer"),
+    "dessert": ("dessert",),
+    "drink": ("drink", "beverage", "cocktail", "smoothie"),
+}
+_SCHEMA_DIETS = {
+    "glutenfreediet": "gluten-free",
+    "vegandiet": "vegan",
+    "vegetariandiet": "vegetarian",
+}
+MAX_TAGS = 10
+# Microdata properties that stay lists even with a single value.
+_LIST_PROPS = ("recipeIngredient", "ingredients", "recipeInstructions")
+
+
+@dataclass
+class InstructionSection:
+    name: str | None
+    steps: list[str] = field(default_factory=list)
+
+
+@dataclass
+class StructuredRecipe:
+    name: str
+    ingredients: list[str]
+    instructions: list[InstructionSection]
+    prep_time: str | None = None
+    cook_time: str | None = None
+    total_time: str | None = None
+    recipe_yield: str | None = None
+    categories: list[str] = field(default_factory=list)
+    cuisines: list[str] = field(default_factory=list)
+    keywords: list[str] = field(default_factory=list)
+    diets: list[str] = field(default_factory=list)
+
+
+@dataclass
+class Classification:
+    meal: list[str] = field(default_factory=list)
+    category: str | None = None
+    ethnicity: list[str] = field(default_factory=list)
+    diet_friendly: list[str] = field(default_factory=list)
+    tags: list[str] = field(default_factory=list)
+
+
+class _PageParser(HTMLParser):
+    """
+    Collect JSON-LD blocks and schema.org microdata items from a page.
+    """
+
+    _VOID = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "wbr"}
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.json_ld: list[str] = []
+        self.items: list[dict] = []
+        self._script: list[str] | None = None
+        self._skip_depth = 0
+        # Open elements: (tag, itemprop names, owning item, new item, text buffer)
+        self._stack: list[tuple[str, list[str], dict | None, dict | None, list[str] | None]] = []
+
+    def _current_item(self) -> dict | None:
+        for _, _, _, item, _ in reversed(self._stack):
+            if item is not None:
+                return item
+        return None
+
+    @staticmethod
+    def _add_prop(item: dict | None, names: list[str], value: object) -> None:
+        if item is None:
+            return
+        for name in names:
+            item["props"].setdefault(name, []).append(value)
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        attributes = {name: value or "" for name, value in attrs}
+        if tag == "script" and attributes.get("type", "").lower() == "application/ld+json":
+            self._script = []
+            return
+        if tag in ("script", "style", "noscript"):
+            self._skip_depth += 1
+            return
+
+        names = attributes.get("itemprop", "").split()
+        owner = self._current_item()
+        if tag in self._VOID:
+            if names:
+                value = attributes.get("content") or attributes.get("href") or attributes.get("src")
+                if value:
+                    self._add_prop(owner, names, value)
+            return
+
+        item = None
+        if "itemscope" in attributes:
+            item = {"type": attributes.get("itemtype", ""), "props": {}, "text": []}
+            if not names:
+                self.items.append(item)
+
+        buffer = None
+        if names:
+            if item is None and (attributes.get("content") or attributes.get("datetime")):
+                self._add_prop(owner, names, attributes.get("content") or attributes["datetime"])
+                names = []
+            else:
+                buffer = []
+        self._stack.append((tag, names, owner, item, buffer))
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "script" and self._script is not None:
+            self.json_ld.append("".join(self._script))
+            self._script = None
+            return
+        if tag in ("script", "style", "noscript"):
+            self._skip_depth = max(0, self._skip_depth - 1)
+            return
+        if not any(open_tag == tag for open_tag, *_ in self._stack):
+            return
+        while self._stack:
+            open_tag, names, owner, item, buffer = self._stack.pop()
+            if names:
+                text = _clean_text("".join(buffer or []))
+                if item is not None:
+                    item["text"] = text
+                    self._add_prop(owner, names, item)
+                elif text:
+                    self._add_prop(owner, names, text)
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data: str) -> None:
+        if self._script is not None:
+            self._script.append(data)
+            return
+        if self._skip_depth:
+            return
+        for _, _, _, _, buffer in self._stack:
+            if buffer is not None:
+                buffer.append(data)
+
+
+def _clean_text(value: object) -> str:
+    text = unescape(_TAG_RE.sub(" ", str(value)))
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def _as_list(value: object) -> list:
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return value
+    return [value]
+
+
+def _first_text(value: object) -> str | None:
+    for item in _as_list(value):
+        if isinstance(item, dict):
+            item = item.get("text") or item.get("name") or item.get("@value")
+        text = _clean_text(item) if item is not None else ""
+        if text:
+            return text
+    return None
+
+
+def _texts(value: object) -> list[str]:
+    texts: list[str] = []
+    for item in _as_list(value):
+        if isinstance(item, dict):
+            item = item.get("name") or item.get("text") or item.get("@id")
+        if isinstance(item, str) and "," in item:
+            texts.extend(_clean_text(part) for part in item.split(","))
+        elif item is not None:
+            texts.append(_clean_text(item))
+    return [text for text in texts if text]
+
+
+def _is_recipe(node: dict) -> bool:
+    return any(str(kind).rsplit("/", 1)[-1] == "Recipe" for kind in _as_list(node.get("@type")))
+
+
+def _walk_json_ld(node: object) -> Iterator[dict]:
+    if isinstance(node, list):
+        for item in node:
+            yield from _walk_json_ld(item)
+    elif isinstance(node, dict):
+        if _is_recipe(node):
+            yield node
+        for key in ("@graph", "mainEntity", "mainEntityOfPage", "about", "hasPart"):
+            if key in node:
+                yield from _walk_json_ld(node[key])
+
+
+def _microdata_to_json_ld(item: dict) -> dict:
+    """
+    Reshape a microdata item into the JSON-LD form the rest of this module
+    reads; nested items keep their own properties plus their full text.
+    """
+    node: dict = {"@type": item["type"].rsplit("/", 1)[-1]}
+    for name, values in item["props"].items():
+        converted = []
+        for value in values:
+            if isinstance(value, dict):
+                nested = _microdata_to_json_ld(value)
+                nested.setdefault("text", value["text"])
+                converted.append(nested)
+            else:
+                converted.append(value)
+        node[name] = converted if len(converted) > 1 or name in _LIST_PROPS else converted[0]
+    return node
+
+
+def _instruction_sections(value: object) -> list[InstructionSection]:
+    sections: list[InstructionSection] = []
+    current = InstructionSection(name=None)
+
+    def add_steps(items: object, section: InstructionSection) -> None:
+        for item in _as_list(items):
+            if isinstance(item, dict):
+                kinds = [str(kind) for kind in _as_list(item.get("@type"))]
+                is_section = any(kind.endswith("HowToSection") for kind in kinds)
+                if is_section and item.get("itemListElement") is not None:
+                    nested = InstructionSection(name=_first_text(item.get("name")))
+                    add_steps(item.get("itemListElement"), nested)
+                    if nested.steps:
+                        sections.append(nested)
+                    continue
+                if item.get("itemListElement") is not None and not item.get("text"):
+                    add_steps(item.get("itemListElement"), section)
+                    continue
+                text = _first_text(item.get("text")) or _first_text(item.get("name"))
+                if text:
+                    section.steps.append(text)
+            elif item is not None:
+                # Plain strings may hold several steps, one per line or <p>.
+                raw = re.sub(r"(?i)<\s*(br|/p|/li)\b[^>]*>", "\n", str(item))
+                for line in raw.splitlines():
+                    text = _clean_text(line)
+                    if text:
+                        section.steps.append(text)
+
+    add_steps(value, current)
+    if current.steps:
+        sections.insert(0, current)
+    return sections
+
+
+def _iso_minutes(value: str | None) -> int | None:
+    match = _ISO_MINUTES_RE.match(value or "")
+    if not match or not any(match.groups()):
+        return None
+    days, hours, minutes = (int(group or 0) for group in match.groups())
+    return days * 24 * 60 + hours * 60 + minutes
+
+
+def _recipe_from_node(node: dict) -> StructuredRecipe | None:
+    name = _first_text(node.get("name")) or _first_text(node.get("headline"))
+    ingredients = [
+        text
+        for text in (_clean_text(item) for item in _as_list(node.get("recipeIngredient") or node.get("ingredients")))
+        if text
+    ]
+    instructions = _instruction_sections(node.get("recipeInstructions"))
+    if not name or not ingredients or not instructions:
+        return None
+
+    prep_time = _first_text(node.get("prepTime"))
+    cook_time = _first_text(node.get("cookTime"))
+    total_time = _first_text(node.get("totalTime"))
+    if not total_time:
+        prep_minutes, cook_minutes = _iso_minutes(prep_time), _iso_minutes(cook_time)
+        if prep_minutes is not None or cook_minutes is not None:
+            total_time = f"PT{(prep_minutes or 0) + (cook_minutes or 0)}M"
+
+    recipe_yield = None
+    for value in _as_list(node.get("recipeYield")):
+        text = _clean_text(value)
+        if text:
+            recipe_yield = text
+            break
+
+    return StructuredRecipe(
+        name=name,
+        ingredients=ingredients,
+        instructions=instructions,
+        prep_time=prep_time,
+        cook_time=cook_time,
+        total_time=total_time,
+        recipe_yield=recipe_yield,
+        categories=_texts(node.get("recipeCategory")),
+        cuisines=_texts(node.get("recipeCuisine")),
+        keywords=_texts(node.get("keywords")),
+        diets=_texts(node.get("suitableForDiet")),
+    )
+
+
+def extract_structured_recipe(html: str) -> StructuredRecipe | None:
+    """
+    The first complete schema.org Recipe on the page (JSON-LD preferred over
+    microdata), or None when the page has none.
+    """
+    parser = _PageParser()
+    parser.feed(html)
+    parser.close()
+
+    nodes: list[dict] = []
+    for block in parser.json_ld:
+        try:
+            data = json.loads(block.strip().rstrip(";"), strict=False)
+        except ValueError:
+            continue
+        nodes.extend(_walk_json_ld(data))
+    nodes.extend(
+        _microdata_to_json_ld(item) for item in parser.items if item["type"].rstrip("/").endswith("schema.org/Recipe")
+    )
+
+    for node in nodes:
+        recipe = _recipe_from_node(node)
+        if recipe is not None:
+            return recipe
+    return None
+
+
+def _matches(values: Iterable[str], keywords: dict[str, tuple[str, ...]]) -> list[str]:
+    lowered = [value.lower() for value in values]
+    return [
+        option
+        for option, words in keywords.items()
+        if any(word in value for value in lowered for word in words)
+    ]
+
+
+def classify(recipe: StructuredRecipe) -> Classification:
+    """
+    Map schema.org categories, cuisines, diets and keywords onto the front
+    matter options without asking the LLM.
+    """
+    categories = _matches(recipe.categories, _CATEGORY_KEYWORDS)
+    meal = _matches(recipe.categories + recipe.keywords, _MEAL_KEYWORDS)
+
+    diet_friendly: list[str] = []
+    for diet in recipe.diets:
+        option = _SCHEMA_DIETS.get(diet.rsplit("/", 1)[-1].lower())
+        if option and option not in diet_friendly:
+            diet_friendly.append(option)
+    for keyword in recipe.keywords:
+        option = keyword.lower().replace(" ", "-")
+        if option in DIET_FRIENDLY_OPTIONS and option not in diet_friendly:
+            diet_friendly.append(option)
+
+    ethnicity: list[str] = []
+    for cuisine in recipe.cuisines:
+        value = re.sub(r"\s*cuisine$", "", cuisine.lower()).strip()
+        if value and value not in ethnicity:
+            ethnicity.append(value)
+
+    tags: list[str] = []
+    for keyword in recipe.keywords:
+        value = keyword.lower()
+        if value and value not in tags and value != recipe.name.lower():
+            tags.append(value)
+
+    return Classification(
+        meal=[option for option in MEAL_OPTIONS if option in meal],
+        category=categories[0] if categories else None,
+        ethnicity=ethnicity,
+        diet_friendly=[option for option in DIET_FRIENDLY_OPTIONS if option in diet_friendly],
+        tags=tags[:MAX_TAGS],
+    )
+
+
+def merge_classification(base: Classification, data: dict) -> Classification:
+    """
+    Overlay classification fields returned by the LLM, keeping only values
+    from the allowed option lists.
+    """
+
+    def strings(value: object) -> list[str]:
+        return [str(item).strip().lower() for item in _as_list(value) if str(item).strip()]
+
+    category = next((item for item in strings(data.get("category")) if item in CATEGORY_OPTIONS), None)
+    return Classification(
+        meal=[item for item in strings(data.get("meal")) if item in MEAL_OPTIONS] or base.meal,
+        category=category or base.category,
+        ethnicity=strings(data.get("ethnicity")) or base.ethnicity,
+        diet_friendly=[item for item in strings(data.get("diet_friendly")) if item in DIET_FRIENDLY_OPTIONS]
+        or base.diet_friendly,
+        tags=strings(data.get("tags"))[:MAX_TAGS] or base.tags,
+    )
+
+
+def summarize(recipe: StructuredRecipe) -> str:
+    """
+    Compact description of the recipe for the classification prompt.
+    """
+    lines = [f"Title: {recipe.name}"]
+    if recipe.categories:
+        lines.append(f"Category: {', '.join(recipe.categories)}")
+    if recipe.cuisines:
+        lines.append(f"Cuisine: {', '.join(recipe.cuisines)}")
+    if recipe.keywords:
+        lines.append(f"Keywords: {', '.join(recipe.keywords)}")
+    lines.append("Ingredients:")
+    lines += [f"- {ingredient}" for ingredient in recipe.ingredients]
+    return "\n".join(lines)
+
+
+def _slugify(value: str) -> str:
+    value = unicodedata.normalize("NFKD", value).encode("ascii", "ignore").decode("ascii")
+    value = value.lower().replace("'", "")
+    return _SLUG_RE.sub("-", value).strip("-") or "untitled"
+
+
+def _scalar(value: str | None) -> str:
+    if not value:
+        return ""
+    return '"' + value.replace('"', "'") + '"'
+
+
+def _inline_list(values: list[str]) -> str:
+    return "[" + ", ".join(value.replace(",", " ").replace("]", ")") for value in values) + "]"
+
+
+def render_markdown(url: str, recipe: StructuredRecipe, classification: Classification) -> str:
+    """
+    Render the recipe in the layout of ``RECIPE_SYSTEM_PROMPT``.
+    """
+    lines = [
+        "---",
+        f"title: {_scalar(recipe.name)}",
+        f"slug: {_slugify(recipe.name)}",
+        f"url: {url}",
+        f"meal: {_inline_list(classification.meal)}",
+        f"category: {classification.category or ''}".rstrip(),
+        f"ethnicity: {_inline_list(classification.ethnicity)}",
+        f"diet_friendly: {_inline_list(classification.diet_friendly)}",
+        f"tags: {_inline_list(classification.tags)}",
+        f"prep_time: {recipe.prep_time or ''}".rstrip(),
+        f"cook_time: {recipe.cook_time or ''}".rstrip(),
+        f"total_time: {recipe.total_time or ''}".rstrip(),
+        f"yield: {_scalar(recipe.recipe_yield)}".rstrip(),
+        "---",
+        "",
+        f"# {recipe.name}",
+        "",
+        "## Ingredients",
+        "",
+    ]
+    lines += [f"- {ingredient}" for ingredient in recipe.ingredients]
+    lines += ["", "## Instructions", ""]
+    for section in recipe.instructions:
+        if section.name:
+            lines += [f"**{section.name}**", ""]
+        lines += [f"{number}. {step}" for number, step in enumerate(section.steps, start=1)]
+        lines.append("")
+    return "\n".join(lines)
+
+
+async def _resolve_public(host: str, port: int) -> list[str]:
+    """
+    The addresses ``host`` resolves to, all of which must be publicly
+    routable so the server cannot be pointed at its own network.
+    """
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except OSError as exc:
+        raise httpcore.ConnectError(f"Could not resolve {host}: {exc}") from exc
+    addresses = list(dict.fromkeys(info[4][0] for info in infos))
+    if not all(ipaddress.ip_address(address).is_global for address in addresses):
+        raise httpcore.ConnectError(f"Not connecting to {host}: it is not a public host")
+    return addresses
+
+
+class _PublicNetworkBackend(httpcore.AsyncNetworkBackend):
+    """
+    Resolves hosts itself and connects to the checked addresses, so a name
+    cannot pass the check and then resolve to an internal address when the
+    connection is made (DNS rebinding). TLS still verifies the hostname.
+    """
+
+    def __init__(self) -> None:
+        self._backend = httpcore.AnyIOBackend()
+
+    async def connect_tcp(
+        self, host, port, timeout=None, local_address=None, socket_options=None
+    ) -> httpcore.AsyncNetworkStream:
+        error: Exception | None = None
+        for address in await _resolve_public(host, port):
+            try:
+                return await self._backend.connect_tcp(
+                    address,
+                    port,
+                    timeout=timeout,
+                    local_address=local_address,
+                    socket_options=socket_options,
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as exc:
+                error = exc
+        raise error or httpcore.ConnectError(f"Could not resolve {host}")
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        raise httpcore.ConnectError("Pages are not fetched over Unix sockets")
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+class _PublicTransport(httpx.AsyncHTTPTransport):
+    """
+    ``AsyncHTTPTransport`` whose connections only go to public addresses.
+    """
+
+    def __init__(self, limits: httpx.Limits) -> None:
+        super().__init__(limits=limits, trust_env=False)
+        # httpx has no public way to set the network backend, so the pool is
+        # replaced; requirements.txt pins httpx to the versions this fits.
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(trust_env=False),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            network_backend=_PublicNetworkBackend(),
+        )
+
+
+# Page fetches get their own pool, apart from the LLM client's.
+_page_client: httpx.AsyncClient | None = None
+
+
+def _build_page_client(settings: Settings) -> httpx.AsyncClient:
+    # No proxies from the environment: a proxy would resolve hosts itself.
+    return httpx.AsyncClient(
+        timeout=settings.page_fetch_timeout_seconds,
+        headers=FETCH_HEADERS,
+        trust_env=False,
+        transport=_PublicTransport(
+            httpx.Limits(max_connections=settings.page_fetch_max_connections)
+        ),
+    )
+
+
+def get_page_client() -> httpx.AsyncClient:
+    """
+    Return the shared page-fetch client, creating it on first use.
+    """
+    global _page_client
+    if _page_client is None or _page_client.is_closed:
+        _page_client = _build_page_client(get_settings())
+    return _page_client
+
+
+async def close_page_client() -> None:
+    global _page_client
+    if _page_client is not None:
+        await _page_client.aclose()
+        _page_client = None
+
+
+async def fetch_page(url: str) -> str | None:
+    """
+    Download an HTML page, following redirects to public hosts only.
+    Returns None for anything that is not a reasonably sized HTML page.
+    """
+    settings = get_settings()
+    client = get_page_client()
+    for _ in range(MAX_REDIRECTS + 1):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            return None
+
+        async with client.stream("GET", url) as response:
+            if response.is_redirect and "location" in response.headers:
+                url = urljoin(url, response.headers["location"])
+                continue
+            content_type = response.headers.get("content-type", "")
+            if response.status_code != 200 or "html" not in content_type:
+                return None
+            body = bytearray()
+            async for chunk in response.aiter_bytes():
+                body.extend(chunk)
+                if len(body) > settings.page_fetch_max_bytes:
+                    return None
+            return body.decode(response.encoding or "utf-8", errors="replace")
+    return None
+
+
+async def fetch_structured_recipe(url: str) -> StructuredRecipe | None:
+    try:
+        html = await fetch_page(url)
+    except httpx.HTTPError as exc:
+        logger.info("Fetching %s for structured data failed: %s", url, exc)
+        return None
+    if html is None:
+        return None
+    # Parsing a large page takes a while; keep it off the event loop.
+    return await anyio.to_thread.run_sync(extract_structured_recipe, html)
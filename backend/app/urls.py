@@ -0,0 +1,74 @@
+"""
+Recipe source URL canonicalization.
+
+Shared links for the same recipe often differ only in tracking parameters,
+fragments, ``www.`` or a trailing slash. ``canonicalize_url`` maps all of
+those to one key so an already-saved recipe can be found by its URL.
+"""
+from __future__ import annotations
+
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only identify where a click came from.
+TRACKING_PARAMS = {
+    "fbclid",
+    "gclid",
+    "dclid",
+    "gbraid",
+    "wbraid",
+    "msclkid",
+    "yclid",
+    "igshid",
+    "mc_cid",
+    "mc_eid",
+    "_ga",
+    "_gl",
+    "ref",
+    "ref_src",
+    "ref_url",
+    "share",
+    "si",
+}
+TRACKING_PREFIXES = ("utm_", "pk_", "hsa_", "_hs")
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalize a recipe URL for duplicate detection.
+
+    http and https are treated as the same page, the host is lowercased with
+    ``www.`` and any default port removed, tracking parameters and the
+    fragment are dropped, the remaining query parameters are sorted and a
+    trailing slash on the path is removed.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    if scheme == "http":
+        scheme = "https"
+
+    host = (parts.hostname or "").lower().rstrip(".")
+    if host.startswith("www."):
+        host = host[4:]
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port is not None and port not in DEFAULT_PORTS.values():
+        host = f"{host}:{port}"
+
+    path = parts.path.rstrip("/")
+    query = urlencode(
+        sorted(
+            (name, value)
+            for name, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not _is_tracking_param(name)
+        )
+    )
+    return urlunsplit((scheme, host, path, query, ""))
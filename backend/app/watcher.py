@@ -0,0 +1,87 @@
+"""
+Background watcher that keeps the recipe index and caches in sync with edits
+made directly in the recipes directory (Obsidian, sync tools, git checkouts).
+
+Change notifications come from ``watchfiles`` (inotify on Linux). Bursts are
+debounced into a single batch and only the affected slugs are re-indexed.
+When ``watchfiles`` is unavailable, inotify cannot be set up, or polling is
+forced, the watcher falls back to periodic stat-only reconciliation.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from pathlib import Path
+
+from . import storage
+from .config import get_settings
+
+try:
+    import watchfiles
+except ImportError:  # pragma: no cover - optional dependency
+    watchfiles = None
+
+logger = logging.getLogger(__name__)
+
+
+def _is_recipe_file(_: object, path: str) -> bool:
+    return path.endswith(".md")
+
+
+class RecipeWatcher:
+    def __init__(self, output_dir: Path) -> None:
+        self.settings = get_settings()
+        self.output_dir = output_dir
+        self._stop = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="recipe-watcher")
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+    async def _run(self) -> None:
+        if watchfiles is not None and not self.settings.watch_force_polling:
+            try:
+                await self._watch_events()
+                return
+            except Exception:
+                logger.exception("Recipe watcher could not use file events; polling instead")
+        await self._poll()
+
+    async def _watch_events(self) -> None:
+        async for changes in watchfiles.awatch(
+            self.output_dir,
+            watch_filter=_is_recipe_file,
+            debounce=self.settings.watch_debounce_ms,
+            recursive=False,
+            stop_event=self._stop,
+        ):
+            slugs = {Path(path).stem for _, path in changes}
+            try:
+                await asyncio.to_thread(storage.refresh_recipes, slugs)
+            except Exception:
+                # Go through the batch one recipe at a time so a single
+                # failing file does not keep the others out of the index.
+                for slug in sorted(slugs):
+                    try:
+                        await asyncio.to_thread(storage.refresh_recipes, [slug])
+                    except Exception:
+                        logger.exception("Failed to re-index recipe %s", slug)
+
+    async def _poll(self) -> None:
+        interval = self.settings.watch_poll_interval_ms / 1000
+        while not self._stop.is_set():
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=interval)
+                return
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await asyncio.to_thread(storage.reconcile_recipe_index)
+            except Exception:
+                logger.exception("Failed to reconcile recipe index")
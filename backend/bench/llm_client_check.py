@@ -0,0 +1,101 @@
+"""
+Check that LLM calls reuse pooled connections.
+
+Starts the mock Responses API server (``backend.bench.mock_llm``) in-process
+on a free port and makes the same recipe generations twice: once with a new
+``httpx.AsyncClient`` per call, as scrapes used to, and once through the
+shared client from ``llm.get_http_client``. The server records the client
+address of every request; each distinct address is one TCP connection.
+
+Run from the repository root with the usual environment (SECRET_KEY, ...)
+and the rate-limit budgets lifted, so the scheduler does not pace the calls:
+
+    LLM_REQUESTS_PER_MINUTE=0 LLM_TOKENS_PER_MINUTE=0 \\
+        python -m backend.bench.llm_client_check [--calls 100] [--concurrency 10]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+import httpx
+
+from backend.app import llm
+from backend.app.config import get_settings
+from backend.bench.mock_llm import MockConfig, create_app, start_server
+
+
+class ConnectionCounter:
+    """
+    ASGI wrapper recording the client address of every request.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+        self.peers: set[tuple[str, int]] = set()
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http" and scope.get("client"):
+            self.peers.add(tuple(scope["client"]))
+        await self.app(scope, receive, send)
+
+
+async def run_calls(
+    calls: int, concurrency: int, generate: Callable[[str], Awaitable[str]]
+) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(index: int) -> None:
+        async with semaphore:
+            await generate(f"https://example.com/recipes/check-{index}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(calls)))
+    return time.perf_counter() - start
+
+
+async def check(args: argparse.Namespace) -> None:
+    counter = ConnectionCounter(
+        create_app(MockConfig(latency_ms=args.latency_ms, latency_dist="fixed"))
+    )
+    server, task, base_url = await start_server(counter)
+
+    async def per_call_client(url: str) -> str:
+        async with httpx.AsyncClient(timeout=get_settings().llm_timeout_seconds) as client:
+            llm_client = llm.LLMClient(http_client=client, base_url=base_url)
+            return await llm_client.generate_recipe_markdown(url)
+
+    async def shared_client(url: str) -> str:
+        return await llm.LLMClient(base_url=base_url).generate_recipe_markdown(url)
+
+    connections = {}
+    try:
+        print(f"{'client':>16}  {'calls':>6}  {'connections':>11}  {'total (s)':>9}")
+        clients = (("per-call client", per_call_client), ("shared client", shared_client))
+        for name, generate in clients:
+            counter.peers.clear()
+            elapsed = await run_calls(args.calls, args.concurrency, generate)
+            connections[name] = len(counter.peers)
+            print(f"{name:>16}  {args.calls:>6}  {connections[name]:>11}  {elapsed:>9.2f}")
+    finally:
+        await llm.close_http_client()
+        server.should_exit = True
+        await task
+
+    # The shared pool never needs more connections than calls in flight.
+    assert connections["shared client"] <= args.concurrency, connections
+    assert connections["per-call client"] == args.calls, connections
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=20, help="mock response time")
+    asyncio.run(check(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
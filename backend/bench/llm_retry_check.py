@@ -0,0 +1,104 @@
+"""
+Check that LLM calls are retried through injected 429s.
+
+Starts the mock Responses API server (``backend.bench.mock_llm``) in-process
+with a share of requests failed as ``429`` with ``Retry-After``, the same as
+``--error-status 429``, and makes recipe generations through ``LLMClient``
+and the scheduler. Every call must succeed, each 429 must be followed by
+exactly one retry, and no retry may be sent before its ``Retry-After``.
+
+Run from the repository root with the usual environment (SECRET_KEY, ...)
+and the rate-limit budgets lifted, so only the 429s pace the calls:
+
+    LLM_REQUESTS_PER_MINUTE=0 LLM_TOKENS_PER_MINUTE=0 \\
+        python -m backend.bench.llm_retry_check [--calls 40] [--error-rate 0.25]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import defaultdict
+import time
+
+import httpx
+
+from backend.app import llm
+from backend.app.config import get_settings
+from backend.bench.mock_llm import MockConfig, create_app, start_server
+
+
+async def check(args: argparse.Namespace) -> None:
+    config = MockConfig(
+        latency_ms=args.latency_ms,
+        latency_dist="fixed",
+        error_rate=args.error_rate,
+        error_statuses=[429],
+        retry_after=args.retry_after,
+    )
+    server, task, base_url = await start_server(create_app(config))
+
+    # Attempts per call, as (sent at, status); a call's requests share a body.
+    attempts: dict[bytes, list[list]] = defaultdict(list)
+
+    async def on_request(request: httpx.Request) -> None:
+        attempts[request.content].append([time.monotonic(), None])
+
+    async def on_response(response: httpx.Response) -> None:
+        attempts[response.request.content][-1][1] = response.status_code
+
+    client = httpx.AsyncClient(
+        timeout=get_settings().llm_timeout_seconds,
+        event_hooks={"request": [on_request], "response": [on_response]},
+    )
+    llm_client = llm.LLMClient(http_client=client, base_url=base_url)
+
+    async def generate(index: int) -> bool:
+        try:
+            await llm_client.generate_recipe_markdown(f"https://example.com/recipes/retry-{index}")
+        except httpx.HTTPStatusError:
+            return False
+        return True
+
+    start = time.perf_counter()
+    try:
+        results = await asyncio.gather(*(generate(index) for index in range(args.calls)))
+    finally:
+        elapsed = time.perf_counter() - start
+        await client.aclose()
+        server.should_exit = True
+        await task
+
+    rejected = retries = 0
+    waits = []
+    for sent in attempts.values():
+        retries += len(sent) - 1
+        for (sent_at, status), (retried_at, _) in zip(sent, sent[1:]):
+            assert status == 429, status
+            rejected += 1
+            waits.append(retried_at - sent_at)
+
+    print(
+        f"{'calls':>6}  {'succeeded':>9}  {'429s':>5}  {'retries':>7}  "
+        f"{'min wait (s)':>12}  {'total (s)':>9}"
+    )
+    print(
+        f"{args.calls:>6}  {sum(results):>9}  {rejected:>5}  {retries:>7}  "
+        f"{min(waits, default=0):>12.2f}  {elapsed:>9.2f}"
+    )
+
+    assert all(results), "a call ran out of retries; lower --error-rate or raise LLM_MAX_RETRIES"
+    assert retries == rejected
+    assert all(wait >= args.retry_after for wait in waits), "a retry ignored Retry-After"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=40)
+    parser.add_argument("--error-rate", type=float, default=0.25, help="share of requests to fail")
+    parser.add_argument("--retry-after", type=float, default=0.5, help="Retry-After of the 429s")
+    parser.add_argument("--latency-ms", type=float, default=20, help="mock response time")
+    asyncio.run(check(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+Load-test a running backend through its HTTP API.
+
+Drives ``POST /api/recipes`` (each request a new URL, followed until its
+scrape job finishes), ``GET /api/recipes`` and ``POST /api/auth/login`` at a
+fixed concurrency, then reports throughput and p50/p95/p99 latency per
+operation. Point the backend at the mock LLM server
+(``backend.bench.mock_llm``) so scrapes do not reach the real API:
+
+    python -m backend.bench.load_test --base-url http://127.0.0.1:8000 \\
+        --username admin --password secret --scenario create list \\
+        --concurrency 20 --requests 200
+
+``--scenario login list`` measures sign-in throughput and how much the
+bcrypt work slows down other requests meanwhile.
+
+Needs only a user account on the target server, not its settings.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import dataclass, field
+import itertools
+import json
+import math
+import time
+import uuid
+
+import httpx
+
+JOB_POLL_SECONDS = 0.2
+
+
+@dataclass
+class Samples:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+
+    def add(self, seconds: float, ok: bool) -> None:
+        if ok:
+            self.latencies.append(seconds)
+        else:
+            self.errors += 1
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile of already sorted values.
+    """
+    if not values:
+        return math.nan
+    rank = max(1, math.ceil(fraction * len(values)))
+    return values[rank - 1]
+
+
+async def _wait_for_job(client: httpx.AsyncClient, job: dict, timeout: float) -> bool:
+    deadline = time.perf_counter() + timeout
+    while job["status"] not in ("succeeded", "failed"):
+        if time.perf_counter() > deadline:
+            return False
+        await asyncio.sleep(JOB_POLL_SECONDS)
+        response = await client.get(f"/api/jobs/{job['id']}")
+        if response.status_code != 200:
+            return False
+        job = response.json()
+    return job["status"] == "succeeded"
+
+
+async def create_once(client: httpx.AsyncClient, results: dict[str, Samples], args, n: int) -> None:
+    url = f"{args.url_prefix.rstrip('/')}/{args.run_id}-{n}"
+    start = time.perf_counter()
+    try:
+        response = await client.post("/api/recipes", json={"url": url})
+    except httpx.HTTPError:
+        results["POST /api/recipes"].add(0, ok=False)
+        return
+    accepted = response.status_code in (200, 202)
+    results["POST /api/recipes"].add(time.perf_counter() - start, ok=accepted)
+    if not accepted or args.no_wait:
+        return
+    ok = await _wait_for_job(client, response.json(), args.job_timeout)
+    results["create (job finished)"].add(time.perf_counter() - start, ok=ok)
+
+
+async def list_once(client: httpx.AsyncClient, results: dict[str, Samples], args, n: int) -> None:
+    start = time.perf_counter()
+    try:
+        response = await client.get("/api/recipes", params={"limit": args.list_limit})
+    except httpx.HTTPError:
+        results["GET /api/recipes"].add(0, ok=False)
+        return
+    results["GET /api/recipes"].add(time.perf_counter() - start, ok=response.status_code == 200)
+
+
+async def login_once(client: httpx.AsyncClient, results: dict[str, Samples], args, n: int) -> None:
+    start = time.perf_counter()
+    try:
+        response = await client.post(
+            "/api/auth/login", json={"username": args.username, "password": args.password}
+        )
+    except httpx.HTTPError:
+        results["POST /api/auth/login"].add(0, ok=False)
+        return
+    results["POST /api/auth/login"].add(time.perf_counter() - start, ok=response.status_code == 200)
+
+
+SCENARIOS = {"create": create_once, "list": list_once, "login": login_once}
+
+
+async def run(args) -> tuple[dict[str, Samples], float]:
+    results: dict[str, Samples] = {}
+    for name in (
+        "POST /api/recipes",
+        "create (job finished)",
+        "GET /api/recipes",
+        "POST /api/auth/login",
+    ):
+        results[name] = Samples()
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.job_timeout) as client:
+        response = await client.post(
+            "/api/auth/login", json={"username": args.username, "password": args.password}
+        )
+        response.raise_for_status()
+
+        # Requests alternate between the chosen scenarios.
+        counter = itertools.count()
+        deadline = time.perf_counter() + args.duration if args.duration else None
+
+        async def worker() -> None:
+            while True:
+                n = next(counter)
+                if deadline is None and n >= args.requests:
+                    return
+                if deadline is not None and time.perf_counter() >= deadline:
+                    return
+                scenario = args.scenario[n % len(args.scenario)]
+                await SCENARIOS[scenario](client, results, args, n)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+    results = {name: samples for name, samples in results.items() if samples.latencies or samples.errors}
+    return results, elapsed
+
+
+def report(results: dict[str, Samples], elapsed: float) -> list[dict]:
+    rows = []
+    for name, samples in results.items():
+        latencies = sorted(samples.latencies)
+        rows.append(
+            {
+                "operation": name,
+                "ok": len(latencies),
+                "errors": samples.errors,
+                "throughput_per_s": len(latencies) / elapsed,
+                "p50_ms": percentile(latencies, 0.50) * 1000,
+                "p95_ms": percentile(latencies, 0.95) * 1000,
+                "p99_ms": percentile(latencies, 0.99) * 1000,
+                "max_ms": (latencies[-1] if latencies else math.nan) * 1000,
+            }
+        )
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--scenario", nargs="+", choices=sorted(SCENARIOS), default=["create", "list"])
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=100, help="total requests (all scenarios)")
+    parser.add_argument("--duration", type=float, help="run for this many seconds instead")
+    parser.add_argument("--list-limit", type=int, default=50)
+    parser.add_argument(
+        "--url-prefix",
+        default="https://bench.invalid/recipes",
+        help="recipe URLs to create; a .invalid host skips the structured-data page fetch",
+    )
+    parser.add_argument("--no-wait", action="store_true", help="do not follow scrape jobs")
+    parser.add_argument("--job-timeout", type=float, default=300)
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+    # Fresh URLs per run so creates are not answered from already-saved recipes.
+    args.run_id = uuid.uuid4().hex[:8]
+
+    results, elapsed = asyncio.run(run(args))
+    rows = report(results, elapsed)
+    if args.json:
+        summary = {"elapsed_s": elapsed, "concurrency": args.concurrency, "results": rows}
+        print(json.dumps(summary, indent=2))
+        return
+
+    print(f"{elapsed:.1f}s at concurrency {args.concurrency}")
+    print(
+        f"{'operation':<24}  {'ok':>6}  {'errors':>6}  {'req/s':>8}  "
+        f"{'p50 ms':>9}  {'p95 ms':>9}  {'p99 ms':>9}  {'max ms':>9}"
+    )
+    for row in rows:
+        print(
+            f"{row['operation']:<24}  {row['ok']:>6}  {row['errors']:>6}  "
+            f"{row['throughput_per_s']:>8.2f}  {row['p50_ms']:>9.1f}  {row['p95_ms']:>9.1f}  "
+            f"{row['p99_ms']:>9.1f}  {row['max_ms']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""
+Local stand-in for the OpenAI Responses API, for benchmarks and load tests.
+
+Answers ``POST /v1/responses`` like the real endpoint, streamed or not, after
+a configurable latency, with canned recipe Markdown whose ``slug``/``url``
+follow the requested URL (so every URL becomes its own recipe).
+Classification requests get a canned JSON object. A share of requests can
+be failed with configurable statuses, 429s carrying ``Retry-After``.
+
+    python -m backend.bench.mock_llm --port 8100 --latency-ms 3000 \\
+        --latency-dist lognormal --error-rate 0.05 --error-status 429 503
+
+Then run the backend against it:
+
+    OPENAI_BASE_URL=http://127.0.0.1:8100/v1 OPENAI_API_KEY=mock ...
+
+It does not need any of the backend's settings.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import dataclass, field
+import hashlib
+import itertools
+import json
+from pathlib import Path
+import random
+import re
+from typing import AsyncIterator
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+import uvicorn
+
+URL_RE = re.compile(r"https?://\S+")
+SLUG_LINE_RE = re.compile(r"^slug:.*$", re.M)
+URL_LINE_RE = re.compile(r"^url:.*$", re.M)
+
+DEFAULT_MARKDOWN = """---
+title: "Bench Recipe {key}"
+slug: bench-recipe-{key}
+url: {url}
+meal: [dinner]
+category: main
+ethnicity: [italian]
+diet_friendly: [vegetarian]
+tags: [pasta, weeknight]
+prep_time: PT10M
+cook_time: PT20M
+total_time: PT30M
+yield: 4
+---
+
+# Bench Recipe {key}
+
+## Ingredients
+
+- 400 g spaghetti
+- 3 tbsp olive oil
+- 4 cloves garlic, thinly sliced
+- 1/2 tsp chili flakes
+- 30 g parmesan, grated
+- 1 handful parsley, chopped
+
+## Instructions
+
+1. Cook the spaghetti in well-salted boiling water until al dente.
+2. Meanwhile warm the olive oil with the garlic and chili flakes until the garlic is golden.
+3. Toss the drained pasta with the oil and a splash of pasta water.
+4. Finish with parmesan and parsley and serve at once.
+
+## Notes
+
+Generated by the mock LLM server.
+"""
+
+CLASSIFICATION = {
+    "meal": ["dinner"],
+    "category": "main",
+    "ethnicity": ["italian"],
+    "diet_friendly": ["vegetarian"],
+    "tags": ["pasta", "weeknight"],
+}
+
+
+@dataclass
+class MockConfig:
+    latency_ms: float = 2000
+    latency_dist: str = "lognormal"
+    latency_spread: float = 0.5
+    error_rate: float = 0.0
+    error_statuses: list[int] = field(default_factory=lambda: [503])
+    retry_after: float = 1
+    stream_chunks: int = 20
+    markdown: list[str] = field(default_factory=lambda: [DEFAULT_MARKDOWN])
+
+
+def sample_latency(config: MockConfig) -> float:
+    """
+    Seconds to take for one response: ``latency_ms`` exactly (fixed), spread
+    evenly by +/- ``latency_spread`` of it (uniform), or as its median with
+    ``latency_spread`` as sigma (lognormal, long right tail).
+    """
+    median = config.latency_ms / 1000
+    if config.latency_dist == "fixed":
+        return median
+    if config.latency_dist == "uniform":
+        spread = median * config.latency_spread
+        return max(0.0, random.uniform(median - spread, median + spread))
+    return median * random.lognormvariate(0, config.latency_spread)
+
+
+def render_markdown(template: str, url: str) -> str:
+    key = hashlib.sha1(url.encode()).hexdigest()[:10]
+    if "{key}" in template:
+        return template.replace("{key}", key).replace("{url}", url)
+    # A real recipe file: give it this URL and a slug of its own.
+    markdown = SLUG_LINE_RE.sub(lambda m: f"{m.group(0)}-{key}", template, count=1)
+    return URL_LINE_RE.sub(f"url: {url}", markdown, count=1)
+
+
+def _response_object(text: str, body: dict) -> dict:
+    input_tokens = (len(body.get("instructions") or "") + len(str(body.get("input") or ""))) // 4
+    output_tokens = len(text) // 4
+    return {
+        "id": f"resp_mock_{random.getrandbits(48):012x}",
+        "object": "response",
+        "status": "completed",
+        "model": body.get("model"),
+        "output": [
+            {
+                "type": "message",
+                "role": "assistant",
+                "content": [{"type": "output_text", "text": text}],
+            }
+        ],
+        "usage": {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        },
+    }
+
+
+def _sse(payload: dict) -> str:
+    return f"event: {payload['type']}\ndata: {json.dumps(payload)}\n\n"
+
+
+async def _stream(text: str, body: dict, latency: float, chunks: int) -> AsyncIterator[str]:
+    size = max(1, -(-len(text) // chunks))
+    pieces = [text[i : i + size] for i in range(0, len(text), size)]
+    yield _sse({"type": "response.created", "response": {"status": "in_progress"}})
+    for piece in pieces:
+        await asyncio.sleep(latency / len(pieces))
+        yield _sse({"type": "response.output_text.delta", "delta": piece})
+    yield _sse({"type": "response.completed", "response": _response_object(text, body)})
+
+
+def create_app(config: MockConfig) -> FastAPI:
+    app = FastAPI(title="Mock Responses API")
+    templates = itertools.cycle(config.markdown)
+    stats = {"requests": 0, "errors": 0}
+
+    @app.post("/v1/responses")
+    async def responses(request: Request) -> Response:
+        stats["requests"] += 1
+        body = await request.json()
+
+        if random.random() < config.error_rate:
+            stats["errors"] += 1
+            status_code = random.choice(config.error_statuses)
+            headers = {"Retry-After": f"{config.retry_after:g}"} if status_code == 429 else None
+            return JSONResponse(
+                {"error": {"message": "Injected failure", "type": "mock_error"}},
+                status_code=status_code,
+                headers=headers,
+            )
+
+        latency = sample_latency(config)
+        if ((body.get("text") or {}).get("format") or {}).get("type") == "json_object":
+            text = json.dumps(CLASSIFICATION)
+            # Short completions without web search come back much faster.
+            latency /= 10
+        else:
+            match = URL_RE.search(str(body.get("input") or ""))
+            text = render_markdown(next(templates), match.group(0) if match else "https://example.com/")
+
+        if body.get("stream"):
+            return StreamingResponse(
+                _stream(text, body, latency, config.stream_chunks),
+                media_type="text/event-stream",
+            )
+        await asyncio.sleep(latency)
+        return JSONResponse(_response_object(text, body))
+
+    @app.get("/stats")
+    async def mock_stats() -> dict:
+        return stats
+
+    return app
+
+
+async def start_server(app) -> tuple[uvicorn.Server, asyncio.Task, str]:
+    """
+    Serve ``app`` on a free local port from the running event loop, for
+    checks that drive the backend code in-process. Returns the server, its
+    task and the base URL to use as ``OPENAI_BASE_URL``; set
+    ``server.should_exit`` and await the task to stop it.
+    """
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning", lifespan="off")
+    )
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    host, port = server.servers[0].sockets[0].getsockname()[:2]
+    return server, task, f"http://{host}:{port}/v1"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=2000, help="median response time")
+    parser.add_argument("--latency-dist", choices=["fixed", "uniform", "lognormal"], default="lognormal")
+    parser.add_argument(
+        "--latency-spread",
+        type=float,
+        default=0.5,
+        help="uniform: +/- fraction of the median; lognormal: sigma",
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests to fail")
+    parser.add_argument("--error-status", type=int, nargs="+", default=[503])
+    parser.add_argument("--retry-after", type=float, default=1, help="Retry-After of injected 429s")
+    parser.add_argument("--stream-chunks", type=int, default=20)
+    parser.add_argument(
+        "--markdown-dir",
+        type=Path,
+        help="serve these *.md files in turn instead of the built-in recipe",
+    )
+    args = parser.parse_args()
+
+    markdown = [DEFAULT_MARKDOWN]
+    if args.markdown_dir is not None:
+        markdown = [path.read_text(encoding="utf-8") for path in sorted(args.markdown_dir.glob("*.md"))]
+        if not markdown:
+            parser.error(f"no *.md files in {args.markdown_dir}")
+
+    config = MockConfig(
+        latency_ms=args.latency_ms,
+        latency_dist=args.latency_dist,
+        latency_spread=args.latency_spread,
+        error_rate=args.error_rate,
+        error_statuses=args.error_status,
+        retry_after=args.retry_after,
+        stream_chunks=args.stream_chunks,
+        markdown=markdown,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+"""
+Benchmark the Markdown normalization pipeline on large recipe bodies.
+
+Compares the parse-once ``RecipeDocument`` pipeline used by
+``save_recipe_markdown``/``update_recipe`` with the previous string pipeline,
+where every step re-split, rescanned and re-joined the whole document.
+
+Run from the repository root with the usual environment (SECRET_KEY, ...):
+
+    python -m backend.bench.normalize_bench [--lines 20000] [--repeat 20]
+"""
+from __future__ import annotations
+
+import argparse
+from datetime import datetime
+import timeit
+
+from backend.app import storage
+from backend.app.storage import (
+    _DURATION_LINE_RE,
+    _FRONTMATTER_LINE_RE,
+    _FRONTMATTER_LIST_ITEM_RE,
+    _RECIPE_WORD_RE,
+    _SLUG_LINE_RE,
+    _TITLE_LINE_RE,
+    _YIELD_LINE_RE,
+    _normalize_iso_duration_hours_minutes,
+    _normalize_yield_to_number,
+    _parse_frontmatter_scalar,
+    _strip_recipe_from_slug,
+    _strip_recipe_word,
+)
+
+FRONTMATTER = """---
+title: "Slow-Roasted Miso Salmon Recipe"
+slug: slow-roasted-miso-salmon-recipe
+url: https://example.com/miso-salmon
+meal: [dinner]
+category: main
+ethnicity: [japanese]
+diet_friendly: [pescatarian]
+tags:
+  - fish
+  - weeknight
+prep_time: PT15M
+cook_time: PT75M
+total_time: PT90M
+yield: 4 servings
+---
+
+# Slow-Roasted Miso Salmon Recipe
+"""
+
+
+def build_markdown(body_lines: int) -> str:
+    body = ["## Ingredients", ""]
+    body += [f"- {i} tbsp white miso, divided" for i in range(body_lines // 2)]
+    body += ["", "## Instructions", ""]
+    body += [f"{i}. Brush the salmon with miso and roast." for i in range(body_lines // 2)]
+    return FRONTMATTER + "\n".join(body) + "\n"
+
+
+# The string pipeline as it was before ``RecipeDocument``, copied verbatim
+# from storage.py. The helpers it calls are unchanged and imported above.
+
+
+def _parse_frontmatter(markdown: str) -> dict[str, object]:
+    lines = markdown.splitlines()
+    if not lines or lines[0].strip() != "---":
+        return {}
+
+    frontmatter: dict[str, object] = {}
+    list_key: str | None = None
+    list_indent = 0
+
+    for line in lines[1:]:
+        if line.strip() == "---":
+            break
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+
+        list_match = _FRONTMATTER_LIST_ITEM_RE.match(line)
+        if list_key and list_match:
+            indent = len(list_match.group(1))
+            if indent > list_indent:
+                raw_value = list_match.group(2).strip()
+                value, _ = _parse_frontmatter_scalar(raw_value)
+                if value:
+                    frontmatter.setdefault(list_key, []).append(value)
+                continue
+            list_key = None
+
+        match = _FRONTMATTER_LINE_RE.match(line)
+        if not match:
+            continue
+
+        indent, key, raw_value = match.groups()
+        raw_value = raw_value.strip()
+        if raw_value == "":
+            list_key = key
+            list_indent = len(indent)
+            frontmatter.setdefault(key, [])
+            continue
+
+        list_key = None
+
+        if raw_value.startswith("[") and raw_value.endswith("]"):
+            items: list[str] = []
+            for piece in raw_value[1:-1].split(","):
+                piece = piece.strip()
+                if not piece:
+                    continue
+                value, _ = _parse_frontmatter_scalar(piece)
+                if value:
+                    items.append(value)
+            frontmatter[key] = items
+            continue
+
+        value, _ = _parse_frontmatter_scalar(raw_value)
+        frontmatter[key] = value
+
+    return frontmatter
+
+
+def _normalize_markdown_title_and_slug(markdown: str) -> str:
+    lines = markdown.splitlines()
+    if not lines or lines[0].strip() != "---":
+        return markdown
+
+    end_idx = None
+    for i in range(1, len(lines)):
+        if lines[i].strip() == "---":
+            end_idx = i
+            break
+    if end_idx is None:
+        return markdown
+
+    changed = False
+    frontmatter = lines[1:end_idx]
+    normalized_frontmatter: list[str] = []
+    original_title: str | None = None
+    cleaned_title: str | None = None
+
+    for line in frontmatter:
+        title_match = _TITLE_LINE_RE.match(line)
+        if title_match:
+            indent, raw_value = title_match.groups()
+            value, quote = _parse_frontmatter_scalar(raw_value)
+            original_title = value
+            if value:
+                cleaned_title = _strip_recipe_word(value) or "Untitled"
+            else:
+                cleaned_title = value
+            if cleaned_title != value:
+                changed = True
+            output_value = cleaned_title
+            if quote is not None and output_value != "":
+                output_value = f"{quote}{output_value}{quote}"
+            normalized_frontmatter.append(f"{indent}title: {output_value}")
+            continue
+
+        slug_match = _SLUG_LINE_RE.match(line)
+        if slug_match:
+            indent, raw_value = slug_match.groups()
+            value, quote = _parse_frontmatter_scalar(raw_value)
+            cleaned_slug = _strip_recipe_from_slug(value) if value else value
+            if value and not cleaned_slug:
+                cleaned_slug = f"untitled-{int(datetime.utcnow().timestamp())}"
+            if cleaned_slug != value:
+                changed = True
+            output_value = cleaned_slug
+            if quote is not None and output_value != "":
+                output_value = f"{quote}{output_value}{quote}"
+            normalized_frontmatter.append(f"{indent}slug: {output_value}")
+            continue
+
+        normalized_frontmatter.append(line)
+
+    if not changed and not cleaned_title:
+        return markdown
+
+    rebuilt_lines = [lines[0], *normalized_frontmatter, lines[end_idx], *lines[end_idx + 1 :]]
+
+    if cleaned_title:
+        for i in range(end_idx + 1, len(rebuilt_lines)):
+            if rebuilt_lines[i].startswith("# "):
+                heading_text = rebuilt_lines[i][2:].strip()
+                if original_title and heading_text.lower() == original_title.lower():
+                    rebuilt_lines[i] = f"# {cleaned_title}"
+                elif _RECIPE_WORD_RE.search(heading_text):
+                    rebuilt_lines[i] = f"# {cleaned_title}"
+                break
+
+    rebuilt = "\n".join(rebuilt_lines)
+    if markdown.endswith("\n"):
+        rebuilt += "\n"
+    return rebuilt
+
+
+def _normalize_markdown_durations(markdown: str) -> str:
+    lines = markdown.splitlines()
+    if not lines or lines[0].strip() != "---":
+        return markdown
+
+    end_idx = None
+    for i in range(1, len(lines)):
+        if lines[i].strip() == "---":
+            end_idx = i
+            break
+    if end_idx is None:
+        return markdown
+
+    changed = False
+    frontmatter = lines[1:end_idx]
+    normalized_frontmatter: list[str] = []
+
+    for line in frontmatter:
+        match = _DURATION_LINE_RE.match(line)
+        if not match:
+            yield_match = _YIELD_LINE_RE.match(line)
+            if not yield_match:
+                normalized_frontmatter.append(line)
+                continue
+
+            indent, raw_value = yield_match.groups()
+            raw_value = raw_value.strip()
+
+            # Preserve empty values as-is.
+            if not raw_value:
+                normalized_frontmatter.append(line)
+                continue
+
+            quote = None
+            if (raw_value.startswith('"') and raw_value.endswith('"')) or (
+                raw_value.startswith("'") and raw_value.endswith("'")
+            ):
+                quote = raw_value[0]
+                raw_value = raw_value[1:-1]
+
+            normalized_value = _normalize_yield_to_number(raw_value)
+            if normalized_value != raw_value:
+                changed = True
+
+            # Prefer quoting yields for consistency if we parsed a number.
+            if quote is None and normalized_value.isdigit():
+                quote = '"'
+
+            if quote is not None:
+                normalized_value = f"{quote}{normalized_value}{quote}"
+
+            normalized_frontmatter.append(f"{indent}yield: {normalized_value}")
+            continue
+
+        indent, key, raw_value = match.groups()
+        raw_value = raw_value.strip()
+
+        # Preserve empty values as-is.
+        if not raw_value:
+            normalized_frontmatter.append(line)
+            continue
+
+        quote = None
+        if (raw_value.startswith('"') and raw_value.endswith('"')) or (
+            raw_value.startswith("'") and raw_value.endswith("'")
+        ):
+            quote = raw_value[0]
+            raw_value = raw_value[1:-1]
+
+        normalized_value = _normalize_iso_duration_hours_minutes(raw_value)
+        if normalized_value != raw_value:
+            changed = True
+
+        if quote is not None:
+            normalized_value = f"{quote}{normalized_value}{quote}"
+
+        normalized_frontmatter.append(f"{indent}{key}: {normalized_value}")
+
+    if not changed:
+        return markdown
+
+    rebuilt = "\n".join(
+        [lines[0], *normalized_frontmatter, lines[end_idx], *lines[end_idx + 1 :]]
+    )
+    if markdown.endswith("\n"):
+        rebuilt += "\n"
+    return rebuilt
+
+
+def _slug_from_markdown(markdown: str) -> str:
+    for line in markdown.splitlines():
+        if line.startswith("slug:"):
+            value = line.split(":", 1)[1].strip().strip('"').strip("'")
+            if value:
+                return value
+    # Fallback slug if not found in YAML (will be refined later).
+    return f"untitled-{int(datetime.utcnow().timestamp())}"
+
+
+def string_pipeline(markdown: str) -> tuple[str, str, dict[str, object]]:
+    """
+    The previous behaviour of ``save_recipe_markdown``: each step takes text
+    and returns text, and the slug and metadata are read from the result.
+    """
+    markdown = _normalize_markdown_durations(markdown)
+    markdown = _normalize_markdown_title_and_slug(markdown)
+    slug = _slug_from_markdown(markdown)
+    return markdown, slug, _parse_frontmatter(markdown)
+
+
+def document_pipeline(markdown: str) -> tuple[str, str, dict[str, object]]:
+    doc = storage.RecipeDocument(markdown)
+    storage._normalize_document(doc)
+    return doc.to_markdown(), storage._slug_from_document(doc), doc.frontmatter
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lines", type=int, nargs="+", default=[100, 2000, 20000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'body lines':>10}  {'string (ms)':>12}  {'document (ms)':>14}  {'speedup':>8}")
+    for body_lines in args.lines:
+        markdown = build_markdown(body_lines)
+        assert string_pipeline(markdown) == document_pipeline(markdown)
+
+        before = min(timeit.repeat(lambda: string_pipeline(markdown), number=1, repeat=args.repeat))
+        after = min(timeit.repeat(lambda: document_pipeline(markdown), number=1, repeat=args.repeat))
+        print(
+            f"{body_lines:>10}  {before * 1000:>12.3f}  {after * 1000:>14.3f}  {before / after:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Check the structured-data extractor against saved recipe pages.
+
+Each ``fixtures/structured/<name>.html`` is run through
+``structured.extract_structured_recipe``, ``classify`` and ``render_markdown``
+(no network or model calls) and compared with ``<name>.md`` next to it: the
+front matter field by field, as ``storage`` parses it, then the Markdown as
+a whole. A page without a ``.md`` must yield no recipe, so scrapes of it fall
+back to the LLM.
+
+Run from the repository root with the usual environment (SECRET_KEY, ...);
+after a deliberate change to the output, rewrite the expected files with
+``--update`` and review the diff:
+
+    python -m backend.bench.structured_check [--update]
+"""
+from __future__ import annotations
+
+import argparse
+import difflib
+from pathlib import Path
+
+from backend.app import structured
+from backend.app.storage import RecipeDocument
+
+FIXTURES = Path(__file__).parent / "fixtures" / "structured"
+URL = "https://example.com/recipes/{name}"
+
+
+def render(page: Path) -> str | None:
+    recipe = structured.extract_structured_recipe(page.read_text(encoding="utf-8"))
+    if recipe is None:
+        return None
+    url = URL.format(name=page.stem)
+    return structured.render_markdown(url, recipe, structured.classify(recipe))
+
+
+def compare(name: str, expected: str, actual: str) -> list[str]:
+    problems = []
+    expected_fields = RecipeDocument(expected).frontmatter
+    actual_fields = RecipeDocument(actual).frontmatter
+    for field in dict.fromkeys([*expected_fields, *actual_fields]):
+        if expected_fields.get(field) != actual_fields.get(field):
+            problems.append(
+                f"{name}: {field}: expected {expected_fields.get(field)!r}, "
+                f"got {actual_fields.get(field)!r}"
+            )
+    if expected != actual:
+        diff = difflib.unified_diff(
+            expected.splitlines(), actual.splitlines(), f"{name}.md", f"{name}.html", lineterm=""
+        )
+        problems.append("\n".join(diff))
+    return problems
+
+
+def check(args: argparse.Namespace) -> None:
+    pages = sorted(FIXTURES.glob("*.html"))
+    assert pages, f"no fixtures in {FIXTURES}"
+
+    problems = []
+    print(f"{'page':>20}  {'recipe':>6}  {'result':>8}")
+    for page in pages:
+        markdown = render(page)
+        expected_path = page.with_suffix(".md")
+        if args.update and markdown is not None:
+            expected_path.write_text(markdown, encoding="utf-8")
+        expected = expected_path.read_text(encoding="utf-8") if expected_path.exists() else None
+
+        if expected is None and markdown is not None:
+            page_problems = [f"{page.stem}: expected no recipe, got {markdown.splitlines()[1]}"]
+        elif expected is not None and markdown is None:
+            page_problems = [f"{page.stem}: expected a recipe, got none"]
+        elif expected is not None:
+            page_problems = compare(page.stem, expected, markdown)
+        else:
+            page_problems = []
+        problems += page_problems
+
+        found = "yes" if markdown is not None else "no"
+        result = "mismatch" if page_problems else "ok"
+        print(f"{page.stem:>20}  {found:>6}  {result:>8}")
+
+    for problem in problems:
+        print()
+        print(problem)
+    assert not problems, "rendered Markdown differs from the fixtures"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--update", action="store_true", help="rewrite the expected Markdown from the current output"
+    )
+    check(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
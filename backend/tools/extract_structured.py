@@ -0,0 +1,35 @@
+"""
+Render recipe Markdown from a saved HTML page using the structured-data path.
+
+Useful for checking the schema.org JSON-LD/microdata parser against real
+pages without fetching them or calling the LLM (classification comes from
+the page's own categories, cuisines and keywords):
+
+    python -m backend.tools.extract_structured page.html --url https://example.com/recipe
+
+Exits with status 1 when the page has no usable Recipe data.
+"""
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import sys
+
+from backend.app import structured
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("html", type=Path)
+    parser.add_argument("--url", default="https://example.com/recipe")
+    args = parser.parse_args()
+
+    recipe = structured.extract_structured_recipe(args.html.read_text(encoding="utf-8", errors="replace"))
+    if recipe is None:
+        print(f"{args.html}: no schema.org Recipe found", file=sys.stderr)
+        sys.exit(1)
+    print(structured.render_markdown(args.url, recipe, structured.classify(recipe)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Write precompressed ``.gz`` and ``.br`` siblings for static frontend assets.
+
+Run at image build time so ``SPAStaticFiles`` can serve compressed assets
+without paying the compression cost per request:
+
+    python backend/tools/precompress.py frontend
+
+Brotli output is skipped when the ``brotli`` package is not installed.
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+COMPRESSIBLE_SUFFIXES = {".html", ".js", ".mjs", ".css", ".json", ".svg", ".txt", ".map", ".webmanifest"}
+# Below this size the compressed file saves too little to be worth serving.
+MINIMUM_SIZE = 1024
+
+
+def precompress(root: Path) -> int:
+    written = 0
+    for path in sorted(root.rglob("*")):
+        if not path.is_file() or path.suffix not in COMPRESSIBLE_SUFFIXES:
+            continue
+        data = path.read_bytes()
+        if len(data) < MINIMUM_SIZE:
+            continue
+
+        gz = gzip.compress(data, compresslevel=9, mtime=0)
+        if len(gz) < len(data):
+            path.with_name(path.name + ".gz").write_bytes(gz)
+            written += 1
+
+        if brotli is not None:
+            br = brotli.compress(data, quality=11)
+            if len(br) < len(data):
+                path.with_name(path.name + ".br").write_bytes(br)
+                written += 1
+    return written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("roots", nargs="+", type=Path)
+    args = parser.parse_args()
+
+    for root in args.roots:
+        written = precompress(root)
+        print(f"{root}: wrote {written} precompressed files")
+
+
+if __name__ == "__main__":
+    main()
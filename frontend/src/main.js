@@ -425,6 +425,9 @@ root.innerHTML = `
       </div>
       <ul id="recipes-list" class="recipes-list"></ul>
       <p id="recipes-status" class="status-line mb-12"></p>
+      <button id="recipes-more" type="button" class="button button-dashed mb-16" style="display: none;">
+        Load more
+      </button>
     </section>
 
     <!-- Recipe detail -->
@@ -514,6 +517,42 @@ root.innerHTML = `
 
 
 const API_BASE = "/api";
+const ETAG_CACHE_LIMIT = 200;
+
+// Last validated body per URL, so unchanged resources come back as 304s.
+const etagCache = new Map();
+
+async function fetchWithEtag(url, options = {}) {
+  const cached = etagCache.get(url);
+  const headers = new Headers(options.headers || {});
+  if (cached) {
+    headers.set("If-None-Match", cached.etag);
+  }
+
+  const response = await fetch(url, { ...options, headers });
+  if (response.status === 304 && cached) {
+    // Refresh recency so frequently used entries survive eviction.
+    etagCache.delete(url);
+    etagCache.set(url, cached);
+    return new Response(cached.body, {
+      status: 200,
+      headers: { "Content-Type": "application/json", ETag: cached.etag },
+    });
+  }
+
+  const etag = response.headers.get("ETag");
+  if (response.ok && etag) {
+    const body = await response.clone().text();
+    etagCache.delete(url);
+    etagCache.set(url, { etag, body });
+    if (etagCache.size > ETAG_CACHE_LIMIT) {
+      etagCache.delete(etagCache.keys().next().value);
+    }
+  } else if (!response.ok) {
+    etagCache.delete(url);
+  }
+  return response;
+}
 
 // Navigation
 const menuToggle = document.getElementById("menu-toggle");
@@ -541,9 +580,17 @@ const recipesFilters = document.getElementById("recipes-filters");
 const recipesFiltersContent = document.getElementById("recipes-filters-content");
 const recipesList = document.getElementById("recipes-list");
 const recipesStatus = document.getElementById("recipes-status");
+const recipesMoreButton = document.getElementById("recipes-more");
 const recipeDetailTitle = document.getElementById("recipe-detail-title");
 const recipeDetailBody = document.getElementById("recipe-detail-body");
-let recipesCache = [];
+// Filter values and per-range counts for the whole collection.
+let recipesFacets = null;
+let recipesShown = 0;
+let recipesNextCursor = null;
+// Bumped on every (re)load so responses to superseded requests are dropped.
+let recipesLoadId = 0;
+const RECIPES_PAGE_SIZE = 50;
+const JOB_POLL_INTERVAL_MS = 1000;
 
 const activeFilters = {
   meal: new Set(),
@@ -562,6 +609,15 @@ const TIME_RANGES = [
   { id: "120-plus", label: "2+ hours", min: 120, max: Infinity },
 ];
 
+// Query parameter names of the filter groups (other than time).
+const FILTER_PARAMS = {
+  meal: "meal",
+  category: "category",
+  ethnicity: "ethnicity",
+  diet: "diet_friendly",
+  tags: "tags",
+};
+
 // Account / registration + login
 const accountRegister = document.getElementById("account-register");
 const accountLogin = document.getElementById("account-login");
@@ -910,68 +966,119 @@ async function fetchCurrentUser() {
   }
 }
 
+function timeRangeParam(range) {
+  return `${range.min}-${Number.isFinite(range.max) ? range.max : ""}`;
+}
+
+function buildRecipesQuery(cursor) {
+  const params = new URLSearchParams({ limit: String(RECIPES_PAGE_SIZE) });
+  Object.entries(FILTER_PARAMS).forEach(([groupKey, name]) => {
+    activeFilters[groupKey].forEach((value) => params.append(name, value));
+  });
+  TIME_RANGES.forEach((range) => {
+    if (activeFilters.time.has(range.id)) {
+      params.append("total_minutes", timeRangeParam(range));
+    }
+  });
+  if (cursor) {
+    params.set("cursor", cursor);
+  }
+  return params;
+}
+
+// GET a recipes endpoint; on failure show the error and return null.
+async function fetchRecipesJson(url, errorLabel) {
+  const response = await fetchWithEtag(url, { method: "GET" });
+
+  if (response.status === 401) {
+    handleSessionExpired("Please sign in to view recipes.");
+    return null;
+  }
+
+  if (!response.ok) {
+    const text = await response.text();
+    console.error(errorLabel, text);
+    recipesStatus.textContent = `Error: ${response.status} ${response.statusText}`;
+    return null;
+  }
+
+  return response.json();
+}
+
+function fetchRecipesFacets() {
+  const params = new URLSearchParams();
+  TIME_RANGES.forEach((range) => params.append("total_minutes", timeRangeParam(range)));
+  return fetchRecipesJson(`${API_BASE}/recipes/facets?${params}`, "Recipe filters error:");
+}
+
+function fetchRecipesPage(cursor) {
+  return fetchRecipesJson(`${API_BASE}/recipes?${buildRecipesQuery(cursor)}`, "List recipes error:");
+}
+
+function resetRecipesList() {
+  recipesList.innerHTML = "";
+  recipesShown = 0;
+  recipesNextCursor = null;
+  updateRecipesMoreButton();
+}
+
 async function loadRecipes() {
+  const loadId = ++recipesLoadId;
   recipesStatus.textContent = "Loading recipes...";
-  recipesList.innerHTML = "";
+  resetRecipesList();
   if (recipesFilters) {
     recipesFilters.style.display = "none";
   }
 
   try {
-    const response = await fetch(`${API_BASE}/recipes`, { method: "GET" });
-
-    if (response.status === 401) {
-      handleSessionExpired("Please sign in to view recipes.");
-      return;
-    }
+    const [facets, page] = await Promise.all([fetchRecipesFacets(), fetchRecipesPage(null)]);
+    if (loadId !== recipesLoadId || !facets || !page) return;
 
-    if (!response.ok) {
-      const text = await response.text();
-      console.error("List recipes error:", text);
-      recipesStatus.textContent = `Error: ${response.status} ${response.statusText}`;
-      return;
-    }
-
-    const data = await response.json();
-    if (!Array.isArray(data) || data.length === 0) {
-      recipesCache = [];
-      recipesStatus.textContent = "No recipes saved yet.";
-      return;
-    }
-
-    recipesCache = data.map((recipe) => normalizeRecipeForFilters(recipe));
+    recipesFacets = facets;
     renderFilters();
-    applyFilters();
+    appendRecipesPage(page);
   } catch (error) {
     console.error("Network error while listing recipes:", error);
     recipesStatus.textContent = "Network error. Is the backend running?";
   }
 }
 
-function normalizeFilterValue(value) {
-  if (value == null) return "";
-  return String(value).trim().toLowerCase();
-}
+// Reload the list for the current filters; the filter options stay as they are.
+async function reloadRecipesList() {
+  const loadId = ++recipesLoadId;
+  recipesStatus.textContent = "Loading recipes...";
+  resetRecipesList();
 
-function normalizeFilterScalar(value) {
-  if (Array.isArray(value)) {
-    for (const item of value) {
-      const normalized = normalizeFilterValue(item);
-      if (normalized) return normalized;
-    }
-    return null;
+  try {
+    const page = await fetchRecipesPage(null);
+    if (loadId !== recipesLoadId || !page) return;
+    appendRecipesPage(page);
+  } catch (error) {
+    console.error("Network error while listing recipes:", error);
+    recipesStatus.textContent = "Network error. Is the backend running?";
   }
-  const normalized = normalizeFilterValue(value);
-  return normalized || null;
 }
 
-function normalizeFilterList(value) {
-  if (!value) return [];
-  if (Array.isArray(value)) {
-    return value.map((item) => normalizeFilterValue(item)).filter(Boolean);
+async function loadMoreRecipes() {
+  if (!recipesNextCursor) return;
+  const loadId = recipesLoadId;
+  recipesMoreButton.disabled = true;
+
+  try {
+    const page = await fetchRecipesPage(recipesNextCursor);
+    if (loadId !== recipesLoadId || !page) return;
+    appendRecipesPage(page);
+  } catch (error) {
+    console.error("Network error while listing recipes:", error);
+    recipesStatus.textContent = "Network error. Is the backend running?";
+  } finally {
+    recipesMoreButton.disabled = false;
   }
-  const normalized = normalizeFilterValue(value);
-  return normalized ? [normalized] : [];
+}
+
+function updateRecipesMoreButton() {
+  if (!recipesMoreButton) return;
+  recipesMoreButton.style.display = recipesNextCursor ? "" : "none";
 }
 
 function formatFilterLabel(value) {
@@ -985,160 +1092,9 @@ function formatFilterTriggerLabel(label, groupKey) {
   return `${formatFilterLabel(label)} ${suffix}`;
 }
 
-function parseDurationMinutes(value) {
-  if (value == null) return null;
-  if (typeof value === "number") {
-    return value > 0 ? Math.round(value) : null;
-  }
-  const raw = String(value).trim();
-  if (!raw) return null;
-  const normalized = raw.toLowerCase();
-
-  const match = normalized.match(
-    /^P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$/i,
-  );
-  if (!match) return parseLooseDurationMinutes(normalized);
-
-  const days = match[1] ? parseInt(match[1], 10) : 0;
-  const hours = match[2] ? parseInt(match[2], 10) : 0;
-  const minutes = match[3] ? parseInt(match[3], 10) : 0;
-  const seconds = match[4] ? parseInt(match[4], 10) : 0;
-
-  const totalMinutes = days * 24 * 60 + hours * 60 + minutes;
-  if (totalMinutes > 0) return totalMinutes;
-  if (seconds > 0) return Math.ceil(seconds / 60);
-  return null;
-}
-
-function parseLooseDurationMinutes(value) {
-  const raw = String(value).trim().toLowerCase();
-  if (!raw) return null;
-
-  const numericMatch = raw.match(/^\d+$/);
-  if (numericMatch) {
-    const minutes = parseInt(raw, 10);
-    return minutes > 0 ? minutes : null;
-  }
-
-  const colonMatch = raw.match(/^(\d+)\s*:\s*(\d{1,2})(?::\d{1,2})?$/);
-  if (colonMatch) {
-    const hours = parseInt(colonMatch[1], 10);
-    const minutes = parseInt(colonMatch[2], 10);
-    const totalMinutes = hours * 60 + minutes;
-    return totalMinutes > 0 ? totalMinutes : null;
-  }
-
-  const unitRegex =
-    /(\d+(?:\.\d+)?)\s*(days?|day|d|hours?|hrs?|hr|h|minutes?|mins?|min|m|seconds?|secs?|sec|s)/g;
-  let totalMinutes = 0;
-  let matched = false;
-  let unitMatch = null;
-  while ((unitMatch = unitRegex.exec(raw))) {
-    matched = true;
-    const amount = parseFloat(unitMatch[1]);
-    if (!Number.isFinite(amount) || amount <= 0) continue;
-    const unit = unitMatch[2];
-    if (unit.startsWith("d")) {
-      totalMinutes += amount * 24 * 60;
-    } else if (unit.startsWith("h")) {
-      totalMinutes += amount * 60;
-    } else if (unit.startsWith("m")) {
-      totalMinutes += amount;
-    } else if (unit.startsWith("s")) {
-      totalMinutes += amount / 60;
-    }
-  }
-
-  if (!matched) return null;
-  return totalMinutes > 0 ? Math.ceil(totalMinutes) : null;
-}
-
-function getTimeRangeId(minutes) {
-  if (minutes == null) return null;
-  const range = TIME_RANGES.find((entry) => minutes >= entry.min && minutes <= entry.max);
-  return range ? range.id : null;
-}
-
-function normalizeRecipeForFilters(recipe) {
-  const normalized = recipe && typeof recipe === "object" ? { ...recipe } : {};
-  const meal = normalizeFilterList(normalized.meal);
-  const category = normalizeFilterScalar(normalized.category);
-  const ethnicity = normalizeFilterList(normalized.ethnicity);
-  const diet = normalizeFilterList(normalized.diet_friendly);
-  const tags = normalizeFilterList(normalized.tags);
-  const totalMinutes = parseDurationMinutes(normalized.total_time);
-
-  normalized._filter = {
-    meal,
-    category,
-    ethnicity,
-    diet,
-    tags,
-    totalMinutes,
-  };
-  return normalized;
-}
-
-function buildFilterOptions(recipes) {
-  const options = {
-    meal: new Set(),
-    category: new Set(),
-    ethnicity: new Set(),
-    diet: new Set(),
-    tags: new Set(),
-  };
-  const timeCounts = {};
-  TIME_RANGES.forEach((range) => {
-    timeCounts[range.id] = 0;
-  });
-
-  recipes.forEach((recipe) => {
-    if (!recipe || !recipe._filter) return;
-    const filter = recipe._filter;
-    if (Array.isArray(filter.meal)) {
-      filter.meal.forEach((item) => {
-        if (item) options.meal.add(item);
-      });
-    }
-    if (filter.category) {
-      options.category.add(filter.category);
-    }
-    if (Array.isArray(filter.ethnicity)) {
-      filter.ethnicity.forEach((item) => {
-        if (item) options.ethnicity.add(item);
-      });
-    }
-    if (Array.isArray(filter.diet)) {
-      filter.diet.forEach((item) => {
-        if (item) options.diet.add(item);
-      });
-    }
-    if (Array.isArray(filter.tags)) {
-      filter.tags.forEach((item) => {
-        if (item) options.tags.add(item);
-      });
-    }
-    const rangeId = getTimeRangeId(filter.totalMinutes);
-    if (rangeId && timeCounts[rangeId] != null) {
-      timeCounts[rangeId] += 1;
-    }
-  });
-
-  return {
-    options: {
-      meal: Array.from(options.meal).sort(),
-      category: Array.from(options.category).sort(),
-      ethnicity: Array.from(options.ethnicity).sort(),
-      diet: Array.from(options.diet).sort(),
-      tags: Array.from(options.tags).sort(),
-    },
-    timeCounts,
-  };
-}
-
 function renderFilters() {
   if (!recipesFilters || !recipesFiltersContent) return;
-  if (!recipesCache || recipesCache.length === 0) {
+  if (!recipesFacets || !recipesFacets.total) {
     recipesFilters.style.display = "none";
     return;
   }
@@ -1146,7 +1102,8 @@ function renderFilters() {
   recipesFilters.style.display = "block";
   recipesFiltersContent.innerHTML = "";
 
-  const { options, timeCounts } = buildFilterOptions(recipesCache);
+  const options = recipesFacets.values || {};
+  const timeCounts = recipesFacets.total_minutes || {};
   const dropdowns = document.createElement("div");
   dropdowns.className = "filter-dropdowns";
 
@@ -1213,11 +1170,11 @@ function renderFilters() {
     dropdowns.appendChild(wrapper);
   };
 
-  buildDropdown("meal", "Meal", options.meal);
-  buildDropdown("category", "Category", options.category);
-  buildDropdown("ethnicity", "Ethnicity", options.ethnicity);
-  buildDropdown("diet", "Diet", options.diet);
-  buildDropdown("tags", "Tags", options.tags);
+  buildDropdown("meal", "Meal", options.meal || []);
+  buildDropdown("category", "Category", options.category || []);
+  buildDropdown("ethnicity", "Ethnicity", options.ethnicity || []);
+  buildDropdown("diet", "Diet", options.diet_friendly || []);
+  buildDropdown("tags", "Tags", options.tags || []);
 
   const timeWrapper = document.createElement("div");
   timeWrapper.className = "filter-dropdown";
@@ -1260,7 +1217,7 @@ function renderFilters() {
     button.dataset.filterGroup = "time";
     button.dataset.filterValue = range.id;
     button.textContent = range.label;
-    const count = timeCounts[range.id] || 0;
+    const count = timeCounts[timeRangeParam(range)] || 0;
     if (count === 0) {
       button.disabled = true;
     }
@@ -1277,42 +1234,10 @@ function renderFilters() {
   recipesFiltersContent.appendChild(dropdowns);
 }
 
-function matchesScalarFilter(value, activeSet) {
-  if (!activeSet || activeSet.size === 0) return true;
-  if (!value) return false;
-  return activeSet.has(value);
-}
-
-function matchesListFilter(values, activeSet) {
-  if (!activeSet || activeSet.size === 0) return true;
-  if (!Array.isArray(values) || values.length === 0) return false;
-  for (const value of activeSet) {
-    if (values.includes(value)) {
-      return true;
-    }
-  }
-  return false;
-}
-
-function matchesTimeFilter(minutes, activeSet) {
-  if (!activeSet || activeSet.size === 0) return true;
-  const rangeId = getTimeRangeId(minutes);
-  if (!rangeId) return false;
-  return activeSet.has(rangeId);
-}
-
-function renderRecipesList(recipes, totalCount) {
-  recipesList.innerHTML = "";
-
-  if (!totalCount) {
-    recipesStatus.textContent = "No recipes saved yet.";
-    return;
-  }
-
-  if (!recipes || recipes.length === 0) {
-    recipesStatus.textContent = "No recipes match your filters.";
-    return;
-  }
+function appendRecipesPage(page) {
+  const recipes = page && Array.isArray(page.items) ? page.items : [];
+  recipesNextCursor = page ? page.next_cursor : null;
+  updateRecipesMoreButton();
 
   recipes.forEach((recipe) => {
     const li = document.createElement("li");
@@ -1328,29 +1253,15 @@ function renderRecipesList(recipes, totalCount) {
     }
     recipesList.appendChild(li);
   });
+  recipesShown += recipes.length;
 
-  recipesStatus.textContent = "";
-}
-
-function applyFilters() {
-  if (!recipesCache || recipesCache.length === 0) {
-    renderRecipesList([], 0);
-    return;
+  if (recipesShown > 0) {
+    recipesStatus.textContent = "";
+  } else if (!recipesFacets || !recipesFacets.total) {
+    recipesStatus.textContent = "No recipes saved yet.";
+  } else {
+    recipesStatus.textContent = "No recipes match your filters.";
   }
-
-  const filtered = recipesCache.filter((recipe) => {
-    if (!recipe || !recipe._filter) return false;
-    const filter = recipe._filter;
-    if (!matchesListFilter(filter.meal, activeFilters.meal)) return false;
-    if (!matchesScalarFilter(filter.category, activeFilters.category)) return false;
-    if (!matchesListFilter(filter.ethnicity, activeFilters.ethnicity)) return false;
-    if (!matchesListFilter(filter.diet, activeFilters.diet)) return false;
-    if (!matchesListFilter(filter.tags, activeFilters.tags)) return false;
-    if (!matchesTimeFilter(filter.totalMinutes, activeFilters.time)) return false;
-    return true;
-  });
-
-  renderRecipesList(filtered, recipesCache.length);
 }
 
 function toggleFilterDropdown(group) {
@@ -1371,6 +1282,65 @@ function setScrapeStatus(statusEl, message) {
   }, 3000);
 }
 
+async function pollJob(jobId) {
+  while (true) {
+    await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+    const response = await fetch(`${API_BASE}/jobs/${encodeURIComponent(jobId)}`, {
+      method: "GET",
+    });
+    if (response.status === 401) {
+      handleSessionExpired("Session expired. Please sign in again.");
+      return null;
+    }
+    if (!response.ok) {
+      throw new Error(`Job status error: ${response.status}`);
+    }
+    const job = await response.json();
+    if (job.status === "succeeded" || job.status === "failed") {
+      return job;
+    }
+  }
+}
+
+function waitForJob(jobId, onMarkdown) {
+  // Scrapes run as background jobs. Follow the job's event stream, which
+  // also carries the Markdown as the model writes it; poll if it breaks.
+  if (typeof EventSource === "undefined") {
+    return pollJob(jobId);
+  }
+  return new Promise((resolve, reject) => {
+    const source = new EventSource(`${API_BASE}/jobs/${encodeURIComponent(jobId)}/events`);
+    let markdown = "";
+    let settled = false;
+    const finish = (promise) => {
+      if (settled) return;
+      settled = true;
+      source.close();
+      promise.then(resolve, reject);
+    };
+
+    source.addEventListener("delta", (event) => {
+      markdown += JSON.parse(event.data).text;
+      if (onMarkdown) onMarkdown(markdown);
+    });
+    source.addEventListener("job", (event) => {
+      const job = JSON.parse(event.data);
+      if (job.status === "succeeded" || job.status === "failed") {
+        finish(Promise.resolve(job));
+      }
+    });
+    source.addEventListener("error", () => {
+      finish(pollJob(jobId));
+    });
+  });
+}
+
+function showScrapePreview(markdown) {
+  setActiveView("recipe");
+  recipeDetailTitle.textContent = "Scraping…";
+  recipeDetailBody.innerHTML = renderMarkdown(markdown);
+}
+
 async function scrapeRecipeWithElements(urlInput, buttonEl, statusEl) {
   const url = urlInput.value.trim();
   if (!url) {
@@ -1420,17 +1390,29 @@ async function scrapeRecipeWithElements(urlInput, buttonEl, statusEl) {
       return;
     }
 
-    const data = await response.json();
-    const savedSlug = data && data.metadata ? data.metadata.slug : "";
-    const savedTitle = data && data.metadata ? data.metadata.title : "";
-    setScrapeStatus(statusEl, `Saved recipe: ${savedTitle || savedSlug}`);
+    let job = await response.json();
+    if (job.status !== "succeeded" && job.status !== "failed") {
+      job = await waitForJob(job.id, showScrapePreview);
+    }
+    if (!job) {
+      return;
+    }
+    if (job.status === "failed") {
+      console.error("Scrape error:", job.error);
+      handleRoute();
+      setScrapeStatus(statusEl, `Error: ${job.error || "Scrape failed"}`);
+      return;
+    }
+
+    const savedSlug = job.slug || "";
+    setScrapeStatus(statusEl, `Saved recipe: ${savedSlug}`);
     urlInput.value = "";
     await loadRecipes();
     if (savedSlug) {
       const targetPath = `${RECIPE_PREFIX}${encodeURIComponent(savedSlug)}`;
       const currentPath = normalizePath(window.location.pathname);
       if (currentPath === targetPath) {
-        await openRecipeDetail(savedSlug, savedTitle);
+        await openRecipeDetail(savedSlug);
       } else {
         navigateTo(targetPath);
       }
@@ -1455,9 +1437,10 @@ async function openRecipeDetail(slug, title) {
   recipeDetailBody.textContent = "Loading…";
   setActiveView("recipe");
   try {
-    const response = await fetch(`${API_BASE}/recipes/${encodeURIComponent(slug)}`, {
-      method: "GET",
-    });
+    const response = await fetchWithEtag(
+      `${API_BASE}/recipes/${encodeURIComponent(slug)}?format=html`,
+      { method: "GET" },
+    );
 
     if (response.status === 401) {
       handleSessionExpired("Session expired. Please sign in again.");
@@ -1472,11 +1455,11 @@ async function openRecipeDetail(slug, title) {
       return;
     }
 
+    // Rendered (and sanitized) on the server, so long recipes cost the
+    // browser no Markdown parsing.
     const data = await response.json();
-    const markdown = data.markdown || "";
-    const { frontmatter } = parseFrontmatter(markdown);
     const frontmatterTitle =
-      frontmatter && frontmatter.title ? String(frontmatter.title).trim() : "";
+      data.metadata && data.metadata.title ? String(data.metadata.title).trim() : "";
     let displayTitle = slug;
     if (frontmatterTitle) {
       displayTitle = frontmatterTitle;
@@ -1485,7 +1468,7 @@ async function openRecipeDetail(slug, title) {
     }
     recipeDetailTitle.textContent = displayTitle;
     setPageTitle(displayTitle);
-    recipeDetailBody.innerHTML = renderMarkdown(markdown);
+    recipeDetailBody.innerHTML = data.html || "";
   } catch (error) {
     console.error("Network error while loading recipe:", error);
     recipeDetailBody.textContent = "Network error. Is the backend running?";
@@ -1651,10 +1634,7 @@ function formatServings(value) {
 function renderFrontmatter(frontmatter) {
   if (!frontmatter) return "";
 
-  const upper = (value) =>
-    escapeHtml(String(value))
-      .toUpperCase()
-      .replace(/_/g, " ");
+  const upper = (value) => escapeHtml(String(value).toUpperCase().replace(/_/g, " "));
 
   const primaryPieces = [];
   const pushPrimary = (value) => {
@@ -2085,8 +2065,14 @@ if (recipesFiltersContent) {
       }
     }
 
-    applyFilters();
     renderFilters();
+    reloadRecipesList();
+  });
+}
+
+if (recipesMoreButton) {
+  recipesMoreButton.addEventListener("click", () => {
+    loadMoreRecipes();
   });
 }
 